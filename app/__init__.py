@@ -1,15 +1,24 @@
 import os
 from flask import Flask
 from dotenv import load_dotenv
+from werkzeug.middleware.proxy_fix import ProxyFix
+from werkzeug.utils import import_string
 
-from .extensions import db, ma, limiter, cache, migrate
+from .extensions import db, ma, limiter, cache, migrate, compression, pool_metrics, read_replica, sql_stats
 from .blueprints.customer.routes import customer_bp
 from .blueprints.serviceticket.routes import service_ticket_bp
 from .blueprints.mechanic.routes import mechanic_bp
 from .blueprints.inventory.routes import inventory_bp
-from .blueprints.serviceassignment.routes import service_assignment_bp
-from .blueprints.inventoryassignment.routes import inventory_assignment_bp
-from flask_swagger_ui import get_swaggerui_blueprint
+from .utils.deferred import LazyMount
+from .utils.util import instance_file
+
+# Rarely used blueprints, imported and registered only when named in the
+# OPTIONAL_BLUEPRINTS config
+OPTIONAL_BLUEPRINTS = {
+    "inventory_assignment": "app.blueprints.inventoryassignment.routes:inventory_assignment_bp",
+    "service_assignment": "app.blueprints.serviceassignment.routes:service_assignment_bp",
+    "internal": "app.blueprints.internal.routes:internal_bp",
+}
 
 SWAGGER_URL = "/api/docs"
 
@@ -17,12 +26,25 @@ if os.getenv("FLASK_ENV") == "production":
     API_URL = "https://mechanic-api-uwqv.onrender.com/static/bundled.yaml"
 else:
     API_URL = "/static/bundled.yaml"
-    
-swaggerui_blueprint = get_swaggerui_blueprint(
-    SWAGGER_URL,
-    API_URL,
-    config={"app_name": "Your API Docs", "validatorUrl": None},
-)
+
+
+def create_swagger_ui_app():
+    """
+    Serves the Swagger UI. Built on the first request under SWAGGER_URL,
+    so workers that never serve the docs don't load it.
+    """
+    from flask_swagger_ui import get_swaggerui_blueprint
+
+    docs = Flask(__name__)
+    docs.register_blueprint(
+        get_swaggerui_blueprint(
+            SWAGGER_URL,
+            API_URL,
+            config={"app_name": "Your API Docs", "validatorUrl": None},
+        ),
+        url_prefix=SWAGGER_URL,
+    )
+    return docs
 
 
 def create_app(config_name=None):
@@ -34,24 +56,42 @@ def create_app(config_name=None):
         app.config.from_object("config.TestingConfig")
     elif config_name == "development":
         app.config.from_object("config.DevelopmentConfig")
+    elif isinstance(config_name, type):
+        app.config.from_object(config_name)
     else:
         app.config.from_object("config.ProductionConfig")
 
+    app.json = import_string(app.config["JSON_PROVIDER"])(app)
+
+    app.wsgi_app = LazyMount(app.wsgi_app, SWAGGER_URL, create_swagger_ui_app)
+    if app.config.get("PROXY_FIX_X_FOR"):
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config["PROXY_FIX_X_FOR"])
+
+    pool_metrics.init_app(app)
+    read_replica.init_app(app)
     db.init_app(app)
+    sql_stats.init_app(app)
     ma.init_app(app)
+    if not app.config.get("RATELIMIT_STORAGE_URI"):
+        app.config["RATELIMIT_STORAGE_URI"] = "sqlite://" + instance_file(
+            app, "limits.sqlite3"
+        )
     limiter.init_app(app)
     cache.init_app(app)
     migrate.init_app(app, db)
+    compression.init_app(app)
 
     app.register_blueprint(customer_bp)
     app.register_blueprint(mechanic_bp)
     app.register_blueprint(service_ticket_bp)
     app.register_blueprint(inventory_bp)
-    app.register_blueprint(inventory_assignment_bp)
-    app.register_blueprint(service_assignment_bp)
-    app.register_blueprint(swaggerui_blueprint, url_prefix=SWAGGER_URL)
+    for name in app.config["OPTIONAL_BLUEPRINTS"]:
+        if name not in OPTIONAL_BLUEPRINTS:
+            raise ValueError(f"Unknown optional blueprint {name!r}")
+        app.register_blueprint(import_string(OPTIONAL_BLUEPRINTS[name]))
 
-    with app.app_context():
-        db.create_all()
+    if app.config["DB_CREATE_ALL"]:
+        with app.app_context():
+            db.create_all()
 
     return app
@@ -1,10 +1,19 @@
 from flask import Blueprint, jsonify, request, abort
 from sqlalchemy.exc import SQLAlchemyError
-from app.extensions import db, limiter, cache
+from sqlalchemy.orm import selectinload
+from app.extensions import db, limiter
 from app.models import Customer, ServiceTicket
 from app.blueprints.customer.customerSchemas import CustomerSchema, LoginSchema
-from app.blueprints.serviceticket.serviceTicketSchemas import ServiceTicketSchema
+from app.blueprints.serviceticket.serviceTicketSchemas import (
+    SERVICE_TICKET_LOAD_OPTIONS,
+    ServiceTicketSchema,
+)
 from app.utils.util import encode_token, token_required
+from app.utils.passwords import check_and_rehash
+from app.utils.queries import customer_by_email
+from app.utils.sql_stats import query_budget
+from app.utils.caching import cached_view
+from app.utils.versioning import conditional_get
 
 customer_bp = Blueprint("customer", __name__, url_prefix="/customer")
 
@@ -27,10 +36,10 @@ def login():
         password = credentials.get("password")
     except Exception:
         return jsonify({"error": "Invalid request format"}), 400
-    user = db.session.execute(
-        db.select(Customer).filter_by(email=email)
-    ).scalar_one_or_none()
-    if user and user.check_password(password):
+    user = customer_by_email(db.session, email)
+    if user and check_and_rehash(user, password):
+        if db.session.is_modified(user):
+            db.session.commit()
         auth_token = encode_token(user.id)
         return (
             jsonify(
@@ -54,9 +63,7 @@ def create_customer():
     """
     try:
         data = request.get_json()
-        existing_customer = db.session.execute(
-            db.select(Customer).filter_by(email=data.get("email"))
-        ).scalar_one_or_none()
+        existing_customer = customer_by_email(db.session, data.get("email"))
         if existing_customer:
             return jsonify({"error": "Email already exists."}), 409
 
@@ -73,7 +80,8 @@ def create_customer():
 
 
 @customer_bp.route("/", methods=["GET"])
-@cache.cached(timeout=60)
+@query_budget(7)
+@cached_view(tags=("customers",), stale_while_revalidate=True)
 @limiter.limit("20 per minute")
 def get_customers():
     """
@@ -82,7 +90,9 @@ def get_customers():
     page = request.args.get("page", 1, type=int)
     per_page = request.args.get("per_page", 10, type=int)
 
-    pagination = Customer.query.paginate(page=page, per_page=per_page, error_out=False)
+    pagination = Customer.query.options(
+        selectinload(Customer.service_tickets).options(*SERVICE_TICKET_LOAD_OPTIONS)
+    ).paginate(page=page, per_page=per_page, error_out=False)
     customers = pagination.items
 
     response = {
@@ -96,25 +106,40 @@ def get_customers():
 
 
 @customer_bp.route("/<int:id>", methods=["GET"])
-@cache.cached(timeout=30)
+@query_budget(7)
+@conditional_get(Customer, "id")
+@cached_view(tags=("customer:{id}", "customer_details"))
 def get_customer(id):
     """
     Get a specific customer by ID.
     """
-    customer = db.session.get(Customer, id)
+    customer = db.session.get(
+        Customer,
+        id,
+        options=[
+            selectinload(Customer.service_tickets).options(
+                *SERVICE_TICKET_LOAD_OPTIONS
+            )
+        ],
+    )
     if not customer:
         abort(404, description="Customer not found.")
     return customer_schema.jsonify(customer), 200
 
 
 @customer_bp.route("/my-tickets", methods=["GET"])
+@query_budget(5)
 @token_required
-@cache.cached(timeout=30)
+@cached_view(tags=("customer:{subject}", "customer_details"))
 def get_my_tickets(user_id):
     """
     Returns service tickets for the authenticated customer.
     """
-    tickets = ServiceTicket.query.filter_by(customer_id=user_id).all()
+    tickets = (
+        ServiceTicket.query.options(*SERVICE_TICKET_LOAD_OPTIONS)
+        .filter_by(customer_id=user_id)
+        .all()
+    )
     return jsonify(tickets_schema.dump(tickets)), 200
 
 
@@ -0,0 +1,3 @@
+from .routes import internal_bp
+
+__all__ = ["internal_bp"]
@@ -0,0 +1,35 @@
+import os
+from flask import Blueprint, jsonify
+from app.extensions import cache, db, pool_metrics
+from app.utils.util import mechanic_token_required
+
+internal_bp = Blueprint("internal", __name__, url_prefix="/internal")
+
+
+@internal_bp.route("/cache/stats", methods=["GET"])
+@mechanic_token_required
+def get_cache_stats(mechanic_id):
+    """
+    Reports hit ratio, size and evictions per cache key prefix, aggregated
+    across every worker sharing the cache backend.
+    """
+    backend = cache.cache
+    if not hasattr(backend, "stats"):
+        return (
+            jsonify({"error": f"{type(backend).__name__} does not report stats"}),
+            501,
+        )
+    return jsonify({"backend": type(backend).__name__, "prefixes": backend.stats()}), 200
+
+
+@internal_bp.route("/pool/stats", methods=["GET"])
+@mechanic_token_required
+def get_pool_stats(mechanic_id):
+    """
+    Reports this worker's connection pools: size, checked out and overflow
+    connections, and how long checkouts waited for one.
+    """
+    engines = pool_metrics.snapshot(db.engines)
+    if not engines:
+        return jsonify({"error": "no engine uses a metered connection pool"}), 501
+    return jsonify({"pid": os.getpid(), "engines": engines}), 200
@@ -4,6 +4,7 @@ from app.extensions import db
 from app.models import Inventory
 from app.blueprints.inventory.inventorySchemas import InventorySchema
 from app.utils.util import mechanic_token_required
+from app.utils.versioning import conditional_get
 
 
 inventory_bp = Blueprint("inventory", __name__, url_prefix="/inventory")
@@ -25,6 +26,7 @@ def get_inventory_for_mechanic(mechanic_id):
 
 @inventory_bp.route("/<int:inventory_id>", methods=["GET"])
 @mechanic_token_required
+@conditional_get(Inventory, "inventory_id")
 def get_inventory_item(mechanic_id, inventory_id):
     """
     Retrieves a specific inventory item by ID.
@@ -1,10 +1,12 @@
 from flask import Blueprint, jsonify, request
+from sqlalchemy.exc import IntegrityError
 from app.extensions import db
 from app.models import InventoryAssignment
 from app.blueprints.inventoryassignment.inventoryAssignmentSchemas import (
     InventoryAssignmentSchema,
 )
 from app.utils.util import mechanic_token_required
+from app.utils.queries import inventory_assignment
 
 inventory_assignment_bp = Blueprint(
     "inventory_assignment", __name__, url_prefix="/inventory_assignment"
@@ -27,18 +29,19 @@ def create_inventory_assignment(mechanic_id):
     quantity = data.get("quantity", 1)
     data["quantity"] = quantity
 
-    existing = db.session.execute(
-        db.select(InventoryAssignment).filter_by(
-            service_ticket_id=ticket_id, inventory_id=inventory_id
-        )
-    ).scalar_one_or_none()
+    existing = inventory_assignment(db.session, ticket_id, inventory_id)
 
     if existing:
         return jsonify({"error": "Inventory item already assigned"}), 400
 
     assignment = InventoryAssignment(**data)
     db.session.add(assignment)
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # Lost a race with a concurrent assignment of the same part
+        db.session.rollback()
+        return jsonify({"error": "Inventory item already assigned"}), 400
     return assignment_schema.jsonify(assignment), 201
 
 
@@ -65,11 +68,7 @@ def update_inventory_assignment(mechanic_id):
     inventory_id = data.get("inventory_id")
     quantity = data.get("quantity")
 
-    assignment = db.session.execute(
-        db.select(InventoryAssignment).filter_by(
-            service_ticket_id=ticket_id, inventory_id=inventory_id
-        )
-    ).scalar_one_or_none()
+    assignment = inventory_assignment(db.session, ticket_id, inventory_id)
 
     if not assignment:
         return jsonify({"error": "Assignment not found"}), 404
@@ -89,11 +88,7 @@ def delete_inventory_assignment(mechanic_id):
     ticket_id = request.args.get("service_ticket_id")
     inventory_id = request.args.get("inventory_id")
 
-    assignment = db.session.execute(
-        db.select(InventoryAssignment).filter_by(
-            service_ticket_id=ticket_id, inventory_id=inventory_id
-        )
-    ).scalar_one_or_none()
+    assignment = inventory_assignment(db.session, ticket_id, inventory_id)
 
     if not assignment:
         return jsonify({"error": "Assignment not found"}), 404
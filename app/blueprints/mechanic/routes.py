@@ -2,9 +2,12 @@ from flask import Blueprint, jsonify, request, abort
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy import func
 from app.extensions import db, limiter
-from app.models import Mechanic, ServiceAssignment, ServiceTicket
+from app.models import ArchivedServiceAssignment, Mechanic, ServiceAssignment
 from app.blueprints.mechanic.mechanicSchemas import MechanicSchema, MechanicLoginSchema
 from app.utils.util import mechanic_token_required, encode_mechanic_token
+from app.utils.caching import cached_view
+from app.utils.passwords import check_and_rehash
+from app.utils.queries import mechanic_by_email
 
 mechanic_bp = Blueprint("mechanic", __name__, url_prefix="/mechanic")
 
@@ -26,11 +29,11 @@ def mechanic_login():
     except Exception:
         return jsonify({"error": "Invalid request format"}), 400
 
-    mechanic = db.session.execute(
-        db.select(Mechanic).filter_by(email=email)
-    ).scalar_one_or_none()
+    mechanic = mechanic_by_email(db.session, email)
 
-    if mechanic and mechanic.check_password(password):
+    if mechanic and check_and_rehash(mechanic, password):
+        if db.session.is_modified(mechanic):
+            db.session.commit()
         auth_token = encode_mechanic_token(mechanic.id)
         response = {
             "status": "success",
@@ -50,9 +53,7 @@ def create_mechanic():
     """
     try:
         data = request.get_json()
-        existing_mechanic = db.session.execute(
-            db.select(Mechanic).filter_by(email=data.get("email"))
-        ).scalar_one_or_none()
+        existing_mechanic = mechanic_by_email(db.session, data.get("email"))
         if existing_mechanic:
             return jsonify({"error": "Email already exists."}), 409
 
@@ -170,15 +171,28 @@ def delete_mechanic(user_id, id):
 
 
 @mechanic_bp.route("/rankings", methods=["GET"])
+@cached_view(tags=("service_tickets",), stale_while_revalidate=True)
 def get_mechanic_rankings():
     """
     Returns mechanics ordered by the number of tickets they worked on.
     """
+    # Counted from the live and archived assignments alone, off their
+    # mechanic_id indexes, without joining the tickets
+    live, archived = (
+        db.select(model.mechanic_id, func.count().label("ticket_count"))
+        .group_by(model.mechanic_id)
+        .subquery()
+        for model in (ServiceAssignment, ArchivedServiceAssignment)
+    )
+    ticket_count = (
+        func.coalesce(live.c.ticket_count, 0)
+        + func.coalesce(archived.c.ticket_count, 0)
+    ).label("ticket_count")
     rankings = (
-        db.session.query(Mechanic, func.count(ServiceTicket.id).label("ticket_count"))
-        .outerjoin(Mechanic.service_tickets)
-        .group_by(Mechanic.id)
-        .order_by(db.desc("ticket_count"))
+        db.session.query(Mechanic, ticket_count)
+        .outerjoin(live, live.c.mechanic_id == Mechanic.id)
+        .outerjoin(archived, archived.c.mechanic_id == Mechanic.id)
+        .order_by(ticket_count.desc())
         .all()
     )
 
@@ -8,6 +8,7 @@ from app.blueprints.serviceassignment.serviceAssignmentSchemas import (
     ServiceAssignmentSchema,
 )
 from app.utils.util import mechanic_token_required
+from app.utils.queries import service_assignment
 
 service_assignment_bp = Blueprint(
     "service_assignment", __name__, url_prefix="/service_assignment"
@@ -46,10 +47,7 @@ def create_assignment(mechanic_id):
             return jsonify({"error": "Invalid date format. Use YYYY-MM-DD"}), 400
 
     try:
-        stmt = select(ServiceAssignment).filter_by(
-            service_ticket_id=ticket_id, mechanic_id=mechanic_id
-        )
-        existing = db.session.execute(stmt).scalar_one_or_none()
+        existing = service_assignment(db.session, ticket_id, mechanic_id)
         if existing:
             return jsonify({"error": "Assignment already exists"}), 400
 
@@ -91,10 +89,7 @@ def delete_assignment(mechanic_id):
         return jsonify({"error": "Missing service_ticket_id or mechanic_id"}), 400
 
     try:
-        stmt = select(ServiceAssignment).filter_by(
-            service_ticket_id=ticket_id, mechanic_id=mechanic_id
-        )
-        assignment = db.session.execute(stmt).scalar_one_or_none()
+        assignment = service_assignment(db.session, ticket_id, mechanic_id)
 
         if not assignment:
             return jsonify({"error": "Assignment not found"}), 404
@@ -1,7 +1,21 @@
-from flask import Blueprint, jsonify, request, abort
+from datetime import date
+import click
+from flask import (
+    Blueprint,
+    Response,
+    abort,
+    current_app,
+    jsonify,
+    request,
+    stream_with_context,
+)
+from marshmallow import ValidationError
+from sqlalchemy import bindparam, delete, insert, update
 from sqlalchemy.exc import SQLAlchemyError
-from app.extensions import db, limiter, cache
+from app.extensions import db, limiter
 from app.models import (
+    ArchivedServiceTicket,
+    Customer,
     Inventory,
     InventoryAssignment,
     Mechanic,
@@ -9,14 +23,31 @@ from app.models import (
     ServiceStatus,
     ServiceTicket,
 )
-from app.blueprints.serviceticket.serviceTicketSchemas import ServiceTicketSchema
+from app.blueprints.serviceticket.serviceTicketSchemas import (
+    ARCHIVED_TICKET_LOAD_OPTIONS,
+    SERVICE_TICKET_LOAD_OPTIONS,
+    ServiceTicketSchema,
+    ServiceTicketSummarySchema,
+)
 from app.utils.util import mechanic_token_required
+from app.utils.archive import archive_closed_tickets, archive_cutoff
+from app.utils.queries import inventory_assignment
+from app.utils.sql_stats import query_budget
+from app.utils.caching import TICKET_TAGS, cached_view, invalidate_on_commit
+from app.utils.versioning import conditional_get, touch
+from app.utils.totals import adjust_ticket_totals, recompute_ticket_totals
+from app.utils.pagination import InvalidCursor, keyset_page, parse_limit
 
 service_ticket_bp = Blueprint("service_ticket", __name__, url_prefix="/service_ticket")
 
 # Schema instances
 service_ticket_schema = ServiceTicketSchema()
 service_tickets_schema = ServiceTicketSchema(many=True)
+bulk_ticket_schema = ServiceTicketSchema(load_instance=False)
+service_ticket_summaries_schema = ServiceTicketSummarySchema(many=True)
+
+MAX_BULK_TICKETS = 500
+EXPORT_BATCH_SIZE = 500
 
 
 def parse_status(status_str):
@@ -32,6 +63,84 @@ def parse_status(status_str):
         )
 
 
+def parse_date_arg(name):
+    """
+    Parses an optional YYYY-MM-DD query parameter.
+    """
+    value = request.args.get(name)
+    if value is None:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"Invalid {name} '{value}'. Use YYYY-MM-DD")
+
+
+def parse_int_arg(name):
+    """
+    Parses an optional integer query parameter.
+    """
+    value = request.args.get(name)
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"Invalid {name} '{value}'. Must be an integer")
+
+
+def filter_service_tickets(stmt):
+    """
+    Applies the ticket filters from the query string to stmt.
+    Supported: status, service_date_from, service_date_to, customer_id, vin
+    and mechanic_id; each has a supporting index on the tables.
+    """
+    customer_id = parse_int_arg("customer_id")
+    if customer_id is not None:
+        stmt = stmt.where(ServiceTicket.customer_id == customer_id)
+
+    if "vin" in request.args:
+        stmt = stmt.where(ServiceTicket.vin == request.args["vin"])
+
+    mechanic_id = parse_int_arg("mechanic_id")
+    if mechanic_id is not None:
+        stmt = stmt.where(
+            ServiceTicket.id.in_(
+                db.select(ServiceAssignment.service_ticket_id).where(
+                    ServiceAssignment.mechanic_id == mechanic_id
+                )
+            )
+        )
+
+    if "status" in request.args:
+        stmt = stmt.where(ServiceTicket.status == parse_status(request.args["status"]))
+
+    date_from = parse_date_arg("service_date_from")
+    if date_from:
+        stmt = stmt.where(ServiceTicket.service_date >= date_from)
+
+    date_to = parse_date_arg("service_date_to")
+    if date_to:
+        stmt = stmt.where(ServiceTicket.service_date <= date_to)
+
+    return stmt
+
+
+def list_projection():
+    """
+    Picks the ticket list representation from the `view` query parameter:
+    "full" (default) nests customer, mechanics and parts; "summary" returns
+    the ticket columns and totals without loading any relationship.
+    Returns (schema, loader options).
+    """
+    view = request.args.get("view", "full")
+    if view == "full":
+        return service_tickets_schema, SERVICE_TICKET_LOAD_OPTIONS
+    if view == "summary":
+        return service_ticket_summaries_schema, ()
+    raise ValueError(f"Invalid view '{view}'. Allowed values: ['full', 'summary']")
+
+
 @service_ticket_bp.route("/", methods=["POST"])
 @mechanic_token_required
 @limiter.limit("10 per hour")
@@ -82,11 +191,7 @@ def create_service_ticket(mechanic_id):
                     404,
                 )
 
-            link = db.session.execute(
-                db.select(InventoryAssignment).filter_by(
-                    service_ticket_id=new_ticket.id, inventory_id=inventory_id
-                )
-            ).scalar_one_or_none()
+            link = inventory_assignment(db.session, new_ticket.id, inventory_id)
 
             if link:
                 link.quantity += quantity
@@ -118,25 +223,254 @@ def create_service_ticket(mechanic_id):
         return jsonify({"error": f"Invalid data: {str(e)}"}), 400
 
 
+@service_ticket_bp.route("/bulk", methods=["POST"])
+@mechanic_token_required
+def create_service_tickets_bulk(mechanic_id):
+    """
+    Creates many service tickets in one transaction.
+    Body is an array of ticket payloads, same shape as POST /service_ticket/.
+    Referenced customers, mechanics and parts are validated with one IN query
+    each, and tickets and assignment rows are written with multi-row inserts.
+    Returns a result per item; invalid items are skipped, valid ones created.
+    """
+    payload = request.get_json()
+    if not isinstance(payload, list) or not payload:
+        return jsonify({"error": "Request body must be a non-empty array"}), 400
+    if len(payload) > MAX_BULK_TICKETS:
+        return (
+            jsonify({"error": f"At most {MAX_BULK_TICKETS} tickets per request"}),
+            400,
+        )
+
+    results = [None] * len(payload)
+    pending = []
+
+    for index, item in enumerate(payload):
+        if not isinstance(item, dict):
+            results[index] = bulk_error(index, "Ticket must be an object")
+            continue
+
+        item = dict(item)
+        mechanic_ids = item.pop("mechanic_ids", []) or []
+        inventory_items = item.pop("inventory_items", []) or []
+        item.setdefault("status", "PENDING")
+
+        try:
+            row = bulk_ticket_schema.load(item)
+        except ValidationError as e:
+            results[index] = bulk_error(index, e.messages)
+            continue
+
+        try:
+            mechanic_ids, parts = bulk_assignments(mechanic_ids, inventory_items)
+        except ValueError as e:
+            results[index] = bulk_error(index, str(e))
+            continue
+
+        pending.append((index, row, mechanic_ids, parts))
+
+    try:
+        known_customers = existing_ids(
+            Customer, {row["customer_id"] for _, row, _, _ in pending}
+        )
+        known_mechanics = existing_ids(
+            Mechanic, set().union(*(m_ids for _, _, m_ids, _ in pending))
+        )
+        prices = inventory_prices(
+            set().union(*(parts.keys() for _, _, _, parts in pending))
+        )
+
+        valid = []
+        for index, row, m_ids, parts in pending:
+            if row["customer_id"] not in known_customers:
+                error = f"Customer with ID {row['customer_id']} not found."
+            elif m_ids - known_mechanics:
+                error = f"Mechanic with ID {min(m_ids - known_mechanics)} not found."
+            elif parts.keys() - prices.keys():
+                error = (
+                    f"Inventory with ID {min(parts.keys() - prices.keys())} not found."
+                )
+            else:
+                row["mechanic_count"] = len(m_ids)
+                row["parts_count"] = sum(parts.values())
+                row["parts_total"] = sum(
+                    quantity * prices[inventory_id]
+                    for inventory_id, quantity in parts.items()
+                )
+                valid.append((index, row, m_ids, parts))
+                continue
+            results[index] = bulk_error(index, error)
+
+        if valid:
+            ticket_ids = db.session.scalars(
+                insert(ServiceTicket).returning(
+                    ServiceTicket.id, sort_by_parameter_order=True
+                ),
+                [row for _, row, _, _ in valid],
+            ).all()
+
+            service_rows = []
+            inventory_rows = []
+            for (index, _, m_ids, parts), ticket_id in zip(valid, ticket_ids):
+                service_rows.extend(
+                    {"service_ticket_id": ticket_id, "mechanic_id": m_id}
+                    for m_id in sorted(m_ids)
+                )
+                inventory_rows.extend(
+                    {
+                        "service_ticket_id": ticket_id,
+                        "inventory_id": inventory_id,
+                        "quantity": quantity,
+                    }
+                    for inventory_id, quantity in parts.items()
+                )
+                results[index] = {
+                    "index": index,
+                    "status": "created",
+                    "ticket_id": ticket_id,
+                }
+
+            if service_rows:
+                db.session.execute(insert(ServiceAssignment), service_rows)
+            if inventory_rows:
+                db.session.execute(insert(InventoryAssignment), inventory_rows)
+            invalidate_on_commit(
+                db.session,
+                *TICKET_TAGS,
+                *(f"customer:{row['customer_id']}" for _, row, _, _ in valid),
+            )
+            touch(
+                db.session,
+                customer_ids={row["customer_id"] for _, row, _, _ in valid},
+                inventory_ids={row["inventory_id"] for row in inventory_rows},
+                mechanic_ids={row["mechanic_id"] for row in service_rows},
+            )
+            db.session.commit()
+
+    except SQLAlchemyError:
+        db.session.rollback()
+        return jsonify({"error": "Database error occurred"}), 500
+
+    created = sum(1 for result in results if result["status"] == "created")
+    if created == len(payload):
+        status_code = 201
+    elif created:
+        status_code = 207
+    else:
+        status_code = 400
+
+    return (
+        jsonify(
+            {
+                "created": created,
+                "failed": len(payload) - created,
+                "results": results,
+            }
+        ),
+        status_code,
+    )
+
+
+def bulk_error(index, error):
+    return {"index": index, "status": "error", "error": error}
+
+
+def is_id(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def bulk_assignments(mechanic_ids, inventory_items):
+    """
+    Validates one bulk item's mechanic_ids and inventory_items, returning
+    the set of mechanic ids and {inventory_id: total quantity}. Raises
+    ValueError with the message for the item's result otherwise.
+    """
+    if not isinstance(mechanic_ids, list) or not all(map(is_id, mechanic_ids)):
+        raise ValueError("mechanic_ids must be a list of integers")
+    if not isinstance(inventory_items, list):
+        raise ValueError("inventory_items must be a list of objects")
+
+    parts = {}
+    for part in inventory_items:
+        if not isinstance(part, dict):
+            raise ValueError("inventory_items must be a list of objects")
+        inventory_id = part.get("inventory_id")
+        quantity = part.get("quantity", 1)
+        if not is_id(inventory_id):
+            raise ValueError("inventory_id must be an integer")
+        if not is_id(quantity) or quantity < 1:
+            raise ValueError("quantity must be a positive integer")
+        parts[inventory_id] = parts.get(inventory_id, 0) + quantity
+    return set(mechanic_ids), parts
+
+
+def existing_ids(model, ids):
+    """
+    Returns the subset of ids that exist for model, in a single IN query.
+    """
+    if not ids:
+        return set()
+    return set(db.session.scalars(db.select(model.id).where(model.id.in_(ids))))
+
+
+def inventory_prices(ids):
+    """
+    Returns {inventory_id: price} for the ids that exist, in a single IN query.
+    """
+    if not ids:
+        return {}
+    return dict(
+        db.session.execute(
+            db.select(Inventory.id, Inventory.price).where(Inventory.id.in_(ids))
+        ).all()
+    )
+
+
 @service_ticket_bp.route("/", methods=["GET"])
+@query_budget(6)
 @mechanic_token_required
-@cache.cached(timeout=30)
+# Every mechanic sees the same list, so one entry serves them all
+@cached_view(
+    tags=("service_tickets",), vary_on_subject=False, stale_while_revalidate=True
+)
 def get_service_tickets(mechanic_id):
     """
     Retrieves all service tickets (with pagination support, cached for performance).
     Only authenticated mechanics can view tickets.
+
+    Filters: status, service_date_from, service_date_to, customer_id, vin,
+    mechanic_id.
+
+    `view=summary` returns the lightweight projection with the ticket totals
+    instead of nested customer, mechanics and parts.
+
+    Passing `after` and/or `limit` switches to cursor pagination ordered on
+    (date_created, id); `include_total=true` adds the total count.
+    Otherwise the classic `page`/`per_page` pagination is used.
     """
+    try:
+        stmt = filter_service_tickets(db.select(ServiceTicket))
+        schema, options = list_projection()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if "after" in request.args or "limit" in request.args:
+        return get_service_tickets_by_cursor(stmt, schema, options)
+
     page = request.args.get("page", 1, type=int)
     per_page = request.args.get("per_page", 10, type=int)
 
     try:
-        pagination = ServiceTicket.query.paginate(
-            page=page, per_page=per_page, error_out=False
+        pagination = db.paginate(
+            stmt.options(*options).order_by(ServiceTicket.id),
+            page=page,
+            per_page=per_page,
+            error_out=False,
         )
         tickets = pagination.items
 
         response = {
-            "service_tickets": service_tickets_schema.dump(tickets),
+            "service_tickets": schema.dump(tickets),
             "total": pagination.total,
             "page": pagination.page,
             "per_page": pagination.per_page,
@@ -147,20 +481,109 @@ def get_service_tickets(mechanic_id):
         return jsonify({"error": "Database error occurred"}), 500
 
 
+def get_service_tickets_by_cursor(stmt, schema, options):
+    """
+    Keyset pagination for the ticket list: no OFFSET scan, and the COUNT(*)
+    only runs when the client asks for it.
+    """
+    after = request.args.get("after")
+    limit = parse_limit(request.args.get("limit", type=int))
+    include_total = request.args.get("include_total", "").lower() in ("1", "true")
+
+    try:
+        tickets, next_cursor = keyset_page(
+            db.session,
+            stmt.options(*options),
+            ServiceTicket.date_created,
+            ServiceTicket.id,
+            after=after,
+            limit=limit,
+        )
+
+        response = {
+            "service_tickets": schema.dump(tickets),
+            "limit": limit,
+            "next_cursor": next_cursor,
+        }
+        if include_total:
+            response["total"] = db.session.scalar(
+                db.select(db.func.count()).select_from(stmt.subquery())
+            )
+        return jsonify(response), 200
+    except InvalidCursor as e:
+        return jsonify({"error": str(e)}), 400
+    except SQLAlchemyError:
+        return jsonify({"error": "Database error occurred"}), 500
+
+
+@service_ticket_bp.route("/export", methods=["GET"])
+@mechanic_token_required
+def export_service_tickets(mechanic_id):
+    """
+    Streams every service ticket as newline-delimited JSON.
+    Accepts the same filters as the list endpoint.
+    Rows are read through a server-side cursor in batches, with relationships
+    loaded per batch, and each batch is released once written.
+    """
+    try:
+        stmt = filter_service_tickets(db.select(ServiceTicket))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    stmt = (
+        stmt.options(*SERVICE_TICKET_LOAD_OPTIONS)
+        .order_by(ServiceTicket.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+
+    # Each line takes the provider's compact (orjson) path
+    encode = current_app.json.dumps_compact
+
+    def generate():
+        for batch in db.session.scalars(stmt).partitions():
+            yield b"".join(
+                encode(service_ticket_schema.dump(ticket)) + b"\n" for ticket in batch
+            )
+            db.session.expunge_all()
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+
 @service_ticket_bp.route("/<int:ticket_id>", methods=["GET"])
+# One more than a live ticket takes, for the miss before an archived one
+@query_budget(7)
 @mechanic_token_required
+@conditional_get(ServiceTicket, "ticket_id")
 def get_service_ticket(mechanic_id, ticket_id):
     """
     Retrieves a specific service ticket by ID.
     Only authenticated mechanics can view tickets.
+    Tickets moved to the archive are served from there, flagged "archived".
     """
     try:
-        ticket = db.session.get(ServiceTicket, ticket_id)
+        ticket = db.session.get(
+            ServiceTicket, ticket_id, options=SERVICE_TICKET_LOAD_OPTIONS
+        )
+        if ticket:
+            return (
+                jsonify(
+                    {"status": "success", "ticket": service_ticket_schema.dump(ticket)}
+                ),
+                200,
+            )
+
+        ticket = db.session.get(
+            ArchivedServiceTicket, ticket_id, options=ARCHIVED_TICKET_LOAD_OPTIONS
+        )
         if not ticket:
             abort(404, description="Service ticket not found.")
         return (
             jsonify(
-                {"status": "success", "ticket": service_ticket_schema.dump(ticket)}
+                {
+                    "status": "success",
+                    "archived": True,
+                    "ticket": service_ticket_schema.dump(ticket),
+                }
             ),
             200,
         )
@@ -174,6 +597,9 @@ def update_service_ticket(mechanic_id, ticket_id):
     """
     Updates a service ticket: add/remove mechanics, add/remove inventory parts, and update status.
     Only authenticated mechanics can perform updates. Only fields provided in the request will be updated.
+    The ticket's current assignments are loaded once and diffed against the
+    request, so the edit costs the same handful of queries however many
+    mechanics or parts it touches.
     """
     ticket = db.session.get(ServiceTicket, ticket_id)
     if not ticket:
@@ -181,90 +607,165 @@ def update_service_ticket(mechanic_id, ticket_id):
 
     data = request.get_json()
 
-    
-    add_mechanics = data.pop("add_mechanics", None)
-    remove_mechanics = data.pop("remove_mechanics", None)
-    add_inventory = data.pop("add_inventory", None)
-    remove_inventory = data.pop("remove_inventory", None)
+    add_mechanics = data.pop("add_mechanics", None) or []
+    remove_mechanics = set(data.pop("remove_mechanics", None) or [])
+    add_inventory = data.pop("add_inventory", None) or []
+    remove_inventory = set(data.pop("remove_inventory", None) or [])
     new_status = data.pop("status", None)
 
     try:
+        added_parts = {}
+        for item in add_inventory:
+            inventory_id = item.get("inventory_id")
+            added_parts[inventory_id] = added_parts.get(
+                inventory_id, 0
+            ) + item.get("quantity", 1)
+
+        current_mechanics = set(
+            db.session.scalars(
+                db.select(ServiceAssignment.mechanic_id).where(
+                    ServiceAssignment.service_ticket_id == ticket.id
+                )
+            )
+        )
+        current_parts = {}
+        current_quantities = {}
+        for link_id, inventory_id, quantity in db.session.execute(
+            db.select(
+                InventoryAssignment.id,
+                InventoryAssignment.inventory_id,
+                InventoryAssignment.quantity,
+            )
+            .where(InventoryAssignment.service_ticket_id == ticket.id)
+            .order_by(InventoryAssignment.id)
+        ):
+            current_parts.setdefault(inventory_id, link_id)
+            current_quantities[inventory_id] = (
+                current_quantities.get(inventory_id, 0) + quantity
+            )
+
+        new_mechanics = [
+            m_id for m_id in dict.fromkeys(add_mechanics) if m_id not in current_mechanics
+        ]
+        known_mechanics = existing_ids(Mechanic, set(new_mechanics))
+        for m_id in new_mechanics:
+            if m_id not in known_mechanics:
+                return jsonify({"error": f"Mechanic with ID {m_id} not found."}), 404
+
+        parts_to_remove = current_parts.keys() & remove_inventory
+        prices = inventory_prices(set(added_parts) | parts_to_remove)
+        for inventory_id in added_parts:
+            if inventory_id not in prices:
+                return (
+                    jsonify({"error": f"Inventory with ID {inventory_id} not found."}),
+                    404,
+                )
+
         service_ticket_schema.load(
             data, instance=ticket, session=db.session, partial=True
-        )        
-        if add_mechanics:
-            for m_id in add_mechanics:
-                if not db.session.execute(
-                    db.select(ServiceAssignment).filter_by(
-                        service_ticket_id=ticket.id, mechanic_id=m_id
-                    )
-                ).scalar_one_or_none():
-                    mechanic = db.session.get(Mechanic, m_id)
-                    if not mechanic:
-                        return (
-                            jsonify({"error": f"Mechanic with ID {m_id} not found."}),
-                            404,
-                        )
-                    assignment = ServiceAssignment(
-                        service_ticket_id=ticket.id, mechanic_id=m_id
-                    )
-                    db.session.add(assignment)
-
-        if remove_mechanics:
-            for m_id in remove_mechanics:
-                assignment = db.session.execute(
-                    db.select(ServiceAssignment).filter_by(
-                        service_ticket_id=ticket.id, mechanic_id=m_id
-                    )
-                ).scalar_one_or_none()
-                if assignment:
-                    db.session.delete(assignment)
-
-        
-        if add_inventory:
-            for item in add_inventory:
-                inventory_id = item.get("inventory_id")
-                quantity = item.get("quantity", 1)
-                inventory = db.session.get(Inventory, inventory_id)
-                if not inventory:
-                    return (
-                        jsonify(
-                            {"error": f"Inventory with ID {inventory_id} not found."}
-                        ),
-                        404,
-                    )
-
-                link = db.session.execute(
-                    db.select(InventoryAssignment).filter_by(
-                        service_ticket_id=ticket.id, inventory_id=inventory_id
-                    )
-                ).scalar_one_or_none()
-
-                if link:
-                    link.quantity += quantity
-                else:
-                    link = InventoryAssignment(
-                        service_ticket_id=ticket.id,
-                        inventory_id=inventory_id,
-                        quantity=quantity,
-                    )
-                    db.session.add(link)
-     
-        if remove_inventory:
-            for inventory_id in remove_inventory:
-                link = db.session.execute(
-                    db.select(InventoryAssignment).filter_by(
-                        service_ticket_id=ticket.id, inventory_id=inventory_id
-                    )
-                ).scalar_one_or_none()
-                if link:
-                    db.session.delete(link)
-
-       
+        )
         if new_status:
             ticket.status = parse_status(new_status)
+        # Write the ticket's own columns (and their version check) before the
+        # assignment statements below bump its version
+        db.session.flush()
+
+        mechanics_to_add = [
+            m_id for m_id in new_mechanics if m_id not in remove_mechanics
+        ]
+        mechanics_to_remove = current_mechanics & remove_mechanics
+        parts_to_increment = [
+            {"link_id": current_parts[inventory_id], "added": quantity}
+            for inventory_id, quantity in added_parts.items()
+            if inventory_id in current_parts and inventory_id not in remove_inventory
+        ]
+        parts_to_add = [
+            {
+                "service_ticket_id": ticket.id,
+                "inventory_id": inventory_id,
+                "quantity": quantity,
+            }
+            for inventory_id, quantity in added_parts.items()
+            if inventory_id not in current_parts and inventory_id not in remove_inventory
+        ]
+
+        if mechanics_to_add:
+            db.session.execute(
+                insert(ServiceAssignment),
+                [
+                    {"service_ticket_id": ticket.id, "mechanic_id": m_id}
+                    for m_id in mechanics_to_add
+                ],
+            )
+        if mechanics_to_remove:
+            db.session.execute(
+                delete(ServiceAssignment)
+                .where(
+                    ServiceAssignment.service_ticket_id == ticket.id,
+                    ServiceAssignment.mechanic_id.in_(mechanics_to_remove),
+                )
+                .execution_options(synchronize_session=False)
+            )
+        if parts_to_add:
+            db.session.execute(insert(InventoryAssignment), parts_to_add)
+        if parts_to_increment:
+            links = InventoryAssignment.__table__
+            db.session.execute(
+                update(links)
+                .where(links.c.id == bindparam("link_id"))
+                .values(quantity=links.c.quantity + bindparam("added")),
+                parts_to_increment,
+            )
+        if parts_to_remove:
+            db.session.execute(
+                delete(InventoryAssignment)
+                .where(
+                    InventoryAssignment.service_ticket_id == ticket.id,
+                    InventoryAssignment.inventory_id.in_(parts_to_remove),
+                )
+                .execution_options(synchronize_session=False)
+            )
+
+        changed_mechanics = set(mechanics_to_add) | mechanics_to_remove
+        changed_parts = (added_parts.keys() - remove_inventory) | parts_to_remove
+        quantity_deltas = {
+            inventory_id: quantity
+            for inventory_id, quantity in added_parts.items()
+            if inventory_id not in remove_inventory
+        }
+        for inventory_id in parts_to_remove:
+            quantity_deltas[inventory_id] = -current_quantities[inventory_id]
+        adjust_ticket_totals(
+            db.session,
+            {
+                ticket.id: (
+                    len(mechanics_to_add) - len(mechanics_to_remove),
+                    sum(quantity_deltas.values()),
+                    sum(
+                        quantity * prices[inventory_id]
+                        for inventory_id, quantity in quantity_deltas.items()
+                    ),
+                )
+            },
+        )
+        if changed_mechanics or changed_parts:
+            invalidate_on_commit(
+                db.session, *TICKET_TAGS, f"customer:{ticket.customer_id}"
+            )
+            touch(
+                db.session,
+                ticket_ids={ticket.id},
+                inventory_ids=changed_parts,
+                mechanic_ids=changed_mechanics,
+            )
 
         db.session.commit()
+        # Instances expired by the commit would lazy-load one by one while
+        # dumping; start clean so the loader options cover the whole tree
+        db.session.expunge_all()
+        ticket = db.session.get(
+            ServiceTicket, ticket_id, options=SERVICE_TICKET_LOAD_OPTIONS
+        )
         return (
             jsonify(
                 {
@@ -301,3 +802,50 @@ def delete_service_ticket(mechanic_id, ticket_id):
     except SQLAlchemyError:
         db.session.rollback()
         return jsonify({"error": "Database error occurred"}), 500
+
+
+@service_ticket_bp.cli.command("recompute-totals")
+def recompute_totals_command():
+    """
+    Recomputes parts_total, parts_count and mechanic_count on every ticket.
+    """
+    repaired = recompute_ticket_totals(db.session)
+    invalidate_on_commit(db.session, *TICKET_TAGS)
+    db.session.commit()
+    click.echo(f"Repaired totals on {repaired} service ticket(s).")
+
+
+@service_ticket_bp.cli.command("archive")
+@click.option(
+    "--older-than-days",
+    type=int,
+    default=None,
+    help="Archive tickets serviced this many days ago or earlier [ARCHIVE_AFTER_DAYS].",
+)
+@click.option(
+    "--batch-size",
+    type=int,
+    default=None,
+    help="Tickets moved per transaction [ARCHIVE_BATCH_SIZE].",
+)
+@click.option(
+    "--max-batches", type=int, default=None, help="Stop after this many batches."
+)
+def archive_command(older_than_days, batch_size, max_batches):
+    """
+    Moves closed tickets and their assignments into the archive tables.
+    Each batch commits on its own, so the job can be stopped and rerun.
+    """
+    if older_than_days is None:
+        older_than_days = current_app.config["ARCHIVE_AFTER_DAYS"]
+    if batch_size is None:
+        batch_size = current_app.config["ARCHIVE_BATCH_SIZE"]
+    cutoff = archive_cutoff(older_than_days)
+
+    archived = 0
+    for moved in archive_closed_tickets(
+        db.session, cutoff, batch_size=batch_size, max_batches=max_batches
+    ):
+        archived += moved
+        click.echo(f"Archived {moved} service ticket(s).")
+    click.echo(f"Archived {archived} service ticket(s) serviced before {cutoff}.")
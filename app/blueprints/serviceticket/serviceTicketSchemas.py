@@ -1,6 +1,16 @@
 from app.extensions import ma
-from app.models import ServiceTicket, ServiceStatus
+from app.models import (
+    ArchivedInventoryAssignment,
+    ArchivedServiceAssignment,
+    ArchivedServiceTicket,
+    InventoryAssignment,
+    Mechanic,
+    ServiceAssignment,
+    ServiceStatus,
+    ServiceTicket,
+)
 from marshmallow import fields, ValidationError
+from sqlalchemy.orm import joinedload, selectinload
 
 
 #
@@ -42,6 +52,9 @@ class ServiceTicketSchema(ma.SQLAlchemySchema):
     cost = ma.auto_field()
     date_created = ma.auto_field()
     customer_id = ma.auto_field()
+    parts_total = ma.auto_field(dump_only=True)
+    parts_count = ma.auto_field(dump_only=True)
+    mechanic_count = ma.auto_field(dump_only=True)
 
     customer = ma.Nested("CustomerSchema", only=("id", "name"), dump_only=True)
     service_assignments = ma.Nested(
@@ -60,3 +73,51 @@ class ServiceTicketSchema(ma.SQLAlchemySchema):
         dump_only=True,
         exclude=("service_ticket",) 
     )
+
+
+class ServiceTicketSummarySchema(ma.SQLAlchemySchema):
+    """
+    Lightweight list projection: the ticket's own columns and its
+    denormalized totals, without any relationships.
+    """
+
+    class Meta:
+        model = ServiceTicket
+
+    id = ma.auto_field()
+    title = ma.auto_field()
+    service_date = ma.auto_field()
+    vin = ma.auto_field()
+    status = EnumField(ServiceStatus)
+    cost = ma.auto_field()
+    date_created = ma.auto_field()
+    customer_id = ma.auto_field()
+    parts_total = ma.auto_field()
+    parts_count = ma.auto_field()
+    mechanic_count = ma.auto_field()
+
+
+# Loader strategy matching every relationship ServiceTicketSchema touches when
+# dumping, so a page of tickets costs a fixed number of queries.
+SERVICE_TICKET_LOAD_OPTIONS = (
+    joinedload(ServiceTicket.customer),
+    selectinload(ServiceTicket.mechanics),
+    selectinload(ServiceTicket.service_assignments)
+    .joinedload(ServiceAssignment.mechanic)
+    .selectinload(Mechanic.service_tickets),
+    selectinload(ServiceTicket.inventory_assignments).joinedload(
+        InventoryAssignment.inventory
+    ),
+)
+
+# The same for an archived ticket, which ServiceTicketSchema dumps unchanged
+ARCHIVED_TICKET_LOAD_OPTIONS = (
+    joinedload(ArchivedServiceTicket.customer),
+    selectinload(ArchivedServiceTicket.mechanics),
+    selectinload(ArchivedServiceTicket.service_assignments)
+    .joinedload(ArchivedServiceAssignment.mechanic)
+    .selectinload(Mechanic.service_tickets),
+    selectinload(ArchivedServiceTicket.inventory_assignments).joinedload(
+        ArchivedInventoryAssignment.inventory
+    ),
+)
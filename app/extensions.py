@@ -1,12 +1,22 @@
-from flask_migrate import Migrate
 from flask_sqlalchemy import SQLAlchemy
 from flask_marshmallow import Marshmallow
 from flask_limiter import Limiter
-from flask_limiter.util import get_remote_address
 from flask_caching import Cache
 
-db = SQLAlchemy()
+from app.utils.compression import Compression
+from app.utils.deferred import DeferredMigrate
+from app.utils.pool_metrics import PoolMetrics
+from app.utils.replicas import ReadReplica, RoutingSession
+from app.utils.sql_stats import SQLStats
+from app.utils import sqlite_limits  # noqa: F401 - registers the sqlite:// limits storage
+from app.utils.util import rate_limit_key
+
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 ma = Marshmallow()
-limiter = Limiter(key_func=get_remote_address)
-cache = Cache(config={"CACHE_TYPE": "SimpleCache"})
-migrate = Migrate()
+limiter = Limiter(key_func=rate_limit_key)
+cache = Cache()
+read_replica = ReadReplica(db, cache)
+migrate = DeferredMigrate()
+compression = Compression()
+pool_metrics = PoolMetrics()
+sql_stats = SQLStats(db)
@@ -1,10 +1,10 @@
 import enum
 from datetime import date
 from typing import List
-from sqlalchemy import Integer, String, Float, Date, ForeignKey, Enum
+from sqlalchemy import Integer, String, Float, Date, ForeignKey, Enum, Index, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from .extensions import db
-from werkzeug.security import generate_password_hash, check_password_hash
+from .utils.passwords import hash_password, verify_password
 
 
 class ServiceStatus(enum.Enum):
@@ -16,6 +16,12 @@ class ServiceStatus(enum.Enum):
 
 class ServiceAssignment(db.Model):
     __tablename__ = "service_assignment"
+    __table_args__ = (
+        # The primary key leads with service_ticket_id; this serves the
+        # mechanic_id filter on the ticket list
+        Index("ix_service_assignment_mechanic_id_ticket", "mechanic_id", "service_ticket_id"),
+        Index("ix_service_assignment_date_assigned", "date_assigned"),
+    )
 
     service_ticket_id: Mapped[int] = mapped_column(
         ForeignKey("service_tickets.id", ondelete="CASCADE", onupdate="CASCADE"),
@@ -49,10 +55,10 @@ class Mechanic(db.Model):
     password: Mapped[str] = mapped_column("password", String(128), nullable=False)
 
     def set_password(self, password: str):
-        self.password = generate_password_hash(password)
+        self.password = hash_password(password)
 
     def check_password(self, password: str) -> bool:
-        return check_password_hash(self.password, password)
+        return verify_password(self.password, password)
 
     service_assignments: Mapped[List["ServiceAssignment"]] = relationship(
         "ServiceAssignment", back_populates="mechanic", cascade="all, delete-orphan"
@@ -74,20 +80,34 @@ class Customer(db.Model):
     email: Mapped[str] = mapped_column(String(360), nullable=False, unique=True)
     phone: Mapped[str] = mapped_column(String(20), nullable=False)
     address: Mapped[str] = mapped_column(String(255), nullable=False)
+    # ETag counter bumped by app.utils.versioning; not a version_id_col, as
+    # bumps cascaded from unrelated writes would fail concurrent updates
+    version_id: Mapped[int] = mapped_column(Integer, nullable=False, server_default="1")
 
     service_tickets: Mapped[List["ServiceTicket"]] = relationship(
         "ServiceTicket", back_populates="customer", cascade="all, delete-orphan"
     )
 
     def set_password(self, password: str):
-        self.password = generate_password_hash(password)
+        self.password = hash_password(password)
 
     def check_password(self, password: str) -> bool:
-        return check_password_hash(self.password, password)
+        return verify_password(self.password, password)
 
 
 class ServiceTicket(db.Model):
     __tablename__ = "service_tickets"
+    __table_args__ = (
+        # Stable sort key for keyset pagination on the ticket list
+        Index("ix_service_tickets_date_created_id", "date_created", "id"),
+        # Filters on the ticket list, each combined with the date range
+        Index("ix_service_tickets_customer_id_service_date", "customer_id", "service_date"),
+        Index("ix_service_tickets_status_service_date", "status", "service_date"),
+        Index("ix_service_tickets_vin", "vin"),
+        Index("ix_service_tickets_service_date", "service_date"),
+        # Never hand out the id of a deleted or archived ticket again
+        {"sqlite_autoincrement": True},
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     title: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -97,6 +117,19 @@ class ServiceTicket(db.Model):
     status: Mapped[ServiceStatus] = mapped_column(Enum(ServiceStatus), nullable=False)
     cost: Mapped[float] = mapped_column(Float, nullable=False)
     date_created: Mapped[date] = mapped_column(Date, nullable=False)
+    # ETag counter, see Customer.version_id
+    version_id: Mapped[int] = mapped_column(Integer, nullable=False, server_default="1")
+
+    # Denormalized from the assignments; kept in sync by app.utils.totals
+    parts_total: Mapped[float] = mapped_column(
+        Float, nullable=False, default=0.0, server_default="0"
+    )
+    parts_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    mechanic_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
 
     customer_id: Mapped[int] = mapped_column(
         ForeignKey("customers.id", ondelete="CASCADE", onupdate="CASCADE"),
@@ -132,6 +165,8 @@ class Inventory(db.Model):
     price: Mapped[float] = mapped_column(Float, nullable=False)
     quantity: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     description: Mapped[str] = mapped_column(String(500), nullable=True)
+    # ETag counter, see Customer.version_id
+    version_id: Mapped[int] = mapped_column(Integer, nullable=False, server_default="1")
 
     inventory_assignments: Mapped[List["InventoryAssignment"]] = relationship(
         "InventoryAssignment",
@@ -142,6 +177,17 @@ class Inventory(db.Model):
 
 class InventoryAssignment(db.Model):
     __tablename__ = "inventory_assignment"
+    __table_args__ = (
+        # A part appears once per ticket, with a quantity; every lookup is by
+        # this pair, and the leading column serves per-ticket queries
+        UniqueConstraint(
+            "service_ticket_id",
+            "inventory_id",
+            name="uq_inventory_assignment_ticket_inventory",
+        ),
+        # Repricing and part deletes find the tickets using a part
+        Index("ix_inventory_assignment_inventory_id", "inventory_id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, unique=True)
     service_ticket_id: Mapped[int] = mapped_column(
@@ -160,3 +206,85 @@ class InventoryAssignment(db.Model):
     inventory: Mapped["Inventory"] = relationship(
         "Inventory", back_populates="inventory_assignments"
     )
+
+
+# Closed tickets moved out of the live tables by app.utils.archive, with the
+# same columns plus the day they were archived. Written only by the archive
+# job; the relationships mirror the live ones so ServiceTicketSchema can dump
+# an archived ticket unchanged.
+class ArchivedServiceTicket(db.Model):
+    __tablename__ = "service_tickets_archive"
+    __table_args__ = (
+        Index("ix_service_tickets_archive_customer_id", "customer_id"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    title: Mapped[str] = mapped_column(String(255), nullable=False)
+    service_date: Mapped[date] = mapped_column(Date, nullable=False)
+    vin: Mapped[str] = mapped_column(String(17), nullable=False)
+    description: Mapped[str] = mapped_column(String(255), nullable=False)
+    status: Mapped[ServiceStatus] = mapped_column(Enum(ServiceStatus), nullable=False)
+    cost: Mapped[float] = mapped_column(Float, nullable=False)
+    date_created: Mapped[date] = mapped_column(Date, nullable=False)
+    parts_total: Mapped[float] = mapped_column(Float, nullable=False)
+    parts_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    mechanic_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    archived_at: Mapped[date] = mapped_column(Date, nullable=False)
+
+    customer_id: Mapped[int] = mapped_column(
+        ForeignKey("customers.id", ondelete="CASCADE", onupdate="CASCADE"),
+        nullable=False,
+    )
+    customer: Mapped["Customer"] = relationship("Customer", viewonly=True)
+
+    inventory_assignments: Mapped[List["ArchivedInventoryAssignment"]] = relationship(
+        "ArchivedInventoryAssignment", viewonly=True
+    )
+    service_assignments: Mapped[List["ArchivedServiceAssignment"]] = relationship(
+        "ArchivedServiceAssignment", viewonly=True
+    )
+    mechanics: Mapped[List["Mechanic"]] = relationship(
+        "Mechanic", secondary="service_assignment_archive", viewonly=True
+    )
+
+
+class ArchivedServiceAssignment(db.Model):
+    __tablename__ = "service_assignment_archive"
+    __table_args__ = (
+        # Mechanic rankings count archived tickets too
+        Index("ix_service_assignment_archive_mechanic_id", "mechanic_id"),
+    )
+
+    service_ticket_id: Mapped[int] = mapped_column(
+        ForeignKey("service_tickets_archive.id", ondelete="CASCADE", onupdate="CASCADE"),
+        primary_key=True,
+    )
+    mechanic_id: Mapped[int] = mapped_column(
+        ForeignKey("mechanics.id", ondelete="CASCADE", onupdate="CASCADE"),
+        primary_key=True,
+    )
+
+    date_assigned: Mapped[date] = mapped_column(Date, nullable=True)
+
+    mechanic: Mapped["Mechanic"] = relationship("Mechanic", viewonly=True)
+
+
+class ArchivedInventoryAssignment(db.Model):
+    __tablename__ = "inventory_assignment_archive"
+    __table_args__ = (
+        Index("ix_inventory_assignment_archive_service_ticket_id", "service_ticket_id"),
+        Index("ix_inventory_assignment_archive_inventory_id", "inventory_id"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    service_ticket_id: Mapped[int] = mapped_column(
+        ForeignKey("service_tickets_archive.id", ondelete="CASCADE", onupdate="CASCADE"),
+        nullable=False,
+    )
+    inventory_id: Mapped[int] = mapped_column(
+        ForeignKey("inventory.id", ondelete="CASCADE", onupdate="CASCADE"),
+        nullable=False,
+    )
+    quantity: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    inventory: Mapped["Inventory"] = relationship("Inventory", viewonly=True)
@@ -0,0 +1,123 @@
+from datetime import date, timedelta
+
+from sqlalchemy import delete, insert, literal, select
+
+from app.models import (
+    ArchivedInventoryAssignment,
+    ArchivedServiceAssignment,
+    ArchivedServiceTicket,
+    Customer,
+    Inventory,
+    InventoryAssignment,
+    ServiceAssignment,
+    ServiceStatus,
+    ServiceTicket,
+)
+from app.utils.caching import TICKET_TAGS, invalidate_on_commit
+from app.utils.versioning import bump_versions
+
+# Tickets in these states never change again and may be archived
+CLOSED_STATUSES = (ServiceStatus.COMPLETED, ServiceStatus.CANCELLED)
+
+
+def archive_cutoff(older_than_days, today=None):
+    """
+    Tickets serviced before the returned day are old enough to archive.
+    """
+    return (today or date.today()) - timedelta(days=older_than_days)
+
+
+def copy_rows(session, source, target, where, **values):
+    """
+    INSERT INTO target SELECT the matching columns FROM source WHERE where,
+    with `values` filling target columns the source lacks.
+    """
+    source, target = source.__table__, target.__table__
+    names = [column.name for column in target.columns if column.name in source.columns]
+    session.execute(
+        insert(target).from_select(
+            names + list(values),
+            select(
+                *(source.c[name] for name in names),
+                *(literal(value, target.c[name].type) for name, value in values.items()),
+            ).where(where),
+        )
+    )
+
+
+def archive_batch(session, cutoff, batch_size, today=None):
+    """
+    Moves up to batch_size closed tickets serviced before cutoff, with their
+    service and inventory assignments, into the archive tables. Returns the
+    number of tickets moved; the caller commits.
+
+    Archived tickets keep their ids, which stay unique because ticket ids
+    are never reused: service_tickets is AUTOINCREMENT on SQLite, and
+    PostgreSQL sequences and MySQL 8 counters don't go back.
+    """
+    tickets = ServiceTicket.__table__
+    rows = session.execute(
+        select(tickets.c.id, tickets.c.customer_id)
+        .where(
+            tickets.c.status.in_(CLOSED_STATUSES),
+            tickets.c.service_date < cutoff,
+        )
+        .order_by(tickets.c.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ).all()
+    if not rows:
+        return 0
+
+    ticket_ids = [ticket_id for ticket_id, _ in rows]
+    customer_ids = {customer_id for _, customer_id in rows}
+    inventory_ids = set(
+        session.scalars(
+            select(InventoryAssignment.inventory_id).where(
+                InventoryAssignment.service_ticket_id.in_(ticket_ids)
+            )
+        )
+    )
+
+    copy_rows(
+        session,
+        ServiceTicket,
+        ArchivedServiceTicket,
+        tickets.c.id.in_(ticket_ids),
+        archived_at=today or date.today(),
+    )
+    for live, archived in (
+        (ServiceAssignment, ArchivedServiceAssignment),
+        (InventoryAssignment, ArchivedInventoryAssignment),
+    ):
+        where = live.service_ticket_id.in_(ticket_ids)
+        copy_rows(session, live, archived, where)
+        session.execute(delete(live.__table__).where(where))
+    session.execute(delete(tickets).where(tickets.c.id.in_(ticket_ids)))
+
+    # Customers and parts embed their tickets in their serialized forms
+    bump_versions(session, Customer, customer_ids)
+    bump_versions(session, Inventory, inventory_ids)
+    invalidate_on_commit(
+        session,
+        *TICKET_TAGS,
+        *(f"customer:{customer_id}" for customer_id in customer_ids),
+    )
+    return len(ticket_ids)
+
+
+def archive_closed_tickets(session, cutoff, batch_size=500, max_batches=None):
+    """
+    Archives closed tickets serviced before cutoff, committing after each
+    batch so an interrupted run keeps its progress and live traffic never
+    waits on one long transaction. Yields the size of each batch.
+    """
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        moved = archive_batch(session, cutoff, batch_size)
+        session.commit()
+        if not moved:
+            return
+        batches += 1
+        yield moved
+
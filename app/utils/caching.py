@@ -0,0 +1,322 @@
+import hashlib
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from functools import wraps
+from itertools import chain
+from urllib.parse import urlencode
+
+from flask import (
+    Response,
+    copy_current_request_context,
+    current_app,
+    g,
+    has_app_context,
+    make_response,
+    request,
+)
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+from app.extensions import cache
+from app.utils.compression import encode_response, encoded_variants, negotiate
+from app.models import (
+    Customer,
+    Inventory,
+    InventoryAssignment,
+    Mechanic,
+    ServiceAssignment,
+    ServiceTicket,
+)
+
+# Session.info key holding the tags to invalidate once the transaction commits
+PENDING_TAGS = "cache_tags"
+
+# Tags shared by every cached representation that embeds service tickets
+TICKET_TAGS = ("service_tickets", "customers")
+
+# Seconds a worker may hold the lock for filling a key before others give up
+# waiting and compute it themselves
+FILL_LOCK_TIMEOUT = 10
+FILL_POLL_INTERVAL = 0.02
+
+# Response header telling clients how a cached view was served
+CACHE_STATUS_HEADER = "X-Cache-Status"
+
+# key -> [lock, number of threads using it], for coalescing within a process
+_fill_locks = {}
+_fill_locks_guard = threading.Lock()
+
+
+def cached_view(
+    timeout=None,
+    tags=(),
+    vary_on_subject=True,
+    stale_while_revalidate=False,
+    max_stale=None,
+):
+    """
+    Caches a GET view's 200 responses, for `timeout` seconds or else the
+    endpoint's entry in CACHE_VIEW_TIMEOUTS, falling back to the cache's
+    default timeout.
+
+    The key is built from the endpoint, the normalized query string, the JWT
+    subject (when vary_on_subject) and the current version of every tag.
+    Tags are format strings filled from the view kwargs and `subject`,
+    e.g. "customer:{id}" or "customer:{subject}". Must sit below the token
+    decorators so the subject is known.
+
+    With stale_while_revalidate, an expired entry is still served for up to
+    `max_stale` seconds (default CACHE_MAX_STALENESS) while one background
+    thread recomputes it. Invalidated tags still miss immediately, since
+    they change the key. Responses carry X-Cache-Status: fresh, stale or miss.
+    """
+
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            resolved = [
+                tag.format(subject=g.get("token_subject"), **kwargs) for tag in tags
+            ]
+            key = view_cache_key(resolved, vary_on_subject)
+            ttl = timeout or view_timeout()
+            stale_for = 0
+            if stale_while_revalidate:
+                ttl = ttl or current_app.config.get("CACHE_DEFAULT_TIMEOUT", 300)
+                stale_for = max_stale or current_app.config.get(
+                    "CACHE_MAX_STALENESS", 0
+                )
+
+            def compute():
+                response = make_response(f(*args, **kwargs))
+                if response.status_code == 200 and not response.is_streamed:
+                    entry = {
+                        "body": response.get_data(),
+                        "status": response.status_code,
+                        "mimetype": response.mimetype,
+                        "fresh_until": time.time() + ttl if stale_for else None,
+                        "encoded": {},
+                    }
+                    if current_app.config.get("COMPRESS_CACHED_VIEWS", True):
+                        entry["encoded"] = encoded_variants(
+                            entry["body"], entry["mimetype"]
+                        )
+                    cache.set(key, entry, timeout=ttl + stale_for if stale_for else ttl)
+                    response = cached_response(entry)
+                response.headers[CACHE_STATUS_HEADER] = "miss"
+                return response
+
+            def load(entry):
+                response = cached_response(entry)
+                fresh_until = entry.get("fresh_until")
+                if fresh_until is not None and fresh_until <= time.time():
+                    refresh_in_background(key, compute)
+                    response.headers[CACHE_STATUS_HEADER] = "stale"
+                else:
+                    response.headers[CACHE_STATUS_HEADER] = "fresh"
+                return response
+
+            return single_flight(key, compute, load)
+
+        return decorated
+
+    return decorator
+
+
+def cached_response(entry):
+    """
+    Rebuilds a cached response, using a stored compressed body when the
+    client accepts one.
+    """
+    response = Response(
+        entry["body"], status=entry["status"], mimetype=entry["mimetype"]
+    )
+    encoded = entry.get("encoded")
+    if encoded:
+        response.vary.add("Accept-Encoding")
+        coding = negotiate(list(encoded))
+        if coding:
+            encode_response(response, coding, encoded[coding])
+    return response
+
+
+def single_flight(key, compute, load):
+    """
+    Returns load(entry) for the cached entry at key. On a miss, only one
+    caller computes it: threads of this process queue on a per-key lock, and
+    other workers on a "lock:<key>" entry taken with the cache's atomic add.
+    Waiters then read what the winner stored. compute() must store the entry
+    itself, and its return value goes to its own caller only.
+    """
+    entry = cache.get(key)
+    if entry is not None:
+        return load(entry)
+
+    with fill_lock(key):
+        # has() first so the re-check doesn't count as a second miss
+        entry = cache.get(key) if cache.has(key) else None
+        if entry is not None:
+            return load(entry)
+
+        lock_key = f"lock:{key}"
+        deadline = time.monotonic() + FILL_LOCK_TIMEOUT
+        locked = cache.add(lock_key, os.getpid(), timeout=FILL_LOCK_TIMEOUT)
+        while not locked and time.monotonic() < deadline:
+            time.sleep(FILL_POLL_INTERVAL)
+            entry = cache.get(key) if cache.has(key) else None
+            if entry is not None:
+                return load(entry)
+            locked = cache.add(lock_key, os.getpid(), timeout=FILL_LOCK_TIMEOUT)
+
+        try:
+            return compute()
+        finally:
+            if locked:
+                cache.delete(lock_key)
+
+
+def refresh_in_background(key, compute):
+    """
+    Recomputes a stale entry on a daemon thread, unless a thread in some
+    worker is already refreshing it. The thread gets a copy of the request
+    context plus the token identity the view depends on.
+    """
+    lock_key = f"refresh:{key}"
+    if not cache.add(lock_key, os.getpid(), timeout=FILL_LOCK_TIMEOUT):
+        return
+
+    subject, role = g.get("token_subject"), g.get("token_role")
+
+    @copy_current_request_context
+    def refresh():
+        g.token_subject, g.token_role = subject, role
+        try:
+            compute()
+        except Exception:
+            current_app.logger.exception("Background refresh of %s failed", key)
+        finally:
+            cache.delete(lock_key)
+
+    threading.Thread(target=refresh, daemon=True).start()
+
+
+@contextmanager
+def fill_lock(key):
+    """
+    Holds this process's lock for key, dropping it from the table once no
+    thread needs it.
+    """
+    with _fill_locks_guard:
+        slot = _fill_locks.setdefault(key, [threading.Lock(), 0])
+        slot[1] += 1
+    try:
+        with slot[0]:
+            yield
+    finally:
+        with _fill_locks_guard:
+            slot[1] -= 1
+            if not slot[1]:
+                del _fill_locks[key]
+
+
+def view_timeout():
+    """
+    Returns the configured TTL for the current endpoint, or None for the
+    cache's default.
+    """
+    return current_app.config.get("CACHE_VIEW_TIMEOUTS", {}).get(request.endpoint)
+
+
+def view_cache_key(tags, vary_on_subject=True):
+    """
+    Builds the cache key for the current request.
+    """
+    subject = "anonymous"
+    if vary_on_subject and g.get("token_subject") is not None:
+        subject = f"{g.get('token_role')}:{g.token_subject}"
+
+    query = urlencode(sorted(request.args.items(multi=True)))
+    versions = "|".join(tag_versions(tags))
+    digest = hashlib.sha1(f"{query}#{versions}".encode()).hexdigest()
+    return f"view:{request.endpoint}:{subject}:{digest}"
+
+
+def tag_versions(tags):
+    """
+    Returns the current version token of each tag, creating missing ones.
+    """
+    if not tags:
+        return []
+    keys = [f"tag:{tag}" for tag in tags]
+    versions = cache.get_many(*keys)
+    for i, version in enumerate(versions):
+        if version is None:
+            cache.add(keys[i], uuid.uuid4().hex, timeout=0)
+            versions[i] = cache.get(keys[i])
+    return versions
+
+
+def invalidate_tags(*tags):
+    """
+    Gives each tag a new version, orphaning every key that was built from it.
+    """
+    if tags:
+        cache.set_many({f"tag:{tag}": uuid.uuid4().hex for tag in tags}, timeout=0)
+
+
+def invalidate_on_commit(session, *tags):
+    """
+    Queues tags for invalidation when session commits. Use for writes that
+    bypass the unit of work (bulk insert/update/delete statements).
+    """
+    session.info.setdefault(PENDING_TAGS, set()).update(tags)
+
+
+@event.listens_for(Session, "after_flush")
+def collect_cache_tags(session, flush_context):
+    """
+    Maps every flushed object to the cached representations it appears in.
+    """
+    tags = set()
+    ticket_ids = set()
+
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, ServiceTicket):
+            tags.update(TICKET_TAGS)
+            customer_ids = inspect(obj).attrs.customer_id.history
+            tags.update(
+                f"customer:{customer_id}"
+                for customer_id in chain([obj.customer_id], customer_ids.deleted)
+            )
+        elif isinstance(obj, Customer):
+            tags.update(TICKET_TAGS)
+            tags.add(f"customer:{obj.id}")
+        elif isinstance(obj, (ServiceAssignment, InventoryAssignment)):
+            tags.update(TICKET_TAGS)
+            ticket_ids.add(obj.service_ticket_id)
+        elif isinstance(obj, (Mechanic, Inventory)):
+            tags.update(TICKET_TAGS)
+            tags.add("customer_details")
+
+    if ticket_ids:
+        customer_ids = session.connection().execute(
+            select(ServiceTicket.customer_id).where(ServiceTicket.id.in_(ticket_ids))
+        )
+        tags.update(f"customer:{customer_id}" for customer_id, in customer_ids)
+
+    if tags:
+        invalidate_on_commit(session, *tags)
+
+
+@event.listens_for(Session, "after_commit")
+def flush_cache_tags(session):
+    tags = session.info.pop(PENDING_TAGS, None)
+    if tags and has_app_context():
+        invalidate_tags(*tags)
+
+
+@event.listens_for(Session, "after_rollback")
+def discard_cache_tags(session):
+    session.info.pop(PENDING_TAGS, None)
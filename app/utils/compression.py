@@ -0,0 +1,104 @@
+import gzip
+
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:  # optional; gzip alone is used without it
+    brotli = None
+
+DEFAULT_MIMETYPES = ("application/json",)
+
+
+def supported_encodings():
+    """
+    Returns the configured content codings this process can produce, in
+    order of preference.
+    """
+    encodings = current_app.config.get("COMPRESS_ENCODINGS", ("br", "gzip"))
+    return [
+        coding for coding in encodings if coding == "gzip" or (coding == "br" and brotli)
+    ]
+
+
+def compressible(body, mimetype):
+    return mimetype in current_app.config.get(
+        "COMPRESS_MIMETYPES", DEFAULT_MIMETYPES
+    ) and len(body) >= current_app.config.get("COMPRESS_MIN_SIZE", 1024)
+
+
+def compress(body, coding):
+    if coding == "br":
+        return brotli.compress(
+            body, quality=current_app.config.get("COMPRESS_BROTLI_QUALITY", 4)
+        )
+    return gzip.compress(
+        body, compresslevel=current_app.config.get("COMPRESS_LEVEL", 6), mtime=0
+    )
+
+
+def encoded_variants(body, mimetype):
+    """
+    Returns {coding: compressed body} for every supported coding, or {} when
+    the body is too small or of a type that isn't compressed. Stored next
+    to cached bodies so hits don't recompress.
+    """
+    if not compressible(body, mimetype):
+        return {}
+    return {coding: compress(body, coding) for coding in supported_encodings()}
+
+
+def negotiate(encodings):
+    """
+    Picks the coding the client prefers among `encodings`, per its
+    Accept-Encoding, or None for the identity coding.
+    """
+    return request.accept_encodings.best_match(encodings) if encodings else None
+
+
+def representation_etag(etag, coding):
+    """
+    A compressed body is a different representation, so it gets its own
+    strong ETag.
+    """
+    return f"{etag}-{coding}" if coding else etag
+
+
+def encode_response(response, coding, data):
+    response.set_data(data)
+    response.headers["Content-Encoding"] = coding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(representation_etag(etag, coding))
+    return response
+
+
+class Compression:
+    """
+    Compresses eligible responses with gzip, or brotli when installed,
+    negotiated on Accept-Encoding. Bodies under COMPRESS_MIN_SIZE bytes and
+    types outside COMPRESS_MIMETYPES pass through untouched.
+    """
+
+    def init_app(self, app):
+        app.after_request(self.after_request)
+
+    def after_request(self, response):
+        if (
+            response.status_code < 200
+            or response.status_code in (204, 304)
+            or response.direct_passthrough
+            or response.is_streamed
+            or "Content-Encoding" in response.headers
+        ):
+            return response
+
+        body = response.get_data()
+        if not compressible(body, response.mimetype):
+            return response
+
+        response.vary.add("Accept-Encoding")
+        coding = negotiate(supported_encodings())
+        if coding:
+            encode_response(response, coding, compress(body, coding))
+        return response
@@ -0,0 +1,105 @@
+import threading
+
+import click
+from werkzeug.utils import import_string
+
+
+class DeferredMigrate:
+    """
+    Flask-Migrate without importing it at startup. flask_migrate imports
+    alembic, which is most of the package's import time and only needed by
+    `flask db` and code that runs migrations.
+
+    init_app registers a `db` command group that imports the real one when
+    invoked, and an app.extensions["migrate"] placeholder that sets up the
+    real Migrate on first attribute access, so flask_migrate.upgrade() and
+    migrations/env.py keep working.
+    """
+
+    def __init__(self, directory="migrations", command="db", **kwargs):
+        self.directory = directory
+        self.command = command
+        self.kwargs = kwargs
+
+    def init_app(self, app, db):
+        app.extensions["migrate"] = DeferredMigrateConfig(self, app, db)
+        app.cli.add_command(
+            DeferredGroup(
+                self.command,
+                "flask_migrate.cli:db",
+                help="Perform database migrations.",
+            )
+        )
+
+
+class DeferredMigrateConfig:
+    def __init__(self, deferred, app, db):
+        self.deferred = deferred
+        self.app = app
+        self.db = db
+
+    def __getattr__(self, name):
+        from flask_migrate import Migrate
+
+        # Replaces this placeholder in app.extensions
+        Migrate(
+            self.app,
+            self.db,
+            directory=self.deferred.directory,
+            command=self.deferred.command,
+            **self.deferred.kwargs,
+        )
+        return getattr(self.app.extensions["migrate"], name)
+
+
+class DeferredGroup(click.Group):
+    """
+    Stand-in for the click group at `import_name`, imported when the group
+    is invoked rather than when it is registered. The real group parses
+    the arguments, so its options and callback run as usual.
+    """
+
+    def __init__(self, name, import_name, **kwargs):
+        super().__init__(name, **kwargs)
+        self.import_name = import_name
+
+    def group(self):
+        return import_string(self.import_name)
+
+    def make_context(self, info_name, args, parent=None, **extra):
+        return self.group().make_context(info_name, args, parent=parent, **extra)
+
+    def list_commands(self, ctx):
+        return self.group().list_commands(ctx)
+
+    def get_command(self, ctx, name):
+        return self.group().get_command(ctx, name)
+
+
+class LazyMount:
+    """
+    WSGI middleware passing requests under `prefix` to the app returned by
+    `factory`, which is called on the first such request. Mounted apps are
+    separate Flask apps, so keep them to self-contained pages like the
+    Swagger UI.
+    """
+
+    def __init__(self, wsgi_app, prefix, factory):
+        self.wsgi_app = wsgi_app
+        self.prefix = prefix.rstrip("/")
+        self.factory = factory
+        self.mounted = None
+        self._lock = threading.Lock()
+
+    def __call__(self, environ, start_response):
+        path = environ.get("PATH_INFO", "")
+        if path == self.prefix or path.startswith(self.prefix + "/"):
+            return self.mount()(environ, start_response)
+        return self.wsgi_app(environ, start_response)
+
+    def mount(self):
+        if self.mounted is None:
+            with self._lock:
+                if self.mounted is None:
+                    self.mounted = self.factory()
+        return self.mounted
@@ -0,0 +1,130 @@
+import enum
+import marshal
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional; the stdlib encoder is used without it
+    orjson = None
+
+
+class JSONProvider(DefaultJSONProvider):
+    """
+    Flask's stdlib provider, extended to encode enums (such as
+    ServiceStatus) by name, the spelling EnumField gives the API.
+    """
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, enum.Enum):
+            return o.name
+        return DefaultJSONProvider.default(o)
+
+    def dumps_compact(self, obj):
+        """
+        Returns obj as compact JSON bytes, spelled as a compact response
+        body, for streams that encode one value at a time.
+        """
+        return self.dumps(obj, separators=(",", ":")).encode()
+
+
+# Types orjson and the stdlib encode alike, never enums
+SCALARS = frozenset((str, int, float, bool, type(None)))
+
+
+def contains_enum(obj):
+    """
+    Whether obj holds an enum anywhere in its dicts, lists and tuples.
+    """
+    try:
+        # marshal takes only plain builtins, never enums, and walks them
+        # in C; schema dumps pass, so only the rest are walked here
+        marshal.dumps(obj)
+        return False
+    except ValueError:
+        pass
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        t = type(o)
+        if t is dict or t is list or t is tuple:
+            # Scalars are skipped inline, the bulk of any response
+            for v in o.values() if t is dict else o:
+                if type(v) not in SCALARS:
+                    stack.append(v)
+        elif isinstance(o, enum.Enum):
+            return True
+    return False
+
+
+class FastJSONProvider(JSONProvider):
+    """
+    Encodes compact responses with orjson when it is installed, as the
+    same JSON as JSONProvider: sorted keys, no whitespace, dates as HTTP
+    dates, Decimal and UUID as strings.
+
+    Anything orjson can't encode the same way falls back to the stdlib
+    encoder: pretty-printed (debug) responses, non-ASCII output while
+    ensure_ascii is on and integers beyond 64 bits. dumps() and loads()
+    stay on the stdlib.
+
+    Floats are not always spelled identically, as orjson has no option
+    to match the stdlib:
+
+    - Floats with an exponent are spelled 1e16 and 0.00001 instead of
+      1e+16 and 1e-05, the same numbers.
+    - NaN and Infinity come out as null, valid JSON, where the stdlib
+      writes the invalid NaN and Infinity.
+
+    orjson would encode enums by value, without calling default(), so
+    payloads holding a raw enum go to the stdlib, which spells them by
+    name. Schemas dump enums as names already, so API responses rarely
+    take that path.
+    """
+
+    def fast_dumps(self, obj):
+        """
+        Returns obj encoded by orjson, or None when the stdlib must be used.
+        """
+        if orjson is None:
+            return None
+        # Non-str keys raise, and so go to the stdlib, which sorts them
+        # by their original type
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if contains_enum(obj):
+            return None
+
+        def default(o):
+            # A dataclass or other object default() expands may hold enums
+            value = self.default(o)
+            if contains_enum(value):
+                raise TypeError("enum in default() result")
+            return value
+
+        try:
+            data = orjson.dumps(obj, default=default, option=option)
+        except (orjson.JSONEncodeError, TypeError):
+            return None
+        if self.ensure_ascii and not data.isascii():
+            return None
+        return data
+
+    def dumps_compact(self, obj):
+        data = self.fast_dumps(obj)
+        if data is None:
+            return super().dumps_compact(obj)
+        return data
+
+    def response(self, *args, **kwargs):
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(*args, **kwargs)
+
+        obj = self._prepare_response_obj(args, kwargs)
+        data = self.fast_dumps(obj)
+        if data is None:
+            return super().response(*args, **kwargs)
+        return self._app.response_class(data + b"\n", mimetype=self.mimetype)
+
@@ -0,0 +1,73 @@
+import base64
+import json
+from datetime import date
+
+from sqlalchemy import and_, or_
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 100
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(sort_value, row_id):
+    """
+    Encodes the sort key of the last row on a page into an opaque cursor.
+    """
+    if isinstance(sort_value, date):
+        sort_value = sort_value.isoformat()
+    raw = json.dumps([sort_value, row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """
+    Decodes a cursor produced by encode_cursor back into (date, id).
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return date.fromisoformat(sort_value), int(row_id)
+    except (ValueError, TypeError):
+        raise InvalidCursor(f"Invalid cursor '{cursor}'")
+
+
+def parse_limit(value):
+    """
+    Clamps a requested page size to 1..MAX_LIMIT.
+    """
+    if value is None:
+        return DEFAULT_LIMIT
+    return max(1, min(value, MAX_LIMIT))
+
+
+def keyset_page(session, stmt, sort_column, id_column, after=None, limit=DEFAULT_LIMIT):
+    """
+    Runs stmt ordered on (sort_column, id_column), starting after the given
+    cursor. Fetches one extra row to know whether a next page exists, so no
+    OFFSET scan or COUNT is needed.
+
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    if after:
+        last_value, last_id = decode_cursor(after)
+        stmt = stmt.where(
+            or_(
+                sort_column > last_value,
+                and_(sort_column == last_value, id_column > last_id),
+            )
+        )
+
+    stmt = stmt.order_by(sort_column, id_column).limit(limit + 1)
+    rows = session.scalars(stmt).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(
+            getattr(last, sort_column.key), getattr(last, id_column.key)
+        )
+    return rows, next_cursor
@@ -0,0 +1,115 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from flask import current_app, has_app_context
+from werkzeug.security import check_password_hash, generate_password_hash
+
+DEFAULT_METHOD = "scrypt:32768:8:1"
+
+# Jobs allowed to wait for a free worker, per worker, before callers block
+QUEUE_DEPTH = 4
+
+_pool = None
+_pool_pid = None
+_pool_slots = None
+_pool_lock = threading.Lock()
+
+
+def hash_password(password):
+    """
+    Hashes password with the configured method.
+    """
+    return run(generate_password_hash, password, hash_method())
+
+
+def verify_password(pwhash, password):
+    """
+    Checks password against a stored hash.
+    """
+    if not pwhash or pwhash.count("$") < 2:
+        return False
+    return run(check_password_hash, pwhash, password)
+
+
+def needs_rehash(pwhash):
+    """
+    True when pwhash was made with other parameters than the configured ones.
+    """
+    return pwhash.split("$", 1)[0] != canonical_method(hash_method())
+
+
+def check_and_rehash(user, password):
+    """
+    Verifies a login and, on success, upgrades a hash made with outdated
+    parameters. The caller commits.
+    """
+    if not verify_password(user.password, password):
+        return False
+    if needs_rehash(user.password):
+        user.password = hash_password(password)
+    return True
+
+
+def hash_method():
+    if has_app_context():
+        return current_app.config.get("PASSWORD_HASH_METHOD", DEFAULT_METHOD)
+    return DEFAULT_METHOD
+
+
+@lru_cache(maxsize=None)
+def canonical_method(method):
+    """
+    Expands a method such as "scrypt" or "pbkdf2:sha256" to the full
+    parameter string werkzeug stores in the hash.
+    """
+    return generate_password_hash("", method=method).split("$", 1)[0]
+
+
+def pool_size():
+    if has_app_context():
+        return current_app.config.get("PASSWORD_HASH_WORKERS", 0)
+    return 0
+
+
+def run(fn, *args):
+    """
+    Runs fn inline, or with PASSWORD_HASH_WORKERS set, in this process's
+    hashing pool, blocking while the pool's queue is full.
+
+    The caller waits for the result either way, so the pool frees no
+    thread: hashlib's scrypt and pbkdf2 release the GIL, and inline hashes
+    already run in parallel with the worker's other threads. The pool is
+    for gevent and eventlet workers, where an inline hash blocks the event
+    loop while waiting on a future yields to other requests.
+    """
+    workers = pool_size()
+    if not workers:
+        return fn(*args)
+
+    pool, slots = get_pool(workers)
+    with slots:
+        return pool.submit(fn, *args).result()
+
+
+def get_pool(workers):
+    """
+    Returns this process's pool, creating it on first use so each forked
+    server worker gets its own.
+    """
+    global _pool, _pool_pid, _pool_slots
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = ProcessPoolExecutor(max_workers=workers)
+            _pool_pid = os.getpid()
+            _pool_slots = threading.BoundedSemaphore(workers * (1 + QUEUE_DEPTH))
+        return _pool, _pool_slots
+
+
+def shutdown_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None and _pool_pid == os.getpid():
+            _pool.shutdown()
+        _pool = None
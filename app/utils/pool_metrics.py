@@ -0,0 +1,162 @@
+import threading
+import time
+from collections import deque
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+# Recent checkout waits kept for percentiles
+WAIT_SAMPLES = 1024
+
+
+class PoolStats:
+    """
+    Counters for one connection pool, fed by its pool events. Wait times
+    come from MeteredQueuePool, which times each checkout.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.waits = deque(maxlen=WAIT_SAMPLES)
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def listen(self, pool):
+        event.listen(pool, "connect", self.on_connect)
+        event.listen(pool, "checkout", self.on_checkout)
+        event.listen(pool, "checkin", self.on_checkin)
+        event.listen(pool, "invalidate", self.on_invalidate)
+
+    def on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.connects += 1
+
+    def on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+
+    def on_checkin(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.checkins += 1
+            self.in_use = max(self.in_use - 1, 0)
+
+    def on_invalidate(self, dbapi_connection, connection_record, exception):
+        with self._lock:
+            self.invalidations += 1
+
+    def record_wait(self, seconds, timed_out=False):
+        with self._lock:
+            self.waits.append(seconds)
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def snapshot(self):
+        with self._lock:
+            waits = sorted(self.waits)
+            stats = {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "in_use": self.in_use,
+                "peak_in_use": self.peak_in_use,
+                "wait_ms": {
+                    "mean": round(self.wait_total / self.checkouts * 1e3, 3)
+                    if self.checkouts
+                    else None,
+                    "p50": percentile_ms(waits, 50),
+                    "p99": percentile_ms(waits, 99),
+                    "max": round(self.wait_max * 1e3, 3),
+                },
+            }
+        return stats
+
+
+def percentile_ms(ordered, pct):
+    if not ordered:
+        return None
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return round(ordered[index] * 1e3, 3)
+
+
+class MeteredQueuePool(QueuePool):
+    """
+    QueuePool that records how long each checkout waited for a connection,
+    including the ones that gave up after pool_timeout.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # A recreated pool copies its predecessor's dispatch, listeners
+        # included; recreate() hands the stats over
+        if "_dispatch" not in kwargs:
+            self.stats = PoolStats()
+            self.stats.listen(self)
+
+    @property
+    def max_overflow(self):
+        return self._max_overflow
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.stats.record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        self.stats.record_wait(time.perf_counter() - started)
+        return connection
+
+    def recreate(self):
+        fresh = super().recreate()
+        fresh.stats = self.stats
+        return fresh
+
+
+class PoolMetrics:
+    """
+    Swaps QueuePool engines for MeteredQueuePool and reports their stats.
+    Must be initialized before db.init_app, since it rewrites
+    SQLALCHEMY_ENGINE_OPTIONS. Engines with another pool (such as SQLite's
+    StaticPool in memory) are left alone and not reported.
+    """
+
+    def init_app(self, app):
+        options = dict(app.config.get("SQLALCHEMY_ENGINE_OPTIONS") or {})
+        if "pool_size" in options or "max_overflow" in options:
+            options.setdefault("poolclass", MeteredQueuePool)
+            app.config["SQLALCHEMY_ENGINE_OPTIONS"] = options
+
+    def snapshot(self, engines):
+        """
+        Returns {bind key: stats} for every metered engine, "default" for
+        the main one.
+        """
+        report = {}
+        for key, engine in engines.items():
+            pool = engine.pool
+            if not isinstance(pool, MeteredQueuePool):
+                continue
+            report[key or "default"] = {
+                "pool": type(pool).__name__,
+                "size": pool.size(),
+                "max_overflow": pool.max_overflow,
+                "timeout": pool.timeout(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+                **pool.stats.snapshot(),
+            }
+        return report
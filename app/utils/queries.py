@@ -0,0 +1,45 @@
+from sqlalchemy import bindparam, select
+
+from app.models import Customer, InventoryAssignment, Mechanic, ServiceAssignment
+
+# Hot lookups, built once with bound parameters. SQLAlchemy memoizes the
+# cache key of a statement object, so executing one of these skips both
+# building the statement and walking it for its key, and goes straight to
+# the cached compiled form. benchmarks/bench_queries.py compares the cost
+# with building the statement per call and with lambda_stmt.
+
+CUSTOMER_BY_EMAIL = select(Customer).where(Customer.email == bindparam("email"))
+
+MECHANIC_BY_EMAIL = select(Mechanic).where(Mechanic.email == bindparam("email"))
+
+INVENTORY_ASSIGNMENT = select(InventoryAssignment).where(
+    InventoryAssignment.service_ticket_id == bindparam("service_ticket_id"),
+    InventoryAssignment.inventory_id == bindparam("inventory_id"),
+)
+
+SERVICE_ASSIGNMENT = select(ServiceAssignment).where(
+    ServiceAssignment.service_ticket_id == bindparam("service_ticket_id"),
+    ServiceAssignment.mechanic_id == bindparam("mechanic_id"),
+)
+
+
+def customer_by_email(session, email):
+    return session.execute(CUSTOMER_BY_EMAIL, {"email": email}).scalar_one_or_none()
+
+
+def mechanic_by_email(session, email):
+    return session.execute(MECHANIC_BY_EMAIL, {"email": email}).scalar_one_or_none()
+
+
+def inventory_assignment(session, service_ticket_id, inventory_id):
+    return session.execute(
+        INVENTORY_ASSIGNMENT,
+        {"service_ticket_id": service_ticket_id, "inventory_id": inventory_id},
+    ).scalar_one_or_none()
+
+
+def service_assignment(session, service_ticket_id, mechanic_id):
+    return session.execute(
+        SERVICE_ASSIGNMENT,
+        {"service_ticket_id": service_ticket_id, "mechanic_id": mechanic_id},
+    ).scalar_one_or_none()
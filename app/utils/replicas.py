@@ -0,0 +1,110 @@
+from flask import current_app, g, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.sql.dml import UpdateBase
+
+from app.utils.util import rate_limit_key
+
+# SQLALCHEMY_BINDS key of the read replica
+REPLICA_BIND = "replica"
+
+# Requests whose reads may be served by the replica
+READ_METHODS = frozenset(("GET", "HEAD", "OPTIONS"))
+
+# Session.info key set when the transaction wrote to the primary
+WROTE_PRIMARY = "wrote_primary"
+
+
+class RoutingSession(Session):
+    """
+    Session that sends reads made while handling a GET, HEAD or OPTIONS
+    request to the replica bind, unless the client wrote recently. Flushes
+    and INSERT/UPDATE/DELETE statements always go to the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        engine = super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+        if bind is not None or engine is not self._db.engines.get(None):
+            return engine
+
+        if self._flushing or isinstance(clause, UpdateBase):
+            self.info[WROTE_PRIMARY] = True
+            return engine
+
+        replica = self._db.engines.get(REPLICA_BIND)
+        if replica is not None and has_request_context():
+            router = current_app.extensions["read_replica"]
+            if router.reads_from_replica():
+                return replica
+        return engine
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def stick_after_write(session):
+    if session.info.pop(WROTE_PRIMARY, False) and has_request_context():
+        router = current_app.extensions.get("read_replica")
+        if router is not None:
+            router.stick_to_primary()
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def discard_write_marker(session):
+    session.info.pop(WROTE_PRIMARY, None)
+
+
+def sticky_key():
+    """
+    Identifies the client whose writes it must be able to read back: the
+    token subject, or the remote address for anonymous requests.
+    """
+    return f"primary:{rate_limit_key()}"
+
+
+class ReadReplica:
+    """
+    Registers REPLICA_DATABASE_URI as the "replica" bind and decides which
+    requests may read from it. A client that committed a write reads from
+    the primary for REPLICA_STICKY_SECONDS afterwards, so it sees its own
+    writes despite replication lag. The marker lives in the shared cache,
+    so it holds across workers.
+
+    Must be initialized before db.init_app, since it adds to
+    SQLALCHEMY_BINDS, and db must use RoutingSession.
+    """
+
+    def __init__(self, db, cache):
+        self.db = db
+        self.cache = cache
+
+    def init_app(self, app):
+        app.extensions["read_replica"] = self
+        # The replica mirrors the default metadata and has none of its own.
+        # db.metadatas is shared by every app, and an empty one left behind
+        # by another app would make create_all() demand a bind this one lacks.
+        self.db.metadatas.pop(REPLICA_BIND, None)
+        uri = app.config.get("REPLICA_DATABASE_URI")
+        if uri:
+            binds = dict(app.config.get("SQLALCHEMY_BINDS") or {})
+            binds.setdefault(REPLICA_BIND, uri)
+            app.config["SQLALCHEMY_BINDS"] = binds
+
+    def reads_from_replica(self):
+        """
+        True when the current request may read from the replica. Decided
+        once per client and request; the token decorators set the subject
+        before the view's first query.
+        """
+        if request.method not in READ_METHODS:
+            return False
+        key = sticky_key()
+        route = g.get("replica_route")
+        if route is None or route[0] != key:
+            route = (key, not self.cache.get(key))
+            g.replica_route = route
+        return route[1]
+
+    def stick_to_primary(self):
+        timeout = current_app.config.get("REPLICA_STICKY_SECONDS", 0)
+        if timeout:
+            self.cache.set(sticky_key(), True, timeout=timeout)
+        g.pop("replica_route", None)
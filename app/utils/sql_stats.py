@@ -0,0 +1,161 @@
+from collections import Counter
+from time import perf_counter
+
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+
+QUERIES_HEADER = "X-DB-Queries"
+TIME_HEADER = "X-DB-Time"
+REPEATED_HEADER = "X-DB-Repeated"
+
+
+class QueryBudgetExceeded(AssertionError):
+    """
+    Raised after a request that ran more statements than its view's
+    query_budget, when SQL_QUERY_BUDGETS is on.
+    """
+
+
+def query_budget(max_queries):
+    """
+    Declares the most SQL statements one request to the view may run.
+    Put it right under the route decorator.
+    """
+
+    def decorator(view):
+        view.query_budget = max_queries
+        return view
+
+    return decorator
+
+
+class RequestSQLStats:
+    """
+    The statements one request ran. Statements are counted by their SQL
+    text, parameters left out, so the same query for different rows shows
+    up as one shape run many times.
+    """
+
+    __slots__ = ("count", "seconds", "shapes")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes = Counter()
+
+    def record(self, statement, seconds):
+        self.count += 1
+        self.seconds += seconds
+        self.shapes[statement] += 1
+
+    def repeated(self, threshold):
+        """
+        Returns (statement, times) for each shape run at least `threshold`
+        times, most repeated first.
+        """
+        return [
+            (statement, times)
+            for statement, times in self.shapes.most_common()
+            if times >= threshold
+        ]
+
+
+def current_stats():
+    return g.get("_sql_stats") if has_request_context() else None
+
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("sql_stats_started", []).append(perf_counter())
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["sql_stats_started"].pop()
+    stats = current_stats()
+    if stats is not None:
+        stats.record(statement, perf_counter() - started)
+
+
+def handle_error(exception_context):
+    # after_cursor_execute doesn't run for a failed statement
+    started = exception_context.connection and exception_context.connection.info.get(
+        "sql_stats_started"
+    )
+    if started:
+        started.pop()
+
+
+class SQLStats:
+    """
+    Counts and times the SQL statements of each request, on every engine
+    of `db`, including the read replica. After the request:
+
+    - SQL_STATS_HEADERS adds X-DB-Queries and X-DB-Time (milliseconds).
+    - Statements run SQL_REPEAT_THRESHOLD or more times in one request,
+      the usual sign of an N+1, are logged as a warning and their count
+      reported in X-DB-Repeated when headers are on. 0 turns this off.
+    - SQL_QUERY_BUDGETS raises QueryBudgetExceeded when a view declared
+      with @query_budget runs more statements than it allows.
+
+    Statements a streamed response runs after its headers are sent are
+    not counted. Must be initialized after db.init_app.
+    """
+
+    def __init__(self, db):
+        self.db = db
+
+    def init_app(self, app):
+        if not (
+            app.config.get("SQL_STATS_HEADERS")
+            or app.config.get("SQL_REPEAT_THRESHOLD")
+            or app.config.get("SQL_QUERY_BUDGETS")
+        ):
+            return
+
+        with app.app_context():
+            for engine in self.db.engines.values():
+                self.instrument(engine)
+        app.before_request(self.before_request)
+        app.after_request(self.after_request)
+
+    def instrument(self, engine):
+        if event.contains(engine, "before_cursor_execute", before_cursor_execute):
+            return
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", after_cursor_execute)
+        event.listen(engine, "handle_error", handle_error)
+
+    def before_request(self):
+        g._sql_stats = RequestSQLStats()
+
+    def after_request(self, response):
+        stats = current_stats()
+        if stats is None:
+            return response
+        config = current_app.config
+
+        if config.get("SQL_STATS_HEADERS"):
+            response.headers[QUERIES_HEADER] = str(stats.count)
+            response.headers[TIME_HEADER] = f"{stats.seconds * 1e3:.2f}"
+
+        threshold = config.get("SQL_REPEAT_THRESHOLD")
+        repeated = stats.repeated(threshold) if threshold else []
+        if repeated:
+            for statement, times in repeated:
+                current_app.logger.warning(
+                    "Possible N+1: %s %s ran this statement %d times: %s",
+                    request.method,
+                    request.path,
+                    times,
+                    statement,
+                )
+            if config.get("SQL_STATS_HEADERS"):
+                response.headers[REPEATED_HEADER] = str(repeated[0][1])
+
+        view = current_app.view_functions.get(request.endpoint)
+        budget = getattr(view, "query_budget", None)
+        if config.get("SQL_QUERY_BUDGETS") and budget is not None and stats.count > budget:
+            raise QueryBudgetExceeded(
+                f"{request.method} {request.path} ran {stats.count} SQL "
+                f"statements, over its budget of {budget}"
+            )
+        return response
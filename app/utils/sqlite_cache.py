@@ -0,0 +1,350 @@
+import hashlib
+import hmac
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+
+from flask_caching.backends.base import BaseCache
+
+from app.utils.util import instance_file
+
+# Writes between two threshold checks
+CULL_INTERVAL = 64
+
+SIGNATURE_SIZE = hashlib.sha256().digest_size
+
+# Seconds between flushes of this process's hit/miss counters
+STATS_FLUSH_INTERVAL = 5
+
+SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS cache_entries (
+        key TEXT PRIMARY KEY,
+        prefix TEXT NOT NULL,
+        value BLOB NOT NULL,
+        expires REAL NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_cache_entries_prefix ON cache_entries (prefix)",
+    """
+    CREATE TABLE IF NOT EXISTS cache_stats (
+        prefix TEXT PRIMARY KEY,
+        hits INTEGER NOT NULL DEFAULT 0,
+        misses INTEGER NOT NULL DEFAULT 0,
+        evictions INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+)
+
+
+def key_prefix(key):
+    """
+    Groups keys for stats: "view:customer.get_customers:..." counts under
+    "view:customer.get_customers", "tag:customer:5" under "tag:customer".
+    """
+    return ":".join(key.split(":", 2)[:2])
+
+
+class SQLiteCache(BaseCache):
+    """
+    Cache kept in one SQLite file, so every worker process on the host shares
+    entries, invalidations and stats without an outside service.
+
+    Entries past `threshold` are evicted oldest-write first. `add` is atomic
+    across processes, so it can serve as a lock. Hit/miss counters are
+    buffered per process and flushed every few seconds.
+
+    Values are pickled and signed with HMAC-SHA256 under `secret_key`. An
+    entry with a bad signature reads as a miss and is never unpickled, so
+    whoever can write the file still can't run code in the app.
+
+    CACHE_TYPE = "app.utils.sqlite_cache.SQLiteCache", with the file at
+    CACHE_SQLITE_PATH, by default cache.sqlite3 in the instance folder
+    (":memory:" keeps it private to the process), signed with SECRET_KEY.
+    """
+
+    def __init__(self, path, secret_key, threshold=10000, default_timeout=300):
+        super().__init__(default_timeout=default_timeout)
+        if not secret_key:
+            raise ValueError("SQLiteCache needs a secret_key to sign its entries")
+        self.path = path
+        self._secret_key = (
+            secret_key.encode() if isinstance(secret_key, str) else secret_key
+        )
+        self.threshold = threshold
+        self._lock = threading.RLock()
+        self._conn = None
+        self._pid = None
+        self._writes = 0
+        self._pending_stats = defaultdict(lambda: [0, 0])
+        self._stats_flushed_at = time.monotonic()
+
+    @classmethod
+    def factory(cls, app, config, args, kwargs):
+        kwargs["threshold"] = config["CACHE_THRESHOLD"]
+        path = config["CACHE_SQLITE_PATH"] or instance_file(app, "cache.sqlite3")
+        return cls(path, app.config["SECRET_KEY"], *args, **kwargs)
+
+    def _connection(self):
+        """
+        Opens the database once per process; a forked worker reconnects.
+        """
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(
+                self.path, timeout=5, isolation_level=None, check_same_thread=False
+            )
+            if self.path != ":memory:":
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+            for statement in SCHEMA:
+                conn.execute(statement)
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def _sign(self, data):
+        return hmac.new(self._secret_key, data, hashlib.sha256).digest()
+
+    def _dumps(self, value):
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        return self._sign(data) + data
+
+    def _loads(self, blob):
+        """
+        Returns the stored value, or None when blob isn't signed with this
+        cache's key.
+        """
+        signature, data = blob[:SIGNATURE_SIZE], blob[SIGNATURE_SIZE:]
+        if not hmac.compare_digest(signature, self._sign(data)):
+            return None
+        return pickle.loads(data)
+
+    def _expires(self, timeout):
+        timeout = self._normalize_timeout(timeout)
+        return time.time() + timeout if timeout > 0 else 0
+
+    def _record(self, key, hit):
+        self._pending_stats[key_prefix(key)][0 if hit else 1] += 1
+        if time.monotonic() - self._stats_flushed_at > STATS_FLUSH_INTERVAL:
+            self._flush_stats()
+
+    def _flush_stats(self, evictions=None):
+        rows = [
+            (prefix, hits, misses, 0)
+            for prefix, (hits, misses) in self._pending_stats.items()
+        ]
+        rows.extend((prefix, 0, 0, count) for prefix, count in (evictions or {}).items())
+        self._pending_stats.clear()
+        self._stats_flushed_at = time.monotonic()
+        if rows:
+            self._connection().executemany(
+                """
+                INSERT INTO cache_stats (prefix, hits, misses, evictions)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (prefix) DO UPDATE SET
+                    hits = hits + excluded.hits,
+                    misses = misses + excluded.misses,
+                    evictions = evictions + excluded.evictions
+                """,
+                rows,
+            )
+
+    def _maybe_cull(self, written=1):
+        self._writes += written
+        if self._writes < CULL_INTERVAL:
+            return
+        self._writes = 0
+        conn = self._connection()
+        conn.execute(
+            "DELETE FROM cache_entries WHERE expires != 0 AND expires <= ?",
+            (time.time(),),
+        )
+        (count,) = conn.execute("SELECT count(*) FROM cache_entries").fetchone()
+        if count <= self.threshold:
+            return
+        evicted = defaultdict(int)
+        for (prefix,) in conn.execute(
+            """
+            DELETE FROM cache_entries WHERE rowid IN (
+                SELECT rowid FROM cache_entries ORDER BY rowid LIMIT ?
+            ) RETURNING prefix
+            """,
+            (count - self.threshold,),
+        ).fetchall():
+            evicted[prefix] += 1
+        self._flush_stats(evicted)
+
+    def get(self, key):
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT value, expires FROM cache_entries WHERE key = ?", (key,)
+            ).fetchone()
+            live = row is not None and (row[1] == 0 or row[1] > time.time())
+            value = self._loads(row[0]) if live else None
+            self._record(key, value is not None)
+        return value
+
+    def get_many(self, *keys):
+        if not keys:
+            return []
+        with self._lock:
+            now = time.time()
+            rows = dict(
+                (key, self._loads(value))
+                for key, value, expires in self._connection().execute(
+                    "SELECT key, value, expires FROM cache_entries WHERE key IN (%s)"
+                    % ",".join("?" * len(keys)),
+                    keys,
+                )
+                if expires == 0 or expires > now
+            )
+            values = [rows.get(key) for key in keys]
+            for key, value in zip(keys, values):
+                self._record(key, value is not None)
+        return values
+
+    def has(self, key):
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT expires FROM cache_entries WHERE key = ?", (key,)
+            ).fetchone()
+        return row is not None and (row[0] == 0 or row[0] > time.time())
+
+    def set(self, key, value, timeout=None):
+        return self.set_many({key: value}, timeout) == [key]
+
+    def set_many(self, mapping, timeout=None):
+        expires = self._expires(timeout)
+        rows = [
+            (key, key_prefix(key), self._dumps(value), expires)
+            for key, value in mapping.items()
+        ]
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN")
+            try:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO cache_entries (key, prefix, value, expires)"
+                    " VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+                conn.execute("COMMIT")
+            except sqlite3.Error:
+                conn.execute("ROLLBACK")
+                raise
+            self._maybe_cull(len(rows))
+        return list(mapping)
+
+    def add(self, key, value, timeout=None):
+        """
+        Stores value only if key is absent or expired, atomically across
+        processes. Returns whether it was stored.
+        """
+        with self._lock:
+            cursor = self._connection().execute(
+                """
+                INSERT INTO cache_entries (key, prefix, value, expires)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (key) DO UPDATE SET
+                    value = excluded.value, expires = excluded.expires
+                WHERE cache_entries.expires != 0 AND cache_entries.expires <= ?
+                """,
+                (
+                    key,
+                    key_prefix(key),
+                    self._dumps(value),
+                    self._expires(timeout),
+                    time.time(),
+                ),
+            )
+            added = cursor.rowcount == 1
+            if added:
+                self._maybe_cull()
+        return added
+
+    def delete(self, key):
+        with self._lock:
+            cursor = self._connection().execute(
+                "DELETE FROM cache_entries WHERE key = ?", (key,)
+            )
+        return cursor.rowcount == 1
+
+    def delete_many(self, *keys):
+        return [key for key in keys if self.delete(key)]
+
+    def inc(self, key, delta=1):
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT value, expires FROM cache_entries WHERE key = ?", (key,)
+                ).fetchone()
+                live = row is not None and (row[1] == 0 or row[1] > time.time())
+                value = ((self._loads(row[0]) if live else None) or 0) + delta
+                conn.execute(
+                    "INSERT OR REPLACE INTO cache_entries (key, prefix, value, expires)"
+                    " VALUES (?, ?, ?, ?)",
+                    (
+                        key,
+                        key_prefix(key),
+                        self._dumps(value),
+                        row[1] if live else self._expires(None),
+                    ),
+                )
+                conn.execute("COMMIT")
+            except sqlite3.Error:
+                conn.execute("ROLLBACK")
+                raise
+        return value
+
+    def dec(self, key, delta=1):
+        return self.inc(key, -delta)
+
+    def clear(self):
+        with self._lock:
+            self._connection().execute("DELETE FROM cache_entries")
+        return True
+
+    def stats(self):
+        """
+        Returns {prefix: {hits, misses, hit_ratio, entries, bytes, evictions}}
+        across every process sharing the file.
+        """
+        with self._lock:
+            self._flush_stats()
+            conn = self._connection()
+            counters = {
+                prefix: (hits, misses, evictions)
+                for prefix, hits, misses, evictions in conn.execute(
+                    "SELECT prefix, hits, misses, evictions FROM cache_stats"
+                )
+            }
+            sizes = {
+                prefix: (entries, size)
+                for prefix, entries, size in conn.execute(
+                    """
+                    SELECT prefix, count(*), sum(length(value)) FROM cache_entries
+                    WHERE expires = 0 OR expires > ?
+                    GROUP BY prefix
+                    """,
+                    (time.time(),),
+                )
+            }
+
+        stats = {}
+        for prefix in sorted(counters.keys() | sizes.keys()):
+            hits, misses, evictions = counters.get(prefix, (0, 0, 0))
+            entries, size = sizes.get(prefix, (0, 0))
+            stats[prefix] = {
+                "hits": hits,
+                "misses": misses,
+                "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else None,
+                "entries": entries,
+                "bytes": size,
+                "evictions": evictions,
+            }
+        return stats
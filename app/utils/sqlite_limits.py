@@ -0,0 +1,185 @@
+import os
+import sqlite3
+import threading
+import time
+
+from limits.storage import MovingWindowSupport, Storage
+
+# Acquisitions between two sweeps of expired counters and window entries
+SWEEP_INTERVAL = 256
+
+SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS limit_counters (
+        key TEXT PRIMARY KEY,
+        count INTEGER NOT NULL,
+        expires REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS limit_entries (
+        key TEXT NOT NULL,
+        acquired REAL NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_limit_entries_key ON limit_entries (key, acquired)",
+)
+
+
+class SQLiteLimitStorage(Storage, MovingWindowSupport):
+    """
+    Rate limit storage kept in one SQLite file, so every worker process on
+    the host counts against the same limits without an outside service.
+    Supports the fixed-window and moving-window strategies.
+
+    RATELIMIT_STORAGE_URI = "sqlite:///path/to/limits.sqlite3";
+    "sqlite://" keeps it in memory, private to the process.
+    """
+
+    STORAGE_SCHEME = ["sqlite"]
+
+    def __init__(self, uri=None, wrap_exceptions=False, **options):
+        self.path = (uri or "sqlite://").split("://", 1)[1] or ":memory:"
+        self._lock = threading.RLock()
+        self._conn = None
+        self._pid = None
+        self._writes = 0
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    def _connection(self):
+        """
+        Opens the database once per process; a forked worker reconnects.
+        """
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(
+                self.path, timeout=5, isolation_level=None, check_same_thread=False
+            )
+            if self.path != ":memory:":
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+            for statement in SCHEMA:
+                conn.execute(statement)
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def _maybe_sweep(self, now):
+        self._writes += 1
+        if self._writes < SWEEP_INTERVAL:
+            return
+        self._writes = 0
+        conn = self._connection()
+        conn.execute("DELETE FROM limit_counters WHERE expires <= ?", (now,))
+        # No limit in use spans more than a day
+        conn.execute("DELETE FROM limit_entries WHERE acquired <= ?", (now - 86400,))
+
+    def incr(self, key, expiry, amount=1):
+        """
+        Adds amount to the counter at key, starting a new window of `expiry`
+        seconds when the previous one has ended. One statement, so it is
+        atomic across processes.
+        """
+        now = time.time()
+        with self._lock:
+            (count,) = self._connection().execute(
+                """
+                INSERT INTO limit_counters (key, count, expires) VALUES (?, ?, ?)
+                ON CONFLICT (key) DO UPDATE SET
+                    count = CASE WHEN expires <= ?
+                        THEN excluded.count ELSE count + excluded.count END,
+                    expires = CASE WHEN expires <= ?
+                        THEN excluded.expires ELSE expires END
+                RETURNING count
+                """,
+                (key, amount, now + expiry, now, now),
+            ).fetchone()
+            self._maybe_sweep(now)
+        return count
+
+    def get(self, key):
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT count FROM limit_counters WHERE key = ? AND expires > ?",
+                (key, time.time()),
+            ).fetchone()
+        return row[0] if row else 0
+
+    def get_expiry(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT expires FROM limit_counters WHERE key = ? AND expires > ?",
+                (key, now),
+            ).fetchone()
+        return row[0] if row else now
+
+    def acquire_entry(self, key, limit, expiry, amount=1):
+        """
+        Records amount entries at key if that keeps the last `expiry` seconds
+        within limit. Runs under a write lock, so it is atomic across
+        processes.
+        """
+        if amount > limit:
+            return False
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                (count,) = conn.execute(
+                    "SELECT count(*) FROM limit_entries WHERE key = ? AND acquired > ?",
+                    (key, now - expiry),
+                ).fetchone()
+                acquired = count + amount <= limit
+                if acquired:
+                    conn.execute(
+                        "DELETE FROM limit_entries WHERE key = ? AND acquired <= ?",
+                        (key, now - expiry),
+                    )
+                    conn.executemany(
+                        "INSERT INTO limit_entries (key, acquired) VALUES (?, ?)",
+                        [(key, now)] * amount,
+                    )
+                conn.execute("COMMIT")
+            except sqlite3.Error:
+                conn.execute("ROLLBACK")
+                raise
+            self._maybe_sweep(now)
+        return acquired
+
+    def get_moving_window(self, key, limit, expiry):
+        """
+        Returns (start of the window, entries in it) for key.
+        """
+        now = time.time()
+        with self._lock:
+            oldest, count = self._connection().execute(
+                """
+                SELECT min(acquired), count(*) FROM limit_entries
+                WHERE key = ? AND acquired > ?
+                """,
+                (key, now - expiry),
+            ).fetchone()
+        return (oldest, count) if count else (now, 0)
+
+    def check(self):
+        with self._lock:
+            self._connection().execute("SELECT 1").fetchone()
+        return True
+
+    def reset(self):
+        with self._lock:
+            conn = self._connection()
+            counters = conn.execute("DELETE FROM limit_counters").rowcount
+            entries = conn.execute("DELETE FROM limit_entries").rowcount
+        return counters + entries
+
+    def clear(self, key):
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM limit_counters WHERE key = ?", (key,))
+            conn.execute("DELETE FROM limit_entries WHERE key = ?", (key,))
@@ -0,0 +1,201 @@
+from itertools import chain
+
+from sqlalchemy import bindparam, event, func, inspect, or_, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.util import identity_key
+
+from app.models import (
+    Inventory,
+    InventoryAssignment,
+    ServiceAssignment,
+    ServiceTicket,
+)
+
+# Session.info key holding the per-ticket deltas to apply once the flush completes
+PENDING_TOTALS = "ticket_totals"
+
+TOTAL_COLUMNS = ("mechanic_count", "parts_count", "parts_total")
+
+TOTAL_TOLERANCE = 1e-6
+
+
+def adjust_ticket_totals(session, deltas):
+    """
+    Applies {ticket_id: (mechanic_count, parts_count, parts_total)} deltas to
+    the denormalized ticket totals, as one executemany UPDATE.
+    """
+    rows = [
+        {"ticket_id": ticket_id, "d_mechanics": m, "d_parts": c, "d_total": t}
+        for ticket_id, (m, c, t) in deltas.items()
+        if m or c or t
+    ]
+    if not rows:
+        return
+    tickets = ServiceTicket.__table__
+    session.connection().execute(
+        update(tickets)
+        .where(tickets.c.id == bindparam("ticket_id"))
+        .values(
+            mechanic_count=tickets.c.mechanic_count + bindparam("d_mechanics"),
+            parts_count=tickets.c.parts_count + bindparam("d_parts"),
+            parts_total=tickets.c.parts_total + bindparam("d_total"),
+        ),
+        rows,
+    )
+    for row in rows:
+        obj = session.identity_map.get(identity_key(ServiceTicket, row["ticket_id"]))
+        if obj is not None:
+            session.expire(obj, TOTAL_COLUMNS)
+
+
+def recompute_ticket_totals(session):
+    """
+    Recomputes every ticket's totals from its assignments in a single
+    aggregate UPDATE, touching only the rows that drifted. Returns how many
+    tickets were repaired.
+    """
+    mechanic_count = (
+        select(func.count())
+        .where(ServiceAssignment.service_ticket_id == ServiceTicket.id)
+        .scalar_subquery()
+    )
+    parts_count = (
+        select(func.coalesce(func.sum(InventoryAssignment.quantity), 0))
+        .where(InventoryAssignment.service_ticket_id == ServiceTicket.id)
+        .scalar_subquery()
+    )
+    parts_total = (
+        select(
+            func.coalesce(
+                func.sum(InventoryAssignment.quantity * Inventory.price), 0.0
+            )
+        )
+        .join(Inventory, Inventory.id == InventoryAssignment.inventory_id)
+        .where(InventoryAssignment.service_ticket_id == ServiceTicket.id)
+        .scalar_subquery()
+    )
+    result = session.execute(
+        update(ServiceTicket)
+        .where(
+            or_(
+                ServiceTicket.mechanic_count != mechanic_count,
+                ServiceTicket.parts_count != parts_count,
+                # Tolerate the float noise incremental sums accumulate
+                func.abs(ServiceTicket.parts_total - parts_total) > TOTAL_TOLERANCE,
+            )
+        )
+        .values(
+            mechanic_count=mechanic_count,
+            parts_count=parts_count,
+            parts_total=parts_total,
+            version_id=ServiceTicket.version_id + 1,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+def column_values(obj, key):
+    """
+    Returns an attribute's (pre-flush, post-flush) values on a flushed object.
+    """
+    history = inspect(obj).attrs[key].history
+    current = history.added[0] if history.added else getattr(obj, key)
+    previous = history.deleted[0] if history.deleted else current
+    return previous, current
+
+
+def prices_before_flush(session, inventory_ids):
+    """
+    Returns each part's price as it was before the current flush.
+    """
+    prices = {}
+    for obj in chain(session.dirty, session.deleted):
+        if isinstance(obj, Inventory) and obj.id in inventory_ids:
+            prices[obj.id] = column_values(obj, "price")[0]
+    missing = set(inventory_ids) - prices.keys()
+    if missing:
+        prices.update(
+            session.connection().execute(
+                select(Inventory.id, Inventory.price).where(Inventory.id.in_(missing))
+            ).all()
+        )
+    return prices
+
+
+@event.listens_for(Session, "after_flush")
+def collect_ticket_totals(session, flush_context):
+    """
+    Turns every flushed assignment, and every part whose price changed, into
+    deltas on the totals of the tickets they belong to.
+    """
+    links = []
+    mechanic_links = []
+    repriced = {}
+
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, ServiceAssignment):
+            mechanic_links.append(obj)
+        elif isinstance(obj, InventoryAssignment):
+            links.append(obj)
+        elif isinstance(obj, Inventory) and obj in session.dirty:
+            old_price, new_price = column_values(obj, "price")
+            if old_price != new_price:
+                repriced[obj.id] = new_price - old_price
+
+    if not (links or mechanic_links or repriced):
+        return
+
+    deltas = session.info.setdefault(PENDING_TOTALS, {})
+
+    def add(ticket_id, mechanics=0, parts=0, total=0.0):
+        m, c, t = deltas.get(ticket_id, (0, 0, 0.0))
+        deltas[ticket_id] = (m + mechanics, c + parts, t + total)
+
+    for obj in mechanic_links:
+        old_ticket, new_ticket = column_values(obj, "service_ticket_id")
+        if obj not in session.new:
+            add(old_ticket, mechanics=-1)
+        if obj not in session.deleted:
+            add(new_ticket, mechanics=1)
+
+    # Assignment deltas use pre-flush prices; the repricing below then moves
+    # every post-flush quantity from the old price to the new one
+    rows = []
+    for obj in links:
+        ticket_ids = column_values(obj, "service_ticket_id")
+        inventory_ids = column_values(obj, "inventory_id")
+        quantities = column_values(obj, "quantity")
+        if obj not in session.new:
+            rows.append((ticket_ids[0], inventory_ids[0], -quantities[0]))
+        if obj not in session.deleted:
+            rows.append((ticket_ids[1], inventory_ids[1], quantities[1]))
+
+    prices = prices_before_flush(session, {inventory_id for _, inventory_id, _ in rows})
+    for ticket_id, inventory_id, quantity in rows:
+        add(ticket_id, parts=quantity, total=quantity * prices.get(inventory_id, 0.0))
+
+    if repriced:
+        quantities = session.connection().execute(
+            select(
+                InventoryAssignment.service_ticket_id,
+                InventoryAssignment.inventory_id,
+                func.sum(InventoryAssignment.quantity),
+            )
+            .where(InventoryAssignment.inventory_id.in_(repriced))
+            .group_by(InventoryAssignment.service_ticket_id, InventoryAssignment.inventory_id)
+        )
+        for ticket_id, inventory_id, quantity in quantities:
+            add(ticket_id, total=quantity * repriced[inventory_id])
+
+
+@event.listens_for(Session, "after_flush_postexec")
+def apply_ticket_totals(session, flush_context):
+    deltas = session.info.pop(PENDING_TOTALS, None)
+    if deltas:
+        adjust_ticket_totals(session, deltas)
+
+
+@event.listens_for(Session, "after_rollback")
+def discard_ticket_totals(session):
+    session.info.pop(PENDING_TOTALS, None)
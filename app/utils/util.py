@@ -1,12 +1,102 @@
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 from jose import jwt
 from functools import wraps
-from flask import request, jsonify
+from flask import g, request, jsonify
+import hashlib
 import jose
 import os
+import threading
+import time
 
 SECRET_KEY = os.getenv("SECRET_KEY", "your_default_secret_key")
 
+TOKEN_CACHE_SIZE = 4096
+
+
+def instance_file(app, name):
+    """
+    Returns the path of `name` in the app's instance folder, creating the
+    folder readable by this user only. Files other processes of the app
+    share live there rather than in the world-writable temp directory.
+    """
+    os.makedirs(app.instance_path, mode=0o700, exist_ok=True)
+    os.chmod(app.instance_path, 0o700)
+    return os.path.join(app.instance_path, name)
+
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU of JWT payloads whose signature has already been verified,
+    keyed by the token's SHA-256 digest. Each entry expires at the token's
+    `exp`, after which the token goes through jwt.decode again (and fails).
+    """
+
+    def __init__(self, maxsize=TOKEN_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(token):
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token):
+        key = self.key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, token, payload):
+        expires_at = payload.get("exp")
+        if not isinstance(expires_at, (int, float)):
+            return
+        key = self.key(token)
+        with self._lock:
+            self._entries[key] = (payload, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
+
+
+verified_tokens = VerifiedTokenCache()
+
+
+def decode_token(token):
+    """
+    Returns the token's payload, verifying its signature only the first time
+    it is seen. Raises the same jose errors as jwt.decode.
+    """
+    payload = verified_tokens.get(token)
+    if payload is None:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
+        verified_tokens.put(token, payload)
+    return payload
+
 
 def encode_token(
     user_id,
@@ -47,8 +137,10 @@ def token_required(f):
             return jsonify({"message": "Token is missing!"}), 401
 
         try:
-            data = jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
+            data = decode_token(token)
             user_id = data["sub"]  
+            g.token_subject = user_id
+            g.token_role = data.get("role", "customer")
         except jose.exceptions.ExpiredSignatureError:
             return jsonify({"message": "Token has expired!"}), 401
         except jose.exceptions.JWTError:
@@ -73,15 +165,29 @@ def mechanic_token_required(f):
             return jsonify({"message": "Token is missing!"}), 401
 
         try:
-            payload = jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
+            payload = decode_token(token)
             if payload.get("role") != "mechanic":
                 return jsonify({"message": "Unauthorized: Not a mechanic token"}), 403
             mechanic_id = payload["sub"]
-        except jwt.ExpiredSignatureError:
+            g.token_subject = mechanic_id
+            g.token_role = "mechanic"
+        except jose.exceptions.ExpiredSignatureError:
             return jsonify({"message": "Token expired!"}), 401
-        except jwt.InvalidTokenError:
+        except jose.exceptions.JWTError:
             return jsonify({"message": "Invalid token!"}), 401
 
         return f(mechanic_id, *args, **kwargs)
 
     return decorated
+
+
+def rate_limit_key():
+    """
+    Keys rate limits on the JWT subject when a token decorator above the
+    limit has authenticated the request, so users behind one address don't
+    share a budget; otherwise on the client address.
+    """
+    subject = g.get("token_subject")
+    if subject is not None:
+        return f"{g.get('token_role')}:{subject}"
+    return request.remote_addr or "127.0.0.1"
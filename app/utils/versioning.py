@@ -0,0 +1,205 @@
+from functools import wraps
+from itertools import chain
+
+from flask import Response, make_response, request
+from sqlalchemy import event, inspect, or_, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.util import identity_key
+
+from app.extensions import db
+from app.utils.compression import representation_etag, supported_encodings
+from app.models import (
+    Customer,
+    Inventory,
+    InventoryAssignment,
+    Mechanic,
+    ServiceAssignment,
+    ServiceTicket,
+)
+
+# Session.info key holding the rows to bump once the current flush completes
+TOUCHED_ROWS = "touched_rows"
+
+
+def conditional_get(model, id_arg):
+    """
+    Adds a strong ETag, derived from model.version_id, to a GET view.
+
+    A request whose If-None-Match matches gets a 304 straight from a primary
+    key lookup of the version column, without running the view. Must sit
+    below the token decorators so unauthenticated callers can't probe.
+    Compressed bodies get the coding appended to the ETag.
+    """
+
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            row_id = kwargs[id_arg]
+            version = db.session.scalar(
+                select(model.version_id).where(model.id == row_id)
+            )
+            if version is None:
+                return f(*args, **kwargs)
+
+            etag = f"{model.__tablename__}-{row_id}-{version}"
+            for coding in (None, *supported_encodings()):
+                if request.if_none_match.contains(representation_etag(etag, coding)):
+                    response = Response(status=304)
+                    response.set_etag(representation_etag(etag, coding))
+                    return response
+
+            response = make_response(f(*args, **kwargs))
+            if response.status_code == 200:
+                coding = response.headers.get("Content-Encoding")
+                response.set_etag(representation_etag(etag, coding))
+            return response
+
+        return decorated
+
+    return decorator
+
+
+def touch(
+    session,
+    ticket_ids=(),
+    customer_ids=(),
+    inventory_ids=(),
+    changed_ticket_ids=(),
+    changed_customer_ids=(),
+    changed_inventory_ids=(),
+    mechanic_ids=(),
+):
+    """
+    Bumps the version of every versioned row whose serialized form embeds
+    something that changed, so its ETag changes too.
+
+    ticket_ids, customer_ids and inventory_ids are bumped directly (a ticket
+    also bumps its customer). The changed_* ids are rows whose own columns
+    changed, which also bumps the rows embedding them. mechanic_ids are
+    mechanics whose fields or ticket list changed; every ticket they work on
+    embeds them.
+    """
+    conn = session.connection()
+    ticket_ids = set(ticket_ids) | set(changed_ticket_ids)
+    customer_ids = set(customer_ids) | set(changed_customer_ids)
+    inventory_ids = set(inventory_ids) | set(changed_inventory_ids)
+    mechanic_ids = set(mechanic_ids)
+
+    if changed_ticket_ids:
+        inventory_ids.update(
+            conn.scalars(
+                select(InventoryAssignment.inventory_id).where(
+                    InventoryAssignment.service_ticket_id.in_(changed_ticket_ids)
+                )
+            )
+        )
+        mechanic_ids.update(
+            conn.scalars(
+                select(ServiceAssignment.mechanic_id).where(
+                    ServiceAssignment.service_ticket_id.in_(changed_ticket_ids)
+                )
+            )
+        )
+
+    conditions = []
+    if ticket_ids:
+        conditions.append(ServiceTicket.id.in_(ticket_ids))
+    if changed_customer_ids:
+        conditions.append(ServiceTicket.customer_id.in_(changed_customer_ids))
+    if mechanic_ids:
+        conditions.append(
+            ServiceTicket.id.in_(
+                select(ServiceAssignment.service_ticket_id).where(
+                    ServiceAssignment.mechanic_id.in_(mechanic_ids)
+                )
+            )
+        )
+    if changed_inventory_ids:
+        conditions.append(
+            ServiceTicket.id.in_(
+                select(InventoryAssignment.service_ticket_id).where(
+                    InventoryAssignment.inventory_id.in_(changed_inventory_ids)
+                )
+            )
+        )
+
+    if conditions:
+        rows = conn.execute(
+            select(ServiceTicket.id, ServiceTicket.customer_id).where(or_(*conditions))
+        ).all()
+        ticket_ids = {ticket_id for ticket_id, _ in rows}
+        customer_ids.update(customer_id for _, customer_id in rows)
+
+    bump_versions(session, ServiceTicket, ticket_ids)
+    bump_versions(session, Customer, customer_ids)
+    bump_versions(session, Inventory, inventory_ids)
+
+
+def bump_versions(session, model, ids):
+    """
+    Increments version_id for the given rows and expires the stale value on
+    any instance already loaded in the session.
+    """
+    if not ids:
+        return
+    session.connection().execute(
+        update(model)
+        .where(model.id.in_(ids))
+        .values(version_id=model.version_id + 1)
+        .execution_options(synchronize_session=False)
+    )
+    for row_id in ids:
+        obj = session.identity_map.get(identity_key(model, row_id))
+        if obj is not None:
+            session.expire(obj, ["version_id"])
+
+
+def has_visible_changes(obj):
+    """
+    True when a column that appears in a serialized form changed.
+    """
+    return any(
+        attr.history.has_changes()
+        for attr in inspect(obj).attrs
+        if attr.key not in ("password", "version_id")
+    )
+
+
+@event.listens_for(Session, "after_flush")
+def collect_touched_rows(session, flush_context):
+    """
+    Records which versioned rows a flush made stale. The rows themselves are
+    bumped in after_flush_postexec, once the ORM has finished its own writes.
+    """
+    touched = session.info.setdefault(TOUCHED_ROWS, {})
+
+    def add(kind, *ids):
+        touched.setdefault(kind, set()).update(ids)
+
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, ServiceAssignment):
+            add("ticket_ids", obj.service_ticket_id)
+            add("mechanic_ids", obj.mechanic_id)
+        elif isinstance(obj, InventoryAssignment):
+            add("ticket_ids", obj.service_ticket_id)
+            add("inventory_ids", obj.inventory_id)
+        elif isinstance(obj, ServiceTicket):
+            customer_ids = inspect(obj).attrs.customer_id.history
+            add("customer_ids", obj.customer_id, *customer_ids.deleted)
+            if obj in session.dirty and has_visible_changes(obj):
+                add("changed_ticket_ids", obj.id)
+        elif obj not in session.dirty or not has_visible_changes(obj):
+            continue
+        elif isinstance(obj, Customer):
+            add("changed_customer_ids", obj.id)
+        elif isinstance(obj, Mechanic):
+            add("mechanic_ids", obj.id)
+        elif isinstance(obj, Inventory):
+            add("changed_inventory_ids", obj.id)
+
+
+@event.listens_for(Session, "after_flush_postexec")
+def touch_collected_rows(session, flush_context):
+    touched = session.info.pop(TOUCHED_ROWS, None)
+    if touched:
+        touch(session, **touched)
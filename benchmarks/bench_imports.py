@@ -0,0 +1,81 @@
+"""
+Profiles the import of the app package with `python -X importtime`: the
+app's own modules as a tree with their cumulative time, then the modules
+with the most self time anywhere in the import. Each figure is the minimum
+over several fresh interpreters.
+
+    python -m benchmarks.bench_imports [--runs 5] [--top 15] [--module app]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def importtime(module, *flags):
+    """
+    Imports `module` in a fresh interpreter and returns one
+    (self seconds, cumulative seconds, depth, name) per imported module,
+    in the order importtime reports them.
+    """
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", *flags, "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append(
+            (int(self_us) / 1e6, int(cumulative_us) / 1e6, depth, name.strip())
+        )
+    return entries
+
+
+def profile(module, runs):
+    """
+    Returns the entries of the last run, with each module's times replaced
+    by its minimum across `runs` runs.
+    """
+    best = {}
+    entries = []
+    for _ in range(runs):
+        entries = importtime(module)
+        for self_time, cumulative, _, name in entries:
+            previous = best.get(name, (self_time, cumulative))
+            best[name] = (min(previous[0], self_time), min(previous[1], cumulative))
+    return [(*best[name], depth, name) for _, _, depth, name in entries]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--module", default="app")
+    args = parser.parse_args()
+
+    entries = profile(args.module, args.runs)
+    total = next(cumulative for _, cumulative, _, name in entries if name == args.module)
+    print(f"import {args.module}: {total * 1e3:.1f} ms, {len(entries)} modules")
+
+    print(f"\n{args.module} modules (cumulative ms, includes what they import first):")
+    for _, cumulative, depth, name in entries:
+        if name == args.module or name.startswith(args.module + "."):
+            print(f"  {cumulative * 1e3:8.1f}  {'  ' * depth}{name}")
+
+    print("\nmost self time (ms):")
+    for self_time, _, _, name in sorted(entries, reverse=True)[: args.top]:
+        print(f"  {self_time * 1e3:8.1f}  {name}")
+
+
+if __name__ == "__main__":
+    main()
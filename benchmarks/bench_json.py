@@ -0,0 +1,109 @@
+"""
+Compares JSON response encoding throughput of the stdlib provider and the
+orjson-backed FastJSONProvider on service ticket list payloads, as dumped
+by ServiceTicketSchema.
+
+    python -m benchmarks.bench_json [--tickets 100] [--iterations 200]
+"""
+import argparse
+import timeit
+from datetime import date, timedelta
+
+from config import TestingConfig
+
+
+def ticket_payload(tickets):
+    """
+    Dumps `tickets` unsaved tickets, each with three mechanics and four
+    parts, the way GET /service_ticket/ does.
+    """
+    from app.blueprints.serviceticket.routes import service_tickets_schema
+    from app.models import (
+        Customer,
+        Inventory,
+        InventoryAssignment,
+        Mechanic,
+        ServiceAssignment,
+        ServiceStatus,
+        ServiceTicket,
+    )
+
+    customer = Customer(id=1, name="Jane Customer")
+    mechanics = [Mechanic(id=n, name=f"Mechanic {n}") for n in range(1, 4)]
+    parts = [
+        Inventory(id=n, part_name=f"Part {n}", price=4.99 * n, quantity=50)
+        for n in range(1, 5)
+    ]
+    statuses = list(ServiceStatus)
+    rows = []
+    for n in range(1, tickets + 1):
+        ticket = ServiceTicket(
+            id=n,
+            title=f"Brake job #{n}",
+            service_date=date(2024, 1, 1) + timedelta(days=n % 365),
+            vin="1HGCM82633A004352",
+            description="Front brakes squeal under light braking",
+            status=statuses[n % len(statuses)],
+            cost=129.99 + n,
+            date_created=date(2024, 1, 1),
+            customer_id=customer.id,
+            customer=customer,
+            parts_total=sum(p.price for p in parts),
+            parts_count=len(parts),
+            mechanic_count=len(mechanics),
+            mechanics=mechanics,
+        )
+        ticket.service_assignments = [
+            ServiceAssignment(service_ticket_id=n, mechanic_id=m.id, mechanic=m)
+            for m in mechanics
+        ]
+        ticket.inventory_assignments = [
+            InventoryAssignment(
+                service_ticket_id=n, inventory_id=p.id, quantity=1, inventory=p
+            )
+            for p in parts
+        ]
+        rows.append(ticket)
+    return service_tickets_schema.dump(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tickets", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    from app import create_app
+    from app.utils import json_provider
+    from app.utils.json_provider import FastJSONProvider, JSONProvider
+
+    app = create_app(TestingConfig)
+    with app.app_context():
+        payload = ticket_payload(args.tickets)
+        size = len(JSONProvider(app).response(payload).get_data())
+        print(f"payload:      {args.tickets} tickets, {size / 1024:.1f} KiB")
+        print(f"orjson:       {'installed' if json_provider.orjson else 'missing'}")
+
+        results = {}
+        for name, provider in (
+            ("stdlib", JSONProvider(app)),
+            ("fast", FastJSONProvider(app)),
+        ):
+            elapsed = min(
+                timeit.repeat(
+                    lambda: provider.response(payload),
+                    number=args.iterations,
+                    repeat=3,
+                )
+            )
+            results[name] = elapsed
+            per_call = elapsed / args.iterations
+            print(
+                f"{name + ':':<13} {per_call * 1e3:8.3f} ms/response"
+                f"  {size / per_call / 2**20:8.1f} MiB/s"
+            )
+        print(f"speedup:      {results['stdlib'] / results['fast']:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
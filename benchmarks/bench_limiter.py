@@ -0,0 +1,58 @@
+"""
+Measures the rate limiter's per-request cost for each storage backend and
+strategy: one hit against a route limit, cycling over many client keys.
+
+    python -m benchmarks.bench_limiter [--requests N] [--storage URI ...]
+
+The default storages are memory:// (per process) and sqlite:// (shared by
+every worker on the host). Pass e.g. --storage redis://localhost:6379 to
+compare a server-backed one.
+"""
+import argparse
+import os
+import tempfile
+import timeit
+from itertools import cycle
+
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import STRATEGIES
+
+from app.utils import sqlite_limits  # noqa: F401 - registers the sqlite:// limits storage
+
+CLIENTS = 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--storage", action="append", dest="storages")
+    args = parser.parse_args()
+
+    # Generous enough that no client is refused mid-run
+    limit = parse(f"{args.requests} per hour")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        storages = args.storages or [
+            "memory://",
+            "sqlite://" + os.path.join(tmpdir, "limits.sqlite3"),
+        ]
+        print(f"requests per case: {args.requests}, clients: {CLIENTS}")
+        print(f"{'storage':<10} {'strategy':<16} {'us/request':>10}")
+        for storage_uri in storages:
+            storage = storage_from_string(storage_uri)
+            for strategy in ("fixed-window", "moving-window"):
+                storage.reset()
+                limiter = STRATEGIES[strategy](storage)
+                keys = cycle(
+                    f"LIMITER/customer:{n}/update_customer" for n in range(CLIENTS)
+                )
+                elapsed = timeit.timeit(
+                    lambda: limiter.hit(limit, next(keys)), number=args.requests
+                )
+                scheme = storage_uri.split("://", 1)[0]
+                print(f"{scheme:<10} {strategy:<16} {elapsed / args.requests * 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
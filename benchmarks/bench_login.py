@@ -0,0 +1,83 @@
+"""
+Measures login throughput and latency percentiles for a password hash cost
+and hashing pool size, with concurrent clients hitting /customer/login.
+--workers 0 hashes inline, the default; compare it with a pool to see that
+the blocking handoff buys nothing on threaded workers.
+
+    python -m benchmarks.bench_login [--method scrypt:32768:8:1] [--workers 0]
+                                     [--clients 8] [--requests 200]
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config import TestingConfig
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--method", default="scrypt:32768:8:1")
+    parser.add_argument("--workers", type=int, default=0)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(), "bench_login.db")
+
+    class BenchConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{db_path}"
+        RATELIMIT_ENABLED = False
+        PASSWORD_HASH_METHOD = args.method
+        PASSWORD_HASH_WORKERS = args.workers
+
+    from app import create_app, db
+    from app.models import Customer
+    from app.utils.passwords import shutdown_pool
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.create_all()
+        customer = Customer(
+            name="Bench",
+            email="bench@example.com",
+            phone="555-0000",
+            address="1 Bench St",
+        )
+        customer.set_password("benchpass")
+        db.session.add(customer)
+        db.session.commit()
+
+    def login(_):
+        client = app.test_client()
+        started = time.perf_counter()
+        response = client.post(
+            "/customer/login",
+            json={"email": "bench@example.com", "password": "benchpass"},
+        )
+        assert response.status_code == 200, response.get_data(as_text=True)
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.clients) as clients:
+        latencies = list(clients.map(login, range(args.requests)))
+    elapsed = time.perf_counter() - started
+    shutdown_pool()
+
+    print(f"method:     {args.method}")
+    print(f"workers:    {args.workers}  clients: {args.clients}")
+    print(f"throughput: {args.requests / elapsed:8.1f} logins/s")
+    print(f"p50:        {statistics.median(latencies) * 1e3:8.1f} ms")
+    print(f"p99:        {percentile(latencies, 99) * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Measures the per-call cost of the hot lookup queries on SQLite three ways:
+building the statement on every call, as the routes used to; wrapping it
+in lambda_stmt; and executing the pre-built statements in
+app/utils/queries.py. Building alone is reported too, as the part of the
+first figure the other two avoid.
+
+    python -m benchmarks.bench_queries [--calls 5000] [--repeat 5]
+"""
+import argparse
+import timeit
+
+from sqlalchemy import lambda_stmt, select
+
+from config import TestingConfig
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    from app import create_app, db
+    from app.models import Customer, InventoryAssignment
+    from app.utils import queries
+
+    app = create_app(TestingConfig)
+    with app.app_context():
+        db.create_all()
+        session = db.session
+        email, ticket_id, inventory_id = "bench@example.com", 1, 2
+
+        cases = {
+            "customer by email": {
+                "build only": lambda: select(Customer).filter_by(email=email),
+                "built per call": lambda: session.execute(
+                    select(Customer).filter_by(email=email)
+                ).scalar_one_or_none(),
+                "lambda_stmt": lambda: session.execute(
+                    lambda_stmt(lambda: select(Customer).where(Customer.email == email))
+                ).scalar_one_or_none(),
+                "pre-built": lambda: queries.customer_by_email(session, email),
+            },
+            "inventory assignment": {
+                "build only": lambda: select(InventoryAssignment).filter_by(
+                    service_ticket_id=ticket_id, inventory_id=inventory_id
+                ),
+                "built per call": lambda: session.execute(
+                    select(InventoryAssignment).filter_by(
+                        service_ticket_id=ticket_id, inventory_id=inventory_id
+                    )
+                ).scalar_one_or_none(),
+                "lambda_stmt": lambda: session.execute(
+                    lambda_stmt(
+                        lambda: select(InventoryAssignment).where(
+                            InventoryAssignment.service_ticket_id == ticket_id,
+                            InventoryAssignment.inventory_id == inventory_id,
+                        )
+                    )
+                ).scalar_one_or_none(),
+                "pre-built": lambda: queries.inventory_assignment(
+                    session, ticket_id, inventory_id
+                ),
+            },
+        }
+
+        for query, variants in cases.items():
+            print(f"{query}:")
+            for name, call in variants.items():
+                # Warm the compiled cache so only steady-state calls count
+                call()
+                best = min(timeit.repeat(call, number=args.calls, repeat=args.repeat))
+                print(f"  {name:<15} {best / args.calls * 1e6:8.1f} us/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Measures cold start: the time to import the app package and the time of the
+first create_app() call, each in a fresh interpreter, with and without
+db.create_all() against a migrated SQLite file. Also lists the slowest
+imports reported by `python -X importtime`; see bench_imports for the
+full profile.
+
+    python -m benchmarks.bench_startup [--runs 5] [--top 10]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_imports import importtime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def child(mode, db_uri):
+    """
+    Runs inside the fresh interpreter and prints its timings as JSON.
+    """
+    started = time.perf_counter()
+    import app
+    from config import TestingConfig
+
+    imported = time.perf_counter()
+    timings = {"import": imported - started}
+    if mode != "import":
+
+        class StartupConfig(TestingConfig):
+            SQLALCHEMY_DATABASE_URI = db_uri
+            DB_CREATE_ALL = mode == "create_all"
+
+        app.create_app(StartupConfig)
+        timings["create_app"] = time.perf_counter() - imported
+    print(json.dumps(timings))
+
+
+def run_child(mode, db_uri):
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.bench_startup",
+            "--child",
+            mode,
+            "--db",
+            db_uri,
+        ],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return output
+
+
+def slowest_imports(top):
+    """
+    Returns (cumulative seconds, package) for the slowest imports, counting
+    only top-level packages so nested modules aren't double counted.
+    """
+    totals = [
+        (cumulative, name)
+        for _, cumulative, _, name in importtime("app")
+        if "." not in name
+    ]
+    return sorted(totals, reverse=True)[:top]
+
+
+def migrated_database(path):
+    """
+    Creates the schema the way production does, so create_all() has only
+    to check that every table exists.
+    """
+    uri = f"sqlite:///{path}"
+    subprocess.run(
+        [sys.executable, "-m", "flask", "--app", "flask_app", "db", "upgrade"],
+        cwd=ROOT,
+        env={**os.environ, "SQLALCHEMY_DATABASE_URI": uri, "FLASK_ENV": "production"},
+        capture_output=True,
+        check=True,
+    )
+    return uri
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--child", choices=("import", "create_all", "migrations"))
+    parser.add_argument("--db")
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.db)
+        return
+
+    db_uri = migrated_database(os.path.join(tempfile.mkdtemp(), "bench_startup.db"))
+    results = {}
+    for mode in ("create_all", "migrations"):
+        runs = [json.loads(run_child(mode, db_uri).stdout) for _ in range(args.runs)]
+        results[mode] = runs
+
+    imports = [run["import"] for runs in results.values() for run in runs]
+    print(f"{'runs:':<25}{args.runs} per mode, fresh interpreter each")
+    print(
+        f"{'import app:':<24}{statistics.median(imports) * 1e3:8.1f} ms median"
+        f"  {min(imports) * 1e3:8.1f} ms min"
+    )
+    for mode, runs in results.items():
+        samples = [run["create_app"] for run in runs]
+        print(
+            f"{'create_app(' + mode + '):':<24}{statistics.median(samples) * 1e3:8.1f} ms median"
+            f"  {min(samples) * 1e3:8.1f} ms min"
+        )
+
+    print("\nslowest top-level imports (cumulative):")
+    for seconds, name in slowest_imports(args.top):
+        print(f"  {seconds * 1e3:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
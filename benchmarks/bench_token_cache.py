@@ -0,0 +1,46 @@
+"""
+Compares the cost of authenticating a request's JWT with and without the
+verified-token cache.
+
+    python -m benchmarks.bench_token_cache [iterations]
+"""
+import sys
+import timeit
+
+from jose import jwt
+
+from app.utils.util import (
+    SECRET_KEY,
+    decode_token,
+    encode_mechanic_token,
+    verified_tokens,
+)
+
+
+def main(iterations=20000):
+    token = encode_mechanic_token(1)
+
+    uncached = timeit.timeit(
+        lambda: jwt.decode(token, SECRET_KEY, algorithms=["HS256"]), number=iterations
+    )
+
+    verified_tokens.clear()
+    cached = timeit.timeit(lambda: decode_token(token), number=iterations)
+    warm_stats = verified_tokens.stats()
+
+    # Worst case: every request presents a token the cache has never seen
+    tokens = [encode_mechanic_token(n) for n in range(iterations)]
+    verified_tokens.clear()
+    cold_cached = timeit.timeit(lambda: decode_token(tokens.pop()), number=iterations)
+
+    print(f"iterations:            {iterations}")
+    print(f"jwt.decode:            {uncached / iterations * 1e6:8.2f} us/token")
+    print(f"decode_token (warm):   {cached / iterations * 1e6:8.2f} us/token")
+    print(f"decode_token (cold):   {cold_cached / iterations * 1e6:8.2f} us/token")
+    print(f"speedup (warm):        {uncached / cached:8.1f}x")
+    print(f"cache stats (warm):    {warm_stats}")
+    print(f"cache stats (cold):    {verified_tokens.stats()}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,51 @@
+"""ticket totals
+
+Revision ID: 4b1cc3af8e1f
+Revises: a80a22bb83d0
+Create Date: 2026-10-17 23:40:12.418305
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4b1cc3af8e1f'
+down_revision = 'a80a22bb83d0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('service_tickets', sa.Column('parts_total', sa.Float(), server_default='0', nullable=False))
+    op.add_column('service_tickets', sa.Column('parts_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('service_tickets', sa.Column('mechanic_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill from the existing assignments
+    op.execute(
+        """
+        UPDATE service_tickets SET
+            mechanic_count = (
+                SELECT count(*) FROM service_assignment
+                WHERE service_assignment.service_ticket_id = service_tickets.id
+            ),
+            parts_count = (
+                SELECT coalesce(sum(inventory_assignment.quantity), 0)
+                FROM inventory_assignment
+                WHERE inventory_assignment.service_ticket_id = service_tickets.id
+            ),
+            parts_total = (
+                SELECT coalesce(sum(inventory_assignment.quantity * inventory.price), 0)
+                FROM inventory_assignment
+                JOIN inventory ON inventory.id = inventory_assignment.inventory_id
+                WHERE inventory_assignment.service_ticket_id = service_tickets.id
+            )
+        """
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('service_tickets') as batch_op:
+        batch_op.drop_column('mechanic_count')
+        batch_op.drop_column('parts_count')
+        batch_op.drop_column('parts_total')
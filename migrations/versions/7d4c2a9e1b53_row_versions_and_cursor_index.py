@@ -0,0 +1,36 @@
+"""row versions and ticket cursor index
+
+Revision ID: 7d4c2a9e1b53
+Revises: 42462a515098
+Create Date: 2026-10-18 16:05:12.418730
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7d4c2a9e1b53'
+down_revision = '42462a515098'
+branch_labels = None
+depends_on = None
+
+VERSIONED_TABLES = ('customers', 'inventory', 'service_tickets')
+
+
+def upgrade():
+    for table in VERSIONED_TABLES:
+        # Added nullable and backfilled, so existing rows start at version 1
+        # on every backend before the column becomes NOT NULL
+        op.add_column(table, sa.Column('version_id', sa.Integer(), server_default='1', nullable=True))
+        op.execute(sa.text(f'UPDATE {table} SET version_id = 1 WHERE version_id IS NULL'))
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column('version_id', existing_type=sa.Integer(), existing_server_default='1', nullable=False)
+    op.create_index('ix_service_tickets_date_created_id', 'service_tickets', ['date_created', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_service_tickets_date_created_id', table_name='service_tickets')
+    for table in reversed(VERSIONED_TABLES):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('version_id')
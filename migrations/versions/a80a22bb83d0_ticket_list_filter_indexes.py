@@ -0,0 +1,32 @@
+"""ticket list filter indexes
+
+Revision ID: a80a22bb83d0
+Revises: 7d4c2a9e1b53
+Create Date: 2026-10-17 22:47:43.965546
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a80a22bb83d0'
+down_revision = '7d4c2a9e1b53'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_service_tickets_customer_id_service_date', 'service_tickets', ['customer_id', 'service_date'], unique=False)
+    op.create_index('ix_service_tickets_status_service_date', 'service_tickets', ['status', 'service_date'], unique=False)
+    op.create_index('ix_service_tickets_vin', 'service_tickets', ['vin'], unique=False)
+    op.create_index('ix_service_tickets_service_date', 'service_tickets', ['service_date'], unique=False)
+    op.create_index('ix_service_assignment_mechanic_id_ticket', 'service_assignment', ['mechanic_id', 'service_ticket_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_service_assignment_mechanic_id_ticket', table_name='service_assignment')
+    op.drop_index('ix_service_tickets_service_date', table_name='service_tickets')
+    op.drop_index('ix_service_tickets_vin', table_name='service_tickets')
+    op.drop_index('ix_service_tickets_status_service_date', table_name='service_tickets')
+    op.drop_index('ix_service_tickets_customer_id_service_date', table_name='service_tickets')
@@ -0,0 +1,68 @@
+"""assignment indexes and unique ticket part
+
+Revision ID: c5e07d9a1b24
+Revises: 4b1cc3af8e1f
+Create Date: 2026-10-18 09:12:40.271934
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5e07d9a1b24'
+down_revision = '4b1cc3af8e1f'
+branch_labels = None
+depends_on = None
+
+
+def merge_duplicate_parts():
+    """
+    Folds repeated (service_ticket_id, inventory_id) rows into the oldest
+    one, summing quantities, so the unique constraint can be created.
+    Ticket totals are unchanged.
+    """
+    conn = op.get_bind()
+    links = sa.table(
+        'inventory_assignment',
+        sa.column('id', sa.Integer),
+        sa.column('service_ticket_id', sa.Integer),
+        sa.column('inventory_id', sa.Integer),
+        sa.column('quantity', sa.Integer),
+    )
+    duplicates = conn.execute(
+        sa.select(
+            sa.func.min(links.c.id),
+            links.c.service_ticket_id,
+            links.c.inventory_id,
+            sa.func.sum(links.c.quantity),
+        )
+        .group_by(links.c.service_ticket_id, links.c.inventory_id)
+        .having(sa.func.count() > 1)
+    ).all()
+    for keep_id, ticket_id, inventory_id, quantity in duplicates:
+        conn.execute(
+            sa.update(links).where(links.c.id == keep_id).values(quantity=quantity)
+        )
+        conn.execute(
+            sa.delete(links).where(
+                links.c.service_ticket_id == ticket_id,
+                links.c.inventory_id == inventory_id,
+                links.c.id != keep_id,
+            )
+        )
+
+
+def upgrade():
+    merge_duplicate_parts()
+    with op.batch_alter_table('inventory_assignment') as batch_op:
+        batch_op.create_unique_constraint('uq_inventory_assignment_ticket_inventory', ['service_ticket_id', 'inventory_id'])
+        batch_op.create_index('ix_inventory_assignment_inventory_id', ['inventory_id'], unique=False)
+    op.create_index('ix_service_assignment_date_assigned', 'service_assignment', ['date_assigned'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_service_assignment_date_assigned', table_name='service_assignment')
+    with op.batch_alter_table('inventory_assignment') as batch_op:
+        batch_op.drop_index('ix_inventory_assignment_inventory_id')
+        batch_op.drop_constraint('uq_inventory_assignment_ticket_inventory', type_='unique')
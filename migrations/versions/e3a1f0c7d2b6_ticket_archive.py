@@ -0,0 +1,70 @@
+"""archive tables for closed tickets
+
+Revision ID: e3a1f0c7d2b6
+Revises: c5e07d9a1b24
+Create Date: 2026-10-18 14:31:07.502318
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'e3a1f0c7d2b6'
+down_revision = 'c5e07d9a1b24'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('service_tickets_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('service_date', sa.Date(), nullable=False),
+    sa.Column('vin', sa.String(length=17), nullable=False),
+    sa.Column('description', sa.String(length=255), nullable=False),
+    # The type already exists on PostgreSQL, created with service_tickets
+    sa.Column('status', postgresql.ENUM('PENDING', 'IN_PROGRESS', 'COMPLETED', 'CANCELLED', name='servicestatus', create_type=False), nullable=False),
+    sa.Column('cost', sa.Float(), nullable=False),
+    sa.Column('date_created', sa.Date(), nullable=False),
+    sa.Column('parts_total', sa.Float(), nullable=False),
+    sa.Column('parts_count', sa.Integer(), nullable=False),
+    sa.Column('mechanic_count', sa.Integer(), nullable=False),
+    sa.Column('archived_at', sa.Date(), nullable=False),
+    sa.Column('customer_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['customer_id'], ['customers.id'], onupdate='CASCADE', ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_service_tickets_archive_customer_id', 'service_tickets_archive', ['customer_id'], unique=False)
+    op.create_table('service_assignment_archive',
+    sa.Column('service_ticket_id', sa.Integer(), nullable=False),
+    sa.Column('mechanic_id', sa.Integer(), nullable=False),
+    sa.Column('date_assigned', sa.Date(), nullable=True),
+    sa.ForeignKeyConstraint(['mechanic_id'], ['mechanics.id'], onupdate='CASCADE', ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['service_ticket_id'], ['service_tickets_archive.id'], onupdate='CASCADE', ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('service_ticket_id', 'mechanic_id')
+    )
+    op.create_index('ix_service_assignment_archive_mechanic_id', 'service_assignment_archive', ['mechanic_id'], unique=False)
+    op.create_table('inventory_assignment_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('service_ticket_id', sa.Integer(), nullable=False),
+    sa.Column('inventory_id', sa.Integer(), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['inventory_id'], ['inventory.id'], onupdate='CASCADE', ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['service_ticket_id'], ['service_tickets_archive.id'], onupdate='CASCADE', ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_inventory_assignment_archive_service_ticket_id', 'inventory_assignment_archive', ['service_ticket_id'], unique=False)
+    op.create_index('ix_inventory_assignment_archive_inventory_id', 'inventory_assignment_archive', ['inventory_id'], unique=False)
+
+
+def downgrade():
+    # Archived tickets are lost; run this only after moving them back
+    op.drop_index('ix_inventory_assignment_archive_inventory_id', table_name='inventory_assignment_archive')
+    op.drop_index('ix_inventory_assignment_archive_service_ticket_id', table_name='inventory_assignment_archive')
+    op.drop_table('inventory_assignment_archive')
+    op.drop_index('ix_service_assignment_archive_mechanic_id', table_name='service_assignment_archive')
+    op.drop_table('service_assignment_archive')
+    op.drop_index('ix_service_tickets_archive_customer_id', table_name='service_tickets_archive')
+    op.drop_table('service_tickets_archive')
@@ -0,0 +1,41 @@
+"""never reuse service ticket ids
+
+Revision ID: f4b9d2e6a1c8
+Revises: e3a1f0c7d2b6
+Create Date: 2026-10-18 16:48:30.271964
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f4b9d2e6a1c8'
+down_revision = 'e3a1f0c7d2b6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # SQLite hands the highest deleted rowid to the next insert unless the
+    # table is AUTOINCREMENT, which would clash with archived ticket ids.
+    # PostgreSQL sequences and MySQL 8 counters never go back, so there is
+    # nothing to do there.
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    with op.batch_alter_table('service_tickets', recreate='always', table_kwargs={'sqlite_autoincrement': True}):
+        pass
+    # Start past every id already handed out, archived ones included
+    op.execute(sa.text("DELETE FROM sqlite_sequence WHERE name = 'service_tickets'"))
+    op.execute(sa.text(
+        "INSERT INTO sqlite_sequence (name, seq) SELECT 'service_tickets', max("
+        "(SELECT coalesce(max(id), 0) FROM service_tickets), "
+        "(SELECT coalesce(max(id), 0) FROM service_tickets_archive))"
+    ))
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    with op.batch_alter_table('service_tickets', recreate='always', table_kwargs={'sqlite_autoincrement': False}):
+        pass
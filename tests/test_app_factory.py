@@ -0,0 +1,119 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from sqlalchemy import inspect
+from app import create_app, db
+from app.utils.util import encode_mechanic_token
+from config import Config, DevelopmentConfig, ProductionConfig, TestingConfig
+
+
+class CreateAllTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.uri = "sqlite:///" + os.path.join(self.tmpdir.name, "app.sqlite3")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def table_names(self, create_all):
+        uri = self.uri
+
+        class FileConfig(TestingConfig):
+            SQLALCHEMY_DATABASE_URI = uri
+            DB_CREATE_ALL = create_all
+
+        app = create_app(FileConfig)
+        with app.app_context():
+            names = inspect(db.engine).get_table_names()
+            db.engine.dispose()
+        return names
+
+    def test_only_testing_opts_in(self):
+        self.assertFalse(Config.DB_CREATE_ALL)
+        self.assertFalse(ProductionConfig.DB_CREATE_ALL)
+        self.assertTrue(TestingConfig.DB_CREATE_ALL)
+
+    def test_schema_left_to_migrations(self):
+        self.assertEqual(self.table_names(create_all=False), [])
+
+    def test_create_all_when_enabled(self):
+        self.assertIn("service_tickets", self.table_names(create_all=True))
+
+
+class DeferredLoadingTestCase(unittest.TestCase):
+    def test_import_skips_alembic_and_swagger(self):
+        loaded = subprocess.run(
+            [
+                sys.executable,
+                "-W",
+                "ignore",
+                "-c",
+                "import sys, app; app.create_app('testing');"
+                "print(sorted(m for m in ('alembic', 'flask_migrate', 'flask_swagger_ui')"
+                " if m in sys.modules))",
+            ],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        self.assertEqual(loaded.strip(), "[]")
+
+    def test_swagger_ui_served_on_first_hit(self):
+        client = create_app("testing").test_client()
+        response = client.get("/api/docs/")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"/static/bundled.yaml", response.data)
+        with client.get("/api/docs/swagger-ui.css") as response:
+            self.assertEqual(response.status_code, 200)
+        self.assertEqual(client.get("/api/docsfoo").status_code, 404)
+
+    def test_optional_blueprints(self):
+        class MinimalConfig(TestingConfig):
+            OPTIONAL_BLUEPRINTS = ()
+
+        app = create_app(MinimalConfig)
+        blueprints = set(app.blueprints)
+        self.assertNotIn("internal", blueprints)
+        self.assertNotIn("service_assignment", blueprints)
+        self.assertIn("service_ticket", blueprints)
+        self.assertEqual(app.test_client().get("/internal/cache/stats").status_code, 404)
+
+        self.assertIn("internal", create_app("testing").blueprints)
+
+    def test_production_serves_assignments_without_internal(self):
+        class SQLiteProductionConfig(ProductionConfig):
+            SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
+            SQLALCHEMY_ENGINE_OPTIONS = {}
+            DB_CREATE_ALL = True
+
+        app = create_app(SQLiteProductionConfig)
+        self.assertNotIn("internal", app.blueprints)
+        client = app.test_client()
+        headers = {"Authorization": f"Bearer {encode_mechanic_token(1)}"}
+        for url in ("/inventory_assignment/", "/service_assignment/"):
+            self.assertEqual(client.get(url, headers=headers).status_code, 200, url)
+        self.assertIn("internal", DevelopmentConfig.OPTIONAL_BLUEPRINTS)
+
+    def test_unknown_optional_blueprint(self):
+        class TypoConfig(TestingConfig):
+            OPTIONAL_BLUEPRINTS = ("internals",)
+
+        with self.assertRaises(ValueError):
+            create_app(TypoConfig)
+
+    def test_migrate_loaded_on_use(self):
+        app = create_app("testing")
+        self.assertEqual(app.extensions["migrate"].directory, "migrations")
+        self.assertIs(app.extensions["migrate"].db, db)
+        self.assertEqual(type(app.extensions["migrate"]).__name__, "_MigrateConfig")
+
+        result = app.test_cli_runner().invoke(args=["db", "--help"])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn("upgrade", result.output)
+
+
+if __name__ == "__main__":
+    unittest.main()
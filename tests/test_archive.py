@@ -0,0 +1,242 @@
+from datetime import date
+import unittest
+from app import create_app, db
+from app.models import (
+    ArchivedInventoryAssignment,
+    ArchivedServiceAssignment,
+    ArchivedServiceTicket,
+    Customer,
+    Inventory,
+    InventoryAssignment,
+    Mechanic,
+    ServiceAssignment,
+    ServiceStatus,
+    ServiceTicket,
+)
+from app.utils.archive import archive_closed_tickets, archive_cutoff
+
+CUTOFF = date(2024, 1, 1)
+
+
+class ArchiveTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("testing")
+        self.client = self.app.test_client()
+
+        with self.app.app_context():
+            db.create_all()
+            customer = Customer(
+                name="Jane Customer",
+                email="jane@example.com",
+                phone="555-2222",
+                address="123 Customer St",
+            )
+            customer.set_password("custpass")
+            mechanic = Mechanic(
+                name="Mike Mechanic",
+                email="mike@example.com",
+                phone="555-3333",
+                address="456 Mechanic Blvd",
+                salary=40000,
+            )
+            mechanic.set_password("mechpass")
+            part = Inventory(
+                part_name="Spark Plug",
+                quantity=50,
+                description="Standard spark plug",
+                price=2.5,
+            )
+            db.session.add_all([customer, mechanic, part])
+            db.session.flush()
+
+            # Old and closed, old but open, then recent and closed
+            tickets = [
+                self.ticket(customer, "Old brakes", date(2023, 3, 1), ServiceStatus.COMPLETED),
+                self.ticket(customer, "Old recall", date(2023, 4, 1), ServiceStatus.CANCELLED),
+                self.ticket(customer, "Old engine", date(2023, 5, 1), ServiceStatus.COMPLETED),
+                self.ticket(customer, "Still open", date(2023, 6, 1), ServiceStatus.IN_PROGRESS),
+                self.ticket(customer, "Recent", date(2024, 6, 1), ServiceStatus.COMPLETED),
+            ]
+            db.session.add_all(tickets)
+            db.session.flush()
+            db.session.add_all(
+                [
+                    ServiceAssignment(
+                        service_ticket_id=tickets[0].id,
+                        mechanic_id=mechanic.id,
+                        date_assigned=date(2023, 3, 1),
+                    ),
+                    ServiceAssignment(
+                        service_ticket_id=tickets[3].id,
+                        mechanic_id=mechanic.id,
+                        date_assigned=date(2023, 6, 1),
+                    ),
+                    InventoryAssignment(
+                        service_ticket_id=tickets[0].id,
+                        inventory_id=part.id,
+                        quantity=4,
+                    ),
+                ]
+            )
+            db.session.commit()
+
+            self.customer_id = customer.id
+            self.mechanic_id = mechanic.id
+            self.ticket_ids = [ticket.id for ticket in tickets]
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    @staticmethod
+    def ticket(customer, title, service_date, status):
+        return ServiceTicket(
+            title=title,
+            description="Archive test ticket",
+            vin="1HGCM82633A004352",
+            service_date=service_date,
+            status=status,
+            cost=100.0,
+            date_created=service_date,
+            customer=customer,
+        )
+
+    def mechanic_auth_header(self):
+        response = self.client.post(
+            "/mechanic/login",
+            json={"email": "mike@example.com", "password": "mechpass"},
+        )
+        return {"Authorization": f"Bearer {response.get_json()['auth_token']}"}
+
+    def archive(self, **kwargs):
+        with self.app.app_context():
+            return list(archive_closed_tickets(db.session, CUTOFF, **kwargs))
+
+    def test_archive_cutoff(self):
+        self.assertEqual(archive_cutoff(30, today=date(2024, 3, 31)), date(2024, 3, 1))
+
+    def test_archives_old_closed_tickets_with_assignments(self):
+        self.assertEqual(self.archive(), [3])
+
+        with self.app.app_context():
+            live = db.session.scalars(db.select(ServiceTicket.id).order_by(ServiceTicket.id)).all()
+            archived = db.session.scalars(
+                db.select(ArchivedServiceTicket.id).order_by(ArchivedServiceTicket.id)
+            ).all()
+            self.assertEqual(archived, self.ticket_ids[:3])
+            self.assertEqual(live, self.ticket_ids[3:])
+
+            ticket = db.session.get(ArchivedServiceTicket, self.ticket_ids[0])
+            self.assertEqual(ticket.title, "Old brakes")
+            self.assertEqual(ticket.status, ServiceStatus.COMPLETED)
+            self.assertEqual(ticket.archived_at, date.today())
+            self.assertEqual([m.id for m in ticket.mechanics], [self.mechanic_id])
+            self.assertEqual(
+                [(a.inventory.part_name, a.quantity) for a in ticket.inventory_assignments],
+                [("Spark Plug", 4)],
+            )
+
+            self.assertEqual(db.session.query(ArchivedServiceAssignment).count(), 1)
+            self.assertEqual(db.session.query(ArchivedInventoryAssignment).count(), 1)
+            # The open ticket keeps its assignment
+            self.assertEqual(
+                db.session.scalars(db.select(ServiceAssignment.service_ticket_id)).all(),
+                [self.ticket_ids[3]],
+            )
+            self.assertEqual(db.session.query(InventoryAssignment).count(), 0)
+
+    def test_ticket_ids_are_not_reused(self):
+        self.archive()
+        with self.app.app_context():
+            db.session.delete(db.session.get(ServiceTicket, self.ticket_ids[-1]))
+            db.session.delete(db.session.get(ServiceTicket, self.ticket_ids[-2]))
+            db.session.commit()
+            ticket = self.ticket(
+                db.session.get(Customer, self.customer_id),
+                "New",
+                date(2023, 1, 1),
+                ServiceStatus.COMPLETED,
+            )
+            db.session.add(ticket)
+            db.session.commit()
+            self.assertGreater(ticket.id, max(self.ticket_ids))
+
+        self.assertEqual(self.archive(), [1])
+
+    def test_rerun_archives_nothing_more(self):
+        self.archive()
+        self.assertEqual(self.archive(), [])
+
+    def test_batches_and_max_batches(self):
+        self.assertEqual(self.archive(batch_size=2, max_batches=1), [2])
+        self.assertEqual(self.archive(batch_size=2), [1])
+
+    def test_archiving_bumps_customer_version(self):
+        with self.app.app_context():
+            version = db.session.get(Customer, self.customer_id).version_id
+        etag = self.client.get(f"/customer/{self.customer_id}").headers["ETag"]
+
+        self.archive()
+
+        with self.app.app_context():
+            self.assertGreater(db.session.get(Customer, self.customer_id).version_id, version)
+        response = self.client.get(
+            f"/customer/{self.customer_id}", headers={"If-None-Match": etag}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.get_json()["service_tickets"]), 2)
+
+    def test_archiving_invalidates_cached_lists(self):
+        headers = self.mechanic_auth_header()
+        response = self.client.get("/service_ticket/", headers=headers)
+        self.assertEqual(response.status_code, 200)
+        cached = response.get_data()
+
+        self.archive()
+
+        response = self.client.get("/service_ticket/", headers=headers)
+        self.assertNotEqual(response.get_data(), cached)
+
+    def test_get_archived_ticket(self):
+        self.archive()
+        headers = self.mechanic_auth_header()
+
+        response = self.client.get(f"/service_ticket/{self.ticket_ids[0]}", headers=headers)
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertTrue(data["archived"])
+        self.assertEqual(data["ticket"]["title"], "Old brakes")
+
+        response = self.client.get(f"/service_ticket/{self.ticket_ids[3]}", headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("archived", response.get_json())
+
+        response = self.client.get("/service_ticket/9999", headers=headers)
+        self.assertEqual(response.status_code, 404)
+
+    def test_rankings_count_archived_assignments(self):
+        self.archive()
+        response = self.client.get("/mechanic/rankings")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()[0]["ticket_count"], 2)
+
+    def test_archive_command(self):
+        days = (date.today() - CUTOFF).days
+        result = self.app.test_cli_runner().invoke(
+            args=[
+                "service_ticket",
+                "archive",
+                "--older-than-days",
+                str(days),
+                "--batch-size",
+                "2",
+            ]
+        )
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn("Archived 2 service ticket(s).", result.output)
+        self.assertIn(f"Archived 3 service ticket(s) serviced before {CUTOFF}.", result.output)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,267 @@
+import os
+import pickle
+import tempfile
+import threading
+import stat
+import time
+import unittest
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+from app import create_app, db
+from app.blueprints.serviceticket import routes as service_ticket_routes
+from app.extensions import cache
+from app.models import Mechanic
+from app.utils.caching import single_flight
+from app.utils.sqlite_cache import SQLiteCache
+
+
+class SQLiteCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "cache.sqlite3")
+        self.cache = SQLiteCache(self.path, "secret", threshold=100)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_entries_are_shared_between_instances(self):
+        other = SQLiteCache(self.path, "secret")
+        self.cache.set("view:a:1", {"body": b"x"})
+        self.assertEqual(other.get("view:a:1"), {"body": b"x"})
+        other.delete("view:a:1")
+        self.assertIsNone(self.cache.get("view:a:1"))
+
+    def test_unsigned_entries_are_misses(self):
+        self.cache.set("view:a:1", {"body": b"x"})
+        self.assertIsNone(SQLiteCache(self.path, "other").get("view:a:1"))
+        # A value planted in the file without the key is never unpickled
+        self.cache._conn.execute(
+            "UPDATE cache_entries SET value = ? WHERE key = 'view:a:1'",
+            (b"\0" * 32 + pickle.dumps({"body": b"y"}),),
+        )
+        self.assertIsNone(self.cache.get("view:a:1"))
+        self.assertEqual(self.cache.get_many("view:a:1"), [None])
+
+    def test_default_path_is_private_to_the_app(self):
+        instance_path = os.path.join(self.tmpdir.name, "instance")
+        app = SimpleNamespace(instance_path=instance_path, config={"SECRET_KEY": "k"})
+        cache = SQLiteCache.factory(
+            app, {"CACHE_THRESHOLD": 10, "CACHE_SQLITE_PATH": None}, (), {}
+        )
+        self.assertEqual(cache.path, os.path.join(instance_path, "cache.sqlite3"))
+        self.assertEqual(stat.S_IMODE(os.stat(instance_path).st_mode), 0o700)
+
+    def test_requires_secret_key(self):
+        with self.assertRaises(ValueError):
+            SQLiteCache(self.path, "")
+
+    def test_entries_expire(self):
+        self.cache.set("tag:a", "v1", timeout=1)
+        self.cache.set("tag:b", "v2", timeout=0)
+        self.assertEqual(self.cache.get_many("tag:a", "tag:b"), ["v1", "v2"])
+        self.cache._conn.execute("UPDATE cache_entries SET expires = 1 WHERE key = 'tag:a'")
+        self.assertEqual(self.cache.get_many("tag:a", "tag:b"), [None, "v2"])
+
+    def test_add_only_stores_missing_or_expired_keys(self):
+        other = SQLiteCache(self.path, "secret")
+        self.assertTrue(self.cache.add("lock:x", 1, timeout=10))
+        self.assertFalse(other.add("lock:x", 2, timeout=10))
+        self.cache._conn.execute("UPDATE cache_entries SET expires = 1")
+        self.assertTrue(other.add("lock:x", 3, timeout=10))
+        self.assertEqual(self.cache.get("lock:x"), 3)
+
+    def test_evicts_oldest_entries_past_threshold(self):
+        self.cache.set_many({f"view:old:{n}": n for n in range(80)})
+        self.cache.set_many({f"view:new:{n}": n for n in range(80)})
+        stats = self.cache.stats()
+        self.assertEqual(stats["view:old"]["evictions"], 60)
+        self.assertEqual(stats["view:old"]["entries"], 20)
+        self.assertEqual(stats["view:new"]["entries"], 80)
+
+    def test_stats_aggregate_across_instances(self):
+        other = SQLiteCache(self.path, "secret")
+        self.cache.set("view:a:1", 1)
+        self.cache.get("view:a:1")
+        other.get("view:a:1")
+        other.get("view:a:2")
+        other.stats()  # flushes other's buffered counters
+        stats = self.cache.stats()
+        self.assertEqual(stats["view:a"]["hits"], 2)
+        self.assertEqual(stats["view:a"]["misses"], 1)
+        self.assertEqual(stats["view:a"]["hit_ratio"], 0.6667)
+        self.assertEqual(stats["view:a"]["entries"], 1)
+
+    def test_inc(self):
+        self.assertEqual(self.cache.inc("count:a"), 1)
+        self.assertEqual(self.cache.inc("count:a", 4), 5)
+        self.assertEqual(self.cache.dec("count:a"), 4)
+
+
+class CachedViewTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("testing")
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            mechanic = Mechanic(
+                name="Mike Mechanic",
+                email="mike@example.com",
+                phone="555-3333",
+                address="456 Mechanic Blvd",
+                salary=40000,
+            )
+            mechanic.set_password("mechpass")
+            db.session.add(mechanic)
+            db.session.commit()
+        response = self.client.post(
+            "/mechanic/login",
+            json={"email": "mike@example.com", "password": "mechpass"},
+        )
+        self.headers = {"Authorization": f"Bearer {response.get_json()['auth_token']}"}
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def test_cache_stats_report_view_prefixes(self):
+        self.client.get("/service_ticket/", headers=self.headers)
+        self.client.get("/service_ticket/", headers=self.headers)
+
+        response = self.client.get("/internal/cache/stats", headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual(data["backend"], "SQLiteCache")
+        view = data["prefixes"]["view:service_ticket.get_service_tickets"]
+        self.assertEqual((view["hits"], view["misses"], view["entries"]), (1, 1, 1))
+
+    def test_ticket_list_shared_between_mechanics(self):
+        with self.app.app_context():
+            mechanic = Mechanic(
+                name="Mary Mechanic",
+                email="mary@example.com",
+                phone="555-4444",
+                address="789 Mechanic Blvd",
+                salary=40000,
+            )
+            mechanic.set_password("mechpass")
+            db.session.add(mechanic)
+            db.session.commit()
+        response = self.client.post(
+            "/mechanic/login",
+            json={"email": "mary@example.com", "password": "mechpass"},
+        )
+        other = {"Authorization": f"Bearer {response.get_json()['auth_token']}"}
+
+        first = self.client.get("/service_ticket/", headers=self.headers)
+        self.assertEqual(first.headers["X-Cache-Status"], "miss")
+        response = self.client.get("/service_ticket/", headers=other)
+        self.assertEqual(response.headers["X-Cache-Status"], "fresh")
+        self.assertEqual(response.get_data(), first.get_data())
+        # Still behind the token check
+        self.assertEqual(self.client.get("/service_ticket/").status_code, 401)
+
+    def test_cache_stats_requires_mechanic_token(self):
+        response = self.client.get("/internal/cache/stats")
+        self.assertEqual(response.status_code, 401)
+
+    def test_concurrent_misses_compute_once_per_expiry(self):
+        computations = []
+        filter_service_tickets = service_ticket_routes.filter_service_tickets
+
+        def slow_filter(stmt):
+            computations.append(stmt)
+            time.sleep(0.2)
+            return filter_service_tickets(stmt)
+
+        clients = 8
+        barrier = threading.Barrier(clients)
+
+        def fetch(_):
+            client = self.app.test_client()
+            barrier.wait()
+            return client.get("/service_ticket/", headers=self.headers).status_code
+
+        with patch.object(service_ticket_routes, "filter_service_tickets", slow_filter):
+            for _ in range(3):
+                with ThreadPoolExecutor(max_workers=clients) as pool:
+                    statuses = list(pool.map(fetch, range(clients)))
+                self.assertEqual(statuses, [200] * clients)
+                # Expire every entry, as the TTL would
+                with self.app.app_context():
+                    cache.clear()
+
+        self.assertEqual(len(computations), 3)
+
+    def serve_rankings_with(self, ttl, max_stale):
+        return patch.dict(
+            self.app.config,
+            {
+                "CACHE_VIEW_TIMEOUTS": {"mechanic.get_mechanic_rankings": ttl},
+                "CACHE_MAX_STALENESS": max_stale,
+            },
+        )
+
+    def test_stale_entry_served_then_refreshed(self):
+        with self.serve_rankings_with(0.2, 5):
+            first = self.client.get("/mechanic/rankings")
+            self.assertEqual(first.headers["X-Cache-Status"], "miss")
+            self.assertEqual(
+                self.client.get("/mechanic/rankings").headers["X-Cache-Status"],
+                "fresh",
+            )
+
+            time.sleep(0.25)
+            stale = self.client.get("/mechanic/rankings")
+            self.assertEqual(stale.headers["X-Cache-Status"], "stale")
+            self.assertEqual(stale.get_json(), first.get_json())
+
+            # The background refresh replaces the entry with a fresh one
+            deadline = time.monotonic() + 2
+            status = "stale"
+            while status == "stale" and time.monotonic() < deadline:
+                time.sleep(0.02)
+                status = self.client.get("/mechanic/rankings").headers["X-Cache-Status"]
+            self.assertEqual(status, "fresh")
+
+    def test_entry_past_max_staleness_is_recomputed(self):
+        with self.serve_rankings_with(0.1, 0.2):
+            self.client.get("/mechanic/rankings")
+            time.sleep(0.35)
+            response = self.client.get("/mechanic/rankings")
+        self.assertEqual(response.headers["X-Cache-Status"], "miss")
+
+    def test_invalidation_bypasses_stale_entry(self):
+        with self.serve_rankings_with(0.1, 5):
+            self.client.get("/mechanic/rankings")
+            time.sleep(0.15)
+            response = self.client.put(
+                "/mechanic/1", json={"name": "Renamed"}, headers=self.headers
+            )
+            self.assertEqual(response.status_code, 200)
+            response = self.client.get("/mechanic/rankings")
+        self.assertEqual(response.headers["X-Cache-Status"], "miss")
+
+    def test_waits_for_fill_by_another_worker(self):
+        computed = []
+
+        def other_worker():
+            time.sleep(0.1)
+            with self.app.app_context():
+                cache.set("view:shared", "filled")
+                cache.delete("lock:view:shared")
+
+        with self.app.app_context():
+            cache.add("lock:view:shared", 12345, timeout=10)
+            threading.Thread(target=other_worker).start()
+            result = single_flight(
+                "view:shared", lambda: computed.append(1), lambda entry: entry
+            )
+
+        self.assertEqual(result, "filled")
+        self.assertEqual(computed, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
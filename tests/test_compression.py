@@ -0,0 +1,104 @@
+import gzip
+import json
+import unittest
+from unittest.mock import patch
+from app import create_app, db
+from app.models import Customer, Inventory
+from app.utils import compression
+from app.utils.util import encode_mechanic_token
+
+
+class CompressionTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("testing")
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            db.session.add_all(
+                Inventory(
+                    part_name=f"Part {n}",
+                    price=9.99,
+                    quantity=10,
+                    description="Brake pad set for the front axle",
+                )
+                for n in range(50)
+            )
+            db.session.add(
+                Customer(
+                    name="John Doe",
+                    email="john@example.com",
+                    phone="1234567890",
+                    address="123 Main St",
+                    password="x",
+                )
+            )
+            db.session.commit()
+        self.headers = {"Authorization": f"Bearer {encode_mechanic_token(1)}"}
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def test_gzip_negotiated(self):
+        response = self.client.get(
+            "/inventory/", headers={**self.headers, "Accept-Encoding": "gzip"}
+        )
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response.headers["Vary"])
+        self.assertEqual(len(json.loads(gzip.decompress(response.data))), 50)
+
+        plain = self.client.get("/inventory/", headers=self.headers)
+        self.assertNotIn("Content-Encoding", plain.headers)
+        self.assertEqual(len(plain.get_json()), 50)
+
+    def test_small_bodies_not_compressed(self):
+        response = self.client.get(
+            "/inventory/1", headers={**self.headers, "Accept-Encoding": "gzip"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("Content-Encoding", response.headers)
+
+    def test_level_and_threshold_configurable(self):
+        self.app.config.update(COMPRESS_MIN_SIZE=10, COMPRESS_LEVEL=1)
+        with patch.object(compression.gzip, "compress", wraps=gzip.compress) as compress:
+            response = self.client.get(
+                "/inventory/1", headers={**self.headers, "Accept-Encoding": "gzip"}
+            )
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertEqual(compress.call_args.kwargs["compresslevel"], 1)
+
+    def test_cached_view_reuses_compressed_body(self):
+        self.app.config["COMPRESS_MIN_SIZE"] = 10
+        headers = {"Accept-Encoding": "gzip"}
+        first = self.client.get("/customer/1", headers=headers)
+        self.assertEqual(first.headers["Content-Encoding"], "gzip")
+        self.assertTrue(first.headers["ETag"].endswith('-gzip"'))
+
+        with patch.object(compression.gzip, "compress") as compress:
+            hit = self.client.get("/customer/1", headers=headers)
+            plain = self.client.get("/customer/1")
+        compress.assert_not_called()
+        self.assertEqual(hit.headers["X-Cache-Status"], "fresh")
+        self.assertEqual(hit.data, first.data)
+        self.assertEqual(plain.get_json()["name"], "John Doe")
+        self.assertNotIn("Content-Encoding", plain.headers)
+
+        revalidated = self.client.get(
+            "/customer/1",
+            headers={**headers, "If-None-Match": first.headers["ETag"]},
+        )
+        self.assertEqual(revalidated.status_code, 304)
+
+    @unittest.skipIf(compression.brotli is None, "brotli is not installed")
+    def test_brotli_preferred_when_available(self):
+        response = self.client.get(
+            "/inventory/", headers={**self.headers, "Accept-Encoding": "gzip, br"}
+        )
+        self.assertEqual(response.headers["Content-Encoding"], "br")
+        decoded = compression.brotli.decompress(response.data)
+        self.assertEqual(len(json.loads(decoded)), 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
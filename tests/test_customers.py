@@ -1,5 +1,6 @@
 from datetime import date
 import unittest
+from sqlalchemy import update
 from app import create_app, db
 from app.models import Customer, ServiceTicket
 
@@ -111,6 +112,58 @@ class CustomerRoutesTestCase(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.get_json()["email"], "john@example.com")
 
+    def test_get_customer_etag_changes_with_tickets(self):
+        response = self.client.get(f"/customer/{self.customer.id}")
+        etag = response.headers["ETag"]
+
+        response = self.client.get(
+            f"/customer/{self.customer.id}", headers={"If-None-Match": etag}
+        )
+        self.assertEqual(response.status_code, 304)
+
+        with self.app.app_context():
+            db.session.add(
+                ServiceTicket(
+                    title="New Ticket",
+                    description="Changes the customer's representation",
+                    vin="1HGCM826CX000002",
+                    service_date=date(2023, 10, 1),
+                    status="PENDING",
+                    cost=20.0,
+                    date_created=date(2023, 9, 1),
+                    customer_id=self.customer.id,
+                )
+            )
+            db.session.commit()
+
+        response = self.client.get(
+            f"/customer/{self.customer.id}", headers={"If-None-Match": etag}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.get_json()["service_tickets"]), 1)
+
+    def test_update_after_concurrent_version_bump(self):
+        with self.app.app_context():
+            customer = db.session.get(Customer, self.customer.id)
+            version = customer.version_id
+            # Another worker's ticket write bumps the customer meanwhile
+            db.session.execute(
+                update(Customer)
+                .where(Customer.id == customer.id)
+                .values(version_id=Customer.version_id + 1)
+                .execution_options(synchronize_session=False)
+            )
+            customer.name = "Jane Doe"
+            db.session.commit()
+            self.assertEqual(customer.version_id, version + 2)
+
+        response = self.client.put(
+            f"/customer/{self.customer.id}",
+            json={"name": "John Doe"},
+            headers=self.auth_header(),
+        )
+        self.assertEqual(response.status_code, 200)
+
     def test_get_customer_not_found(self):
         response = self.client.get("/customer/9999")
         self.assertEqual(response.status_code, 404)
@@ -135,6 +188,46 @@ class CustomerRoutesTestCase(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertIsInstance(response.get_json(), list)
 
+    def test_get_my_tickets_cached_per_customer(self):
+        with self.app.app_context():
+            other = Customer(
+                name="Other Customer",
+                email="other@example.com",
+                phone="1112223333",
+                address="9 Side St",
+            )
+            other.set_password("otherpass")
+            db.session.add(other)
+            db.session.flush()
+            db.session.add(
+                ServiceTicket(
+                    title="Other's Ticket",
+                    description="Belongs to the other customer",
+                    vin="1HGCM826CX000001",
+                    service_date=date(2023, 10, 1),
+                    status="PENDING",
+                    cost=10.0,
+                    date_created=date(2023, 9, 1),
+                    customer_id=other.id,
+                )
+            )
+            db.session.commit()
+
+        response = self.client.get("/customer/my-tickets", headers=self.auth_header())
+        self.assertEqual(response.get_json(), [])
+
+        other_token = self.client.post(
+            "/customer/login",
+            json={"email": "other@example.com", "password": "otherpass"},
+        ).get_json()["auth_token"]
+        response = self.client.get(
+            "/customer/my-tickets",
+            headers={"Authorization": f"Bearer {other_token}"},
+        )
+        self.assertEqual(
+            [ticket["title"] for ticket in response.get_json()], ["Other's Ticket"]
+        )
+
     def test_get_my_tickets_unauthorized(self):
         response = self.client.get("/customer/my-tickets")
         self.assertEqual(response.status_code, 401)
@@ -149,6 +242,21 @@ class CustomerRoutesTestCase(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.get_json()["name"], "John Updated")
 
+    def test_update_customer_invalidates_cached_detail(self):
+        response = self.client.get(f"/customer/{self.customer.id}")
+        self.assertEqual(response.get_json()["name"], "John Doe")
+
+        self.client.put(
+            f"/customer/{self.customer.id}",
+            headers=self.auth_header(),
+            json={"name": "John Updated"},
+        )
+
+        response = self.client.get(f"/customer/{self.customer.id}")
+        self.assertEqual(response.get_json()["name"], "John Updated")
+        response = self.client.get("/customer/")
+        self.assertEqual(response.get_json()["customers"][0]["name"], "John Updated")
+
     def test_update_customer_unauthorized(self):
 
         response = self.client.put(
@@ -78,6 +78,32 @@ class InventoryRoutesTestCase(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.get_json()["part_name"], "Hammer")
 
+    def test_get_inventory_item_etag(self):
+        with self.app.app_context():
+            item = Inventory(part_name="Jack", quantity=2, price=45.0)
+            db.session.add(item)
+            db.session.commit()
+            item_id = item.id
+
+        response = self.client.get(f"/inventory/{item_id}", headers=self.auth_header())
+        etag = response.headers["ETag"]
+
+        response = self.client.get(
+            f"/inventory/{item_id}",
+            headers={**self.auth_header(), "If-None-Match": etag},
+        )
+        self.assertEqual(response.status_code, 304)
+
+        self.client.put(
+            f"/inventory/{item_id}", headers=self.auth_header(), json={"price": 50.0}
+        )
+        response = self.client.get(
+            f"/inventory/{item_id}",
+            headers={**self.auth_header(), "If-None-Match": etag},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["price"], 50.0)
+
     def test_get_inventory_item_not_found(self):
         response = self.client.get("/inventory/9999", headers=self.auth_header())
         self.assertEqual(response.status_code, 404)
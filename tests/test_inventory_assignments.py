@@ -205,6 +205,40 @@ class InventoryAssignmentRoutesTestCase(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertIn("message", response.get_json())
 
+    def test_inventory_assignments_maintain_ticket_totals(self):
+        def totals():
+            with self.app.app_context():
+                ticket = db.session.get(ServiceTicket, self.ticket_id)
+                return ticket.parts_count, ticket.parts_total
+
+        link = {"service_ticket_id": self.ticket_id, "inventory_id": self.inventory_id}
+        self.client.post(
+            "/inventory_assignment/",
+            headers=self.mechanic_auth_header(),
+            json={**link, "quantity": 2},
+        )
+        self.assertEqual(totals(), (2, 50.0))
+
+        self.client.put(
+            "/inventory_assignment/",
+            headers=self.mechanic_auth_header(),
+            json={**link, "quantity": 5},
+        )
+        self.assertEqual(totals(), (5, 125.0))
+
+        self.client.put(
+            f"/inventory/{self.inventory_id}",
+            headers=self.mechanic_auth_header(),
+            json={"price": 10.0},
+        )
+        self.assertEqual(totals(), (5, 50.0))
+
+        self.client.delete(
+            f"/inventory_assignment/?service_ticket_id={self.ticket_id}&inventory_id={self.inventory_id}",
+            headers=self.mechanic_auth_header(),
+        )
+        self.assertEqual(totals(), (0, 0.0))
+
     def test_delete_inventory_assignment_not_found(self):
         response = self.client.delete(
             "/inventory_assignment/?service_ticket_id=9999&inventory_id=9999",
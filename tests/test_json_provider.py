@@ -0,0 +1,194 @@
+import dataclasses
+import json
+import uuid
+import unittest
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from unittest.mock import patch
+from app import create_app, db
+from app.blueprints.serviceticket.routes import (
+    service_ticket_summaries_schema,
+    service_tickets_schema,
+)
+from app.models import (
+    Customer,
+    Inventory,
+    InventoryAssignment,
+    Mechanic,
+    ServiceAssignment,
+    ServiceStatus,
+    ServiceTicket,
+)
+from app.utils import json_provider
+from app.utils.json_provider import FastJSONProvider, JSONProvider
+
+
+@dataclasses.dataclass
+class Part:
+    name: str
+    price: Decimal
+
+
+@dataclasses.dataclass
+class Status:
+    status: ServiceStatus
+
+
+class JSONProviderParityTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("testing")
+        self.fast = self.app.json
+        self.stdlib = JSONProvider(self.app)
+
+    def assertParity(self, obj):
+        with self.app.app_context():
+            expected = self.stdlib.response(obj).get_data()
+            self.assertEqual(self.fast.response(obj).get_data(), expected)
+
+    def test_app_installs_fast_provider(self):
+        self.assertIsInstance(self.app.json, FastJSONProvider)
+
+    @unittest.skipIf(json_provider.orjson is None, "orjson is not installed")
+    def test_ticket_payloads_encoded_by_orjson(self):
+        with self.app.app_context():
+            db.create_all()
+            customer = Customer(
+                name="Jane Customer",
+                email="jane@example.com",
+                phone="555-2222",
+                address="123 Customer St",
+                password="x",
+            )
+            mechanics = [
+                Mechanic(
+                    name=f"Mechanic {n}",
+                    email=f"mechanic{n}@example.com",
+                    phone="555-3333",
+                    address="456 Mechanic Blvd",
+                    salary=40000.5,
+                    password="x",
+                )
+                for n in range(3)
+            ]
+            parts = [
+                Inventory(part_name=f"Part {n}", price=2.5 + n / 3, quantity=50)
+                for n in range(4)
+            ]
+            db.session.add_all([customer, *mechanics, *parts])
+            db.session.flush()
+            for n, status in enumerate(ServiceStatus):
+                ticket = ServiceTicket(
+                    title=f"Ticket {n}",
+                    service_date=date(2024, 1, n + 1),
+                    vin="1HGCM82633A004352",
+                    description="Brakes squeal",
+                    status=status,
+                    cost=129.99 * n,
+                    date_created=date(2024, 1, 1),
+                    customer_id=customer.id,
+                )
+                db.session.add(ticket)
+                db.session.flush()
+                db.session.add_all(
+                    ServiceAssignment(service_ticket_id=ticket.id, mechanic_id=m.id)
+                    for m in mechanics
+                )
+                db.session.add_all(
+                    InventoryAssignment(
+                        service_ticket_id=ticket.id, inventory_id=p.id, quantity=n + 1
+                    )
+                    for p in parts
+                )
+            db.session.commit()
+            tickets = db.session.scalars(db.select(ServiceTicket)).all()
+            payloads = [
+                service_tickets_schema.dump(tickets),
+                service_ticket_summaries_schema.dump(tickets),
+            ]
+            db.session.remove()
+            db.drop_all()
+
+        with patch.object(
+            json_provider.orjson, "dumps", wraps=json_provider.orjson.dumps
+        ) as dumps:
+            for payload in payloads:
+                self.assertParity(payload)
+        self.assertEqual(dumps.call_count, 2)
+
+    def test_dates_decimals_and_enums(self):
+        self.assertParity(
+            {
+                "service_date": date(2024, 2, 29),
+                "date_created": datetime(2024, 2, 29, 13, 5, tzinfo=timezone.utc),
+                "cost": Decimal("129.990"),
+                "status": ServiceStatus.IN_PROGRESS,
+                "statuses": list(ServiceStatus),
+                "id": uuid.UUID(int=7),
+                "part": Part("Spark Plug", Decimal("2.50")),
+            }
+        )
+
+    def test_values_orjson_spells_differently(self):
+        for value in (
+            {"name": "Jürgen", "note": " "},
+            {"total": 2**70},
+            {"price": 0.0001, "total": 123456789012345.6, "sum": 0.1 + 0.2},
+            {"null": None, "title": "2e"},
+            {1: "a", 10: "b", 2: "c"},
+        ):
+            with self.subTest(value=value):
+                self.assertParity(value)
+
+    def test_raw_enums_encoded_by_name(self):
+        with self.app.app_context():
+            for provider in (self.fast, self.stdlib):
+                response = provider.response({"status": ServiceStatus.IN_PROGRESS})
+                self.assertEqual(response.get_data(), b'{"status":"IN_PROGRESS"}\n')
+                # Nested in a tuple, and inside a dataclass default() expands
+                response = provider.response(
+                    [
+                        {"statuses": (ServiceStatus.PENDING,)},
+                        Status(ServiceStatus.COMPLETED),
+                    ]
+                )
+                self.assertEqual(
+                    response.get_data(),
+                    b'[{"statuses":["PENDING"]},{"status":"COMPLETED"}]\n',
+                )
+
+    @unittest.skipIf(json_provider.orjson is None, "orjson is not installed")
+    def test_float_spelling_differences(self):
+        obj = {"nan": float("nan"), "inf": float("inf"), "big": 1e16, "small": 1e-5}
+        with self.app.app_context():
+            fast = self.fast.response(obj).get_data()
+            stdlib = self.stdlib.response(obj).get_data()
+        self.assertEqual(fast, b'{"big":1e16,"inf":null,"nan":null,"small":0.00001}\n')
+        self.assertEqual(
+            stdlib, b'{"big":1e+16,"inf":Infinity,"nan":NaN,"small":1e-05}\n'
+        )
+        self.assertEqual(
+            json.loads(fast), {"big": 1e16, "inf": None, "nan": None, "small": 1e-5}
+        )
+
+    def test_pretty_printed_in_debug(self):
+        self.app.debug = True
+        self.assertParity({"b": [1, 2], "a": {"c": None}})
+
+    def test_dumps_compact_matches_response_body(self):
+        obj = {"b": [1, 2.5], "a": {"c": None, "d": date(2024, 1, 2)}}
+        with self.app.app_context():
+            for provider in (self.fast, self.stdlib):
+                self.assertEqual(
+                    provider.dumps_compact(obj) + b"\n",
+                    provider.response(obj).get_data(),
+                )
+
+    @unittest.skipIf(json_provider.orjson is None, "orjson is not installed")
+    def test_dumps_compact_uses_orjson(self):
+        with patch.object(json_provider.orjson, "dumps", return_value=b"{}") as dumps:
+            self.assertEqual(self.fast.dumps_compact({"a": 1}), b"{}")
+        dumps.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import os
+import tempfile
+import unittest
+from datetime import date
+from flask_migrate import downgrade, upgrade
+from sqlalchemy import inspect, text
+from app import create_app, db
+from app.models import Customer, ServiceTicket
+from config import TestingConfig
+
+MIGRATIONS = os.path.join(os.path.dirname(os.path.dirname(__file__)), "migrations")
+
+
+class MigrationsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        path = os.path.join(self.tmpdir.name, "migrations.db")
+
+        class MigrationConfig(TestingConfig):
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+            DB_CREATE_ALL = False
+
+        self.app = create_app(MigrationConfig)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+
+    def tearDown(self):
+        db.session.remove()
+        db.engine.dispose()
+        self.ctx.pop()
+        self.tmpdir.cleanup()
+
+    def test_upgrade_from_initial_schema_backfills_versions(self):
+        # A database built from the original models, stamped at the first
+        # revision, with rows written before row versions existed
+        upgrade(directory=MIGRATIONS, revision="42462a515098")
+        columns = {c["name"] for c in inspect(db.engine).get_columns("service_tickets")}
+        self.assertNotIn("version_id", columns)
+        with db.engine.begin() as conn:
+            conn.execute(
+                text(
+                    "INSERT INTO customers (id, password, name, email, phone, address) "
+                    "VALUES (1, 'x', 'Jane', 'jane@example.com', '555', '1 St')"
+                )
+            )
+            conn.execute(
+                text(
+                    "INSERT INTO service_tickets (id, title, service_date, vin, "
+                    "description, status, cost, date_created, customer_id) "
+                    "VALUES (1, 'Brakes', '2024-01-01', '1HGCM82633A004352', 'Pads', "
+                    "'PENDING', 100.0, '2024-01-01', 1)"
+                )
+            )
+
+        upgrade(directory=MIGRATIONS)
+
+        ticket = db.session.get(ServiceTicket, 1)
+        self.assertEqual(ticket.version_id, 1)
+        self.assertEqual(db.session.get(Customer, 1).version_id, 1)
+        ticket.service_date = date(2024, 2, 1)
+        db.session.commit()
+        self.assertGreater(ticket.version_id, 1)
+        indexes = {i["name"] for i in inspect(db.engine).get_indexes("service_tickets")}
+        self.assertIn("ix_service_tickets_date_created_id", indexes)
+
+    def test_ticket_ids_start_past_archived_ids(self):
+        upgrade(directory=MIGRATIONS, revision="e3a1f0c7d2b6")
+        with db.engine.begin() as conn:
+            conn.execute(
+                text(
+                    "INSERT INTO customers (id, password, name, email, phone, address) "
+                    "VALUES (1, 'x', 'Jane', 'jane@example.com', '555', '1 St')"
+                )
+            )
+            conn.execute(
+                text(
+                    "INSERT INTO service_tickets_archive (id, title, service_date, vin, "
+                    "description, status, cost, date_created, parts_total, parts_count, "
+                    "mechanic_count, archived_at, customer_id) "
+                    "VALUES (10, 'Brakes', '2020-01-01', '1HGCM82633A004352', 'Pads', "
+                    "'COMPLETED', 100.0, '2020-01-01', 0, 0, 0, '2021-01-01', 1)"
+                )
+            )
+
+        upgrade(directory=MIGRATIONS)
+
+        ticket = ServiceTicket(
+            title="New",
+            description="After the archive",
+            vin="1HGCM82633A004352",
+            service_date=date(2024, 1, 1),
+            status="PENDING",
+            cost=10.0,
+            date_created=date(2024, 1, 1),
+            customer_id=1,
+        )
+        db.session.add(ticket)
+        db.session.commit()
+        self.assertEqual(ticket.id, 11)
+
+    def test_downgrade_to_initial_schema(self):
+        upgrade(directory=MIGRATIONS)
+        downgrade(directory=MIGRATIONS, revision="42462a515098")
+        columns = {c["name"] for c in inspect(db.engine).get_columns("customers")}
+        self.assertNotIn("version_id", columns)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import StaticPool
+from app import create_app, db
+from app.utils.pool_metrics import MeteredQueuePool
+from app.utils.util import encode_mechanic_token
+from config import TestingConfig, engine_options
+
+
+class PoolMetricsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        path = os.path.join(self.tmpdir.name, "pool.sqlite3")
+
+        class PooledConfig(TestingConfig):
+            SQLALCHEMY_DATABASE_URI = "sqlite:///" + path
+            SQLALCHEMY_ENGINE_OPTIONS = engine_options(
+                pool_size=1, max_overflow=1, pool_timeout=1
+            )
+
+        self.app = create_app(PooledConfig)
+        self.app.config["RATELIMIT_ENABLED"] = False
+        self.client = self.app.test_client()
+        self.headers = {"Authorization": f"Bearer {encode_mechanic_token(1)}"}
+        with self.app.app_context():
+            self.engine = db.engine
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.tmpdir.cleanup()
+
+    def pool_stats(self):
+        response = self.client.get("/internal/pool/stats", headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        return response.get_json()["engines"]["default"]
+
+    def test_engine_options_from_environment(self):
+        with patch.dict(
+            os.environ,
+            {"DB_POOL_SIZE": "7", "DB_MAX_OVERFLOW": "0", "DB_POOL_PRE_PING": "false"},
+        ):
+            options = engine_options(pool_size=2, pool_recycle=60)
+        self.assertEqual(options["pool_size"], 7)
+        self.assertEqual(options["max_overflow"], 0)
+        self.assertEqual(options["pool_recycle"], 60)
+        self.assertFalse(options["pool_pre_ping"])
+
+    def test_metered_pool_installed(self):
+        pool = self.engine.pool
+        self.assertIsInstance(pool, MeteredQueuePool)
+        self.assertEqual(pool.size(), 1)
+        self.assertEqual(pool.max_overflow, 1)
+        self.assertEqual(pool.timeout(), 1)
+
+    def test_checkouts_overflow_and_timeouts(self):
+        first = self.engine.connect()
+        second = self.engine.connect()
+        stats = self.pool_stats()
+        self.assertEqual(stats["checked_out"], 2)
+        self.assertEqual(stats["overflow"], 1)
+        self.assertEqual(stats["in_use"], 2)
+
+        with self.assertRaises(PoolTimeoutError):
+            self.engine.connect()
+        stats = self.pool_stats()
+        self.assertEqual(stats["timeouts"], 1)
+        self.assertGreaterEqual(stats["wait_ms"]["max"], 1000)
+
+        second.close()
+        first.close()
+        stats = self.pool_stats()
+        self.assertEqual(stats["checked_out"], 0)
+        self.assertEqual(stats["in_use"], 0)
+        self.assertEqual(stats["peak_in_use"], 2)
+        self.assertEqual(stats["checkouts"], stats["checkins"])
+
+    def test_waiting_checkout_is_timed(self):
+        first = self.engine.connect()
+        second = self.engine.connect()
+        release = threading.Timer(0.05, second.close)
+        release.start()
+        with self.engine.connect() as third:
+            third.execute(text("SELECT 1"))
+        release.join()
+        first.close()
+
+        waits = self.engine.pool.stats.snapshot()["wait_ms"]
+        self.assertGreaterEqual(waits["max"], 40)
+        self.assertEqual(self.engine.pool.stats.timeouts, 0)
+
+    def test_stats_survive_dispose(self):
+        with self.engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        checkouts = self.engine.pool.stats.checkouts
+        self.engine.dispose()
+        with self.engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        self.assertIsInstance(self.engine.pool, MeteredQueuePool)
+        self.assertEqual(self.engine.pool.stats.checkouts, checkouts + 1)
+
+    def test_requires_mechanic_token(self):
+        self.assertEqual(self.client.get("/internal/pool/stats").status_code, 401)
+
+
+class UnmeteredPoolTestCase(unittest.TestCase):
+    def test_in_memory_database_reports_not_implemented(self):
+        app = create_app("testing")
+        with app.app_context():
+            self.assertIsInstance(db.engine.pool, StaticPool)
+        response = app.test_client().get(
+            "/internal/pool/stats",
+            headers={"Authorization": f"Bearer {encode_mechanic_token(1)}"},
+        )
+        self.assertEqual(response.status_code, 501)
+
+
+if __name__ == "__main__":
+    unittest.main()
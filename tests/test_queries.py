@@ -0,0 +1,104 @@
+from datetime import date
+import unittest
+from app import create_app, db
+from app.models import (
+    Customer,
+    Inventory,
+    InventoryAssignment,
+    Mechanic,
+    ServiceAssignment,
+    ServiceTicket,
+)
+from app.utils import queries
+
+
+class QueriesTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("testing")
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+
+        self.customer = Customer(
+            name="Jane Customer",
+            email="jane@example.com",
+            phone="555-2222",
+            address="123 Customer St",
+        )
+        self.customer.set_password("custpass")
+        self.mechanic = Mechanic(
+            name="Mike Mechanic",
+            email="mike@example.com",
+            phone="555-3333",
+            address="456 Mechanic Blvd",
+            salary=40000,
+        )
+        self.mechanic.set_password("mechpass")
+        self.part = Inventory(
+            part_name="Spark Plug", quantity=50, description="Plug", price=2.5
+        )
+        self.ticket = ServiceTicket(
+            title="Brakes",
+            description="Replace pads",
+            vin="1HGCM82633A004352",
+            service_date=date(2024, 1, 1),
+            status="PENDING",
+            cost=100.0,
+            date_created=date(2024, 1, 1),
+            customer=self.customer,
+        )
+        db.session.add_all([self.customer, self.mechanic, self.part, self.ticket])
+        db.session.flush()
+        db.session.add_all(
+            [
+                InventoryAssignment(
+                    service_ticket_id=self.ticket.id,
+                    inventory_id=self.part.id,
+                    quantity=2,
+                ),
+                ServiceAssignment(
+                    service_ticket_id=self.ticket.id, mechanic_id=self.mechanic.id
+                ),
+            ]
+        )
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def test_lookups_by_email(self):
+        self.assertEqual(
+            queries.customer_by_email(db.session, "jane@example.com").id,
+            self.customer.id,
+        )
+        self.assertEqual(
+            queries.mechanic_by_email(db.session, "mike@example.com").id,
+            self.mechanic.id,
+        )
+        self.assertIsNone(queries.customer_by_email(db.session, "mike@example.com"))
+        self.assertIsNone(queries.mechanic_by_email(db.session, None))
+
+    def test_assignment_lookups(self):
+        link = queries.inventory_assignment(db.session, self.ticket.id, self.part.id)
+        self.assertEqual(link.quantity, 2)
+        self.assertIsNone(queries.inventory_assignment(db.session, self.ticket.id, 999))
+
+        assignment = queries.service_assignment(
+            db.session, self.ticket.id, self.mechanic.id
+        )
+        self.assertEqual(assignment.mechanic_id, self.mechanic.id)
+        self.assertIsNone(queries.service_assignment(db.session, 999, self.mechanic.id))
+
+    def test_statements_compile_once(self):
+        cache = db.engine._compiled_cache
+        queries.customer_by_email(db.session, "jane@example.com")
+        size = len(cache)
+        for email in ("a@example.com", "b@example.com", "jane@example.com"):
+            queries.customer_by_email(db.session, email)
+        self.assertEqual(len(cache), size)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,253 @@
+import re
+import unittest
+from contextlib import contextmanager
+from datetime import date, timedelta
+from sqlalchemy import event
+from app import create_app, db
+from app.extensions import cache
+from app.models import (
+    Customer,
+    Inventory,
+    InventoryAssignment,
+    Mechanic,
+    ServiceAssignment,
+    ServiceStatus,
+    ServiceTicket,
+)
+from app.utils.util import encode_mechanic_token, encode_token
+
+# A plan step reading every row of a table, as opposed to SEARCH or a SCAN
+# of an index
+FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+
+
+class QueryPlanTestCase(unittest.TestCase):
+    """
+    Runs the hot queries of every blueprint against seeded data and fails
+    when SQLite's EXPLAIN QUERY PLAN reports a full table scan. Endpoints
+    that return a whole table by design list the tables they may scan.
+    """
+
+    def setUp(self):
+        self.app = create_app("testing")
+        self.app.config["RATELIMIT_ENABLED"] = False
+        self.client = self.app.test_client()
+
+        with self.app.app_context():
+            cache.clear()
+            db.create_all()
+            customers = [
+                Customer(
+                    name=f"Customer {n}",
+                    email=f"customer{n}@example.com",
+                    phone="555-0000",
+                    address="1 Main St",
+                )
+                for n in range(20)
+            ]
+            mechanics = [
+                Mechanic(
+                    name=f"Mechanic {n}",
+                    email=f"mechanic{n}@example.com",
+                    phone="555-1111",
+                    address="2 Garage Rd",
+                    salary=40000,
+                )
+                for n in range(6)
+            ]
+            for person in customers + mechanics:
+                person.set_password("password123")
+            parts = [
+                Inventory(part_name=f"Part {n}", price=5.0 + n, quantity=100)
+                for n in range(30)
+            ]
+            db.session.add_all(customers + mechanics + parts)
+            db.session.flush()
+
+            statuses = list(ServiceStatus)
+            for n in range(60):
+                ticket = ServiceTicket(
+                    title=f"Ticket {n}",
+                    service_date=date(2024, 1, 1) + timedelta(days=n),
+                    vin=f"VIN{n:014d}",
+                    description="Routine service",
+                    status=statuses[n % len(statuses)],
+                    cost=100.0 + n,
+                    date_created=date(2024, 1, 1) + timedelta(days=n),
+                    customer_id=customers[n % len(customers)].id,
+                )
+                db.session.add(ticket)
+                db.session.flush()
+                db.session.add_all(
+                    ServiceAssignment(
+                        service_ticket_id=ticket.id,
+                        mechanic_id=mechanics[(n + k) % len(mechanics)].id,
+                        date_assigned=ticket.service_date,
+                    )
+                    for k in range(2)
+                )
+                db.session.add_all(
+                    InventoryAssignment(
+                        service_ticket_id=ticket.id,
+                        inventory_id=parts[(n + k) % len(parts)].id,
+                        quantity=k + 1,
+                    )
+                    for k in range(3)
+                )
+            db.session.commit()
+
+        self.mechanic_headers = {"Authorization": f"Bearer {encode_mechanic_token(1)}"}
+        self.customer_headers = {"Authorization": f"Bearer {encode_token(1)}"}
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    @contextmanager
+    def captured_statements(self):
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if executemany:
+                parameters = parameters[0] if parameters else ()
+            statements.append((statement, parameters))
+
+        with self.app.app_context():
+            engine = db.engine
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+    def full_scans(self, statements):
+        """
+        Returns {table: statement} for every full table scan in the plans.
+        """
+        scans = {}
+        with self.app.app_context(), db.engine.connect() as conn:
+            for statement, parameters in statements:
+                if not statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")):
+                    continue
+                plan = conn.exec_driver_sql(
+                    "EXPLAIN QUERY PLAN " + statement, parameters
+                ).all()
+                for row in plan:
+                    match = FULL_SCAN.match(row[-1])
+                    if match:
+                        scans.setdefault(match.group(1), statement)
+        return scans
+
+    def assertNoFullScans(self, method, path, allowed=(), **kwargs):
+        with self.captured_statements() as statements:
+            response = self.client.open(path, method=method, **kwargs)
+        self.assertLess(response.status_code, 400, (path, response.get_data()))
+        self.assertTrue(statements, f"{method} {path} ran no queries")
+        scans = {
+            table: statement
+            for table, statement in self.full_scans(statements).items()
+            if table not in allowed
+        }
+        self.assertEqual(scans, {}, f"{method} {path}")
+
+    def test_customer_queries(self):
+        self.assertNoFullScans(
+            "POST",
+            "/customer/login",
+            json={"email": "customer1@example.com", "password": "password123"},
+        )
+        self.assertNoFullScans("GET", "/customer/1")
+        self.assertNoFullScans("GET", "/customer/my-tickets", headers=self.customer_headers)
+        self.assertNoFullScans(
+            "PUT", "/customer/1", json={"phone": "555-9999"}, headers=self.customer_headers
+        )
+        self.assertNoFullScans("GET", "/customer/?page=2", allowed=("customers",))
+
+    def test_mechanic_queries(self):
+        self.assertNoFullScans(
+            "POST",
+            "/mechanic/login",
+            json={"email": "mechanic1@example.com", "password": "password123"},
+        )
+        self.assertNoFullScans("GET", "/mechanic/1", headers=self.mechanic_headers)
+        self.assertNoFullScans(
+            "PUT",
+            "/mechanic/1",
+            json={"phone": "555-2222", "service_ticket_ids": [1, 2, 3]},
+            headers=self.mechanic_headers,
+        )
+        # Rankings aggregate over every mechanic
+        self.assertNoFullScans("GET", "/mechanic/rankings", allowed=("mechanics",))
+
+    def test_service_ticket_queries(self):
+        for query in (
+            "customer_id=3",
+            "status=COMPLETED",
+            "vin=VIN00000000000007",
+            "mechanic_id=2",
+            "service_date_from=2024-01-10&service_date_to=2024-01-20",
+            "customer_id=3&limit=5",
+            "mechanic_id=2&view=summary&limit=5",
+        ):
+            self.assertNoFullScans(
+                "GET", f"/service_ticket/?{query}", headers=self.mechanic_headers
+            )
+        self.assertNoFullScans("GET", "/service_ticket/5", headers=self.mechanic_headers)
+        self.assertNoFullScans(
+            "PUT",
+            "/service_ticket/5",
+            json={
+                "status": "IN_PROGRESS",
+                "add_mechanics": [4],
+                "remove_mechanics": [5],
+                "add_inventory": [{"inventory_id": 20, "quantity": 2}],
+                "remove_inventory": [5],
+            },
+            headers=self.mechanic_headers,
+        )
+        self.assertNoFullScans(
+            "DELETE", "/service_ticket/6", headers=self.mechanic_headers
+        )
+
+    def test_inventory_queries(self):
+        self.assertNoFullScans("GET", "/inventory/4", headers=self.mechanic_headers)
+        # Repricing finds every ticket using the part
+        self.assertNoFullScans(
+            "PUT", "/inventory/4", json={"price": 7.25}, headers=self.mechanic_headers
+        )
+        self.assertNoFullScans("DELETE", "/inventory/5", headers=self.mechanic_headers)
+
+    def test_assignment_queries(self):
+        self.assertNoFullScans(
+            "POST",
+            "/inventory_assignment/",
+            json={"service_ticket_id": 1, "inventory_id": 10, "quantity": 2},
+            headers=self.mechanic_headers,
+        )
+        self.assertNoFullScans(
+            "PUT",
+            "/inventory_assignment/",
+            json={"service_ticket_id": 1, "inventory_id": 10, "quantity": 4},
+            headers=self.mechanic_headers,
+        )
+        self.assertNoFullScans(
+            "DELETE",
+            "/inventory_assignment/?service_ticket_id=1&inventory_id=10",
+            headers=self.mechanic_headers,
+        )
+        self.assertNoFullScans(
+            "POST",
+            "/service_assignment/",
+            json={"service_ticket_id": 1, "mechanic_id": 5, "date_assigned": "2024-02-01"},
+            headers=self.mechanic_headers,
+        )
+        self.assertNoFullScans(
+            "DELETE",
+            "/service_assignment/?service_ticket_id=1&mechanic_id=5",
+            headers=self.mechanic_headers,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
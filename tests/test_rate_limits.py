@@ -0,0 +1,105 @@
+import os
+import tempfile
+import time
+import unittest
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import FixedWindowRateLimiter, MovingWindowRateLimiter
+from app import create_app, db
+from app.models import Customer
+from app.utils.sqlite_limits import SQLiteLimitStorage
+from app.utils.util import encode_token
+
+
+class SQLiteLimitStorageTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.uri = "sqlite://" + os.path.join(self.tmpdir.name, "limits.sqlite3")
+        self.storage = storage_from_string(self.uri)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_registered_for_sqlite_scheme(self):
+        self.assertIsInstance(self.storage, SQLiteLimitStorage)
+        self.assertTrue(self.storage.check())
+
+    def test_fixed_window_shared_between_instances(self):
+        # Another worker process opens the same file
+        other = SQLiteLimitStorage(self.uri)
+        limit = parse("3 per minute")
+        ours, theirs = FixedWindowRateLimiter(self.storage), FixedWindowRateLimiter(other)
+
+        self.assertTrue(ours.hit(limit, "customer:1"))
+        self.assertTrue(theirs.hit(limit, "customer:1"))
+        self.assertTrue(ours.hit(limit, "customer:1"))
+        self.assertFalse(theirs.hit(limit, "customer:1"))
+        self.assertTrue(theirs.hit(limit, "customer:2"))
+
+    def test_fixed_window_restarts_after_expiry(self):
+        self.assertEqual(self.storage.incr("k", 0.1), 1)
+        self.assertEqual(self.storage.incr("k", 0.1), 2)
+        time.sleep(0.15)
+        self.assertEqual(self.storage.get("k"), 0)
+        self.assertEqual(self.storage.incr("k", 0.1), 1)
+
+    def test_moving_window(self):
+        limiter = MovingWindowRateLimiter(self.storage)
+        limit = parse("2 per second")
+
+        self.assertTrue(limiter.hit(limit, "k"))
+        self.assertTrue(limiter.hit(limit, "k"))
+        self.assertFalse(limiter.hit(limit, "k"))
+        self.assertEqual(limiter.get_window_stats(limit, "k").remaining, 0)
+
+        time.sleep(1.05)
+        self.assertTrue(limiter.hit(limit, "k"))
+
+    def test_clear_and_reset(self):
+        self.storage.incr("a", 60)
+        self.storage.acquire_entry("b", 5, 60)
+        self.storage.clear("a")
+        self.assertEqual(self.storage.get("a"), 0)
+        self.assertEqual(self.storage.reset(), 1)
+        self.assertEqual(self.storage.get_moving_window("b", 5, 60)[1], 0)
+
+
+class RateLimitKeyTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("testing")
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            for n in (1, 2):
+                customer = Customer(
+                    name=f"Customer {n}",
+                    email=f"customer{n}@example.com",
+                    phone=f"555-000{n}",
+                    address="1 Main St",
+                )
+                customer.set_password("password123")
+                db.session.add(customer)
+            db.session.commit()
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def update(self, customer_id):
+        return self.client.put(
+            f"/customer/{customer_id}",
+            json={"address": "2 Main St"},
+            headers={"Authorization": f"Bearer {encode_token(customer_id)}"},
+        )
+
+    def test_authenticated_limits_are_per_subject(self):
+        # update_customer allows 5 per hour; both requests share an address
+        for _ in range(5):
+            self.assertEqual(self.update(1).status_code, 200)
+        self.assertEqual(self.update(1).status_code, 429)
+        self.assertEqual(self.update(2).status_code, 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import os
+import tempfile
+import time
+import unittest
+from app import create_app, db
+from app.extensions import cache
+from app.models import Inventory
+from app.utils.replicas import REPLICA_BIND
+from app.utils.util import encode_mechanic_token
+from config import TestingConfig
+
+
+class ReadReplicaTestCase(unittest.TestCase):
+    """
+    Runs against two SQLite files that never replicate, so every response
+    shows which database served it.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        primary = os.path.join(self.tmpdir.name, "primary.sqlite3")
+        replica = os.path.join(self.tmpdir.name, "replica.sqlite3")
+
+        class ReplicaConfig(TestingConfig):
+            SQLALCHEMY_DATABASE_URI = "sqlite:///" + primary
+            REPLICA_DATABASE_URI = "sqlite:///" + replica
+            REPLICA_STICKY_SECONDS = 1
+
+        self.app = create_app(ReplicaConfig)
+        self.app.config["RATELIMIT_ENABLED"] = False
+        self.client = self.app.test_client()
+
+        with self.app.app_context():
+            cache.clear()
+            self.primary = db.engines[None]
+            self.replica = db.engines[REPLICA_BIND]
+            db.metadata.create_all(self.replica)
+            for engine, name in ((self.primary, "Primary"), (self.replica, "Replica")):
+                with engine.begin() as conn:
+                    conn.execute(
+                        db.insert(Inventory),
+                        [{"part_name": f"{name} part", "price": 5.0, "quantity": 10}],
+                    )
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            for engine in db.engines.values():
+                engine.dispose()
+        self.tmpdir.cleanup()
+
+    def headers(self, mechanic_id):
+        return {"Authorization": f"Bearer {encode_mechanic_token(mechanic_id)}"}
+
+    def part_names(self, mechanic_id):
+        response = self.client.get("/inventory/", headers=self.headers(mechanic_id))
+        self.assertEqual(response.status_code, 200)
+        return sorted(part["part_name"] for part in response.get_json())
+
+    def create_part(self, mechanic_id):
+        response = self.client.post(
+            "/inventory/",
+            json={"part_name": "New part", "price": 9.5, "quantity": 3},
+            headers=self.headers(mechanic_id),
+        )
+        self.assertEqual(response.status_code, 201)
+
+    def test_reads_served_by_replica(self):
+        self.assertEqual(self.part_names(1), ["Replica part"])
+        response = self.client.get("/inventory/1", headers=self.headers(1))
+        self.assertEqual(response.get_json()["part_name"], "Replica part")
+
+    def test_writes_go_to_primary(self):
+        response = self.client.put(
+            "/inventory/1", json={"quantity": 99}, headers=self.headers(1)
+        )
+        self.assertEqual(response.get_json()["part_name"], "Primary part")
+        self.create_part(1)
+
+        with self.primary.connect() as conn:
+            self.assertEqual(
+                conn.execute(db.select(Inventory.quantity).order_by(Inventory.id)).scalars().all(),
+                [99, 3],
+            )
+        with self.replica.connect() as conn:
+            self.assertEqual(
+                conn.execute(db.select(Inventory.quantity)).scalars().all(), [10]
+            )
+
+    def test_writer_reads_own_writes(self):
+        self.create_part(1)
+        self.assertEqual(self.part_names(1), ["New part", "Primary part"])
+        # Other clients keep reading from the replica
+        self.assertEqual(self.part_names(2), ["Replica part"])
+
+    def test_stickiness_expires(self):
+        self.create_part(1)
+        self.assertEqual(self.part_names(1), ["New part", "Primary part"])
+        time.sleep(1.1)
+        self.assertEqual(self.part_names(1), ["Replica part"])
+
+    def test_failed_write_does_not_stick(self):
+        response = self.client.post(
+            "/inventory/", json={"price": "cheap"}, headers=self.headers(1)
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.part_names(1), ["Replica part"])
+
+
+class NoReplicaTestCase(unittest.TestCase):
+    def test_single_engine_without_replica_uri(self):
+        app = create_app("testing")
+        with app.app_context():
+            self.assertEqual(list(db.engines), [None])
+            db.session.add(Inventory(part_name="Part", price=1.0, quantity=1))
+            db.session.commit()
+        response = app.test_client().get(
+            "/inventory/",
+            headers={"Authorization": f"Bearer {encode_mechanic_token(1)}"},
+        )
+        self.assertEqual(len(response.get_json()), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -167,6 +167,24 @@ class ServiceAssignmentRoutesTestCase(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertIn("message", response.get_json())
 
+    def test_service_assignments_maintain_mechanic_count(self):
+        def mechanic_count():
+            with self.app.app_context():
+                return db.session.get(ServiceTicket, self.ticket.id).mechanic_count
+
+        self.client.post(
+            "/service_assignment/",
+            headers=self.mechanic_auth_header(),
+            json={"service_ticket_id": self.ticket.id, "mechanic_id": self.mechanic.id},
+        )
+        self.assertEqual(mechanic_count(), 1)
+
+        self.client.delete(
+            f"/service_assignment/?service_ticket_id={self.ticket.id}&mechanic_id={self.mechanic.id}",
+            headers=self.mechanic_auth_header(),
+        )
+        self.assertEqual(mechanic_count(), 0)
+
     def test_delete_service_assignment_not_found(self):
         response = self.client.delete(
             "/service_assignment/?service_ticket_id=9999&mechanic_id=9999",
@@ -1,7 +1,20 @@
+from contextlib import contextmanager
 from datetime import date
+import json
 import unittest
+from unittest.mock import patch
+from sqlalchemy import event
 from app import create_app, db
-from app.models import Customer, Mechanic, Inventory, ServiceTicket
+from app.blueprints.serviceticket import routes as service_ticket_routes
+from app.models import (
+    Customer,
+    Inventory,
+    InventoryAssignment,
+    Mechanic,
+    ServiceAssignment,
+    ServiceStatus,
+    ServiceTicket,
+)
 
 
 class ServiceTicketRoutesTestCase(unittest.TestCase):
@@ -68,6 +81,78 @@ class ServiceTicketRoutesTestCase(unittest.TestCase):
         )
         return response.get_json().get("auth_token")
 
+    @contextmanager
+    def count_queries(self):
+        """Helper to count SQL statements issued against the test engine"""
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        with self.app.app_context():
+            engine = db.engine
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+    def query_plan(self, stmt):
+        """Helper to return SQLite's EXPLAIN QUERY PLAN details for stmt"""
+        captured = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            captured.append((statement, parameters))
+
+        with self.app.app_context(), db.engine.connect() as conn:
+            event.listen(conn, "before_cursor_execute", capture)
+            conn.execute(stmt).all()
+            event.remove(conn, "before_cursor_execute", capture)
+            statement, parameters = captured[0]
+            rows = conn.exec_driver_sql(
+                f"EXPLAIN QUERY PLAN {statement}", parameters
+            ).all()
+        return " | ".join(row[-1] for row in rows)
+
+    def seed_tickets_with_assignments(self, count):
+        """Helper to create tickets that each have mechanics and parts"""
+        with self.app.app_context():
+            second_mechanic = Mechanic(
+                name="Second Mechanic",
+                email="second@example.com",
+                phone="555-4444",
+                address="789 Garage Rd",
+                salary=42000,
+                password="unused",
+            )
+            db.session.add(second_mechanic)
+            db.session.flush()
+            for n in range(count):
+                ticket = ServiceTicket(
+                    title=f"Seeded {n}",
+                    description="Seeded ticket",
+                    customer_id=self.customer_id,
+                    service_date=date(2025, 7, 21),
+                    vin="1HGCM82633A123456",
+                    cost=20.0,
+                    date_created=date(2025, 7, 20),
+                    status="PENDING",
+                )
+                db.session.add(ticket)
+                db.session.flush()
+                for m_id in (self.mechanic_id, second_mechanic.id):
+                    db.session.add(
+                        ServiceAssignment(service_ticket_id=ticket.id, mechanic_id=m_id)
+                    )
+                db.session.add(
+                    InventoryAssignment(
+                        service_ticket_id=ticket.id,
+                        inventory_id=self.inventory_id,
+                        quantity=1,
+                    )
+                )
+            db.session.commit()
+
     def customer_auth_header(self):
         return {"Authorization": f"Bearer {self.customer_token}"}
 
@@ -119,6 +204,109 @@ class ServiceTicketRoutesTestCase(unittest.TestCase):
         self.assertEqual(response.status_code, 400)
         self.assertIn("error", response.get_json())
 
+    # --- TESTS FOR POST /service_ticket/bulk ---
+    def bulk_ticket(self, **overrides):
+        ticket = {
+            "title": "Bulk Intake",
+            "service_date": "2025-07-21",
+            "vin": "1HGCM82633A123456",
+            "cost": 80.0,
+            "customer_id": self.customer_id,
+            "description": "Kiosk intake",
+            "date_created": "2025-07-20",
+            "mechanic_ids": [self.mechanic_id],
+            "inventory_items": [
+                {"inventory_id": self.inventory_id, "quantity": 2},
+                {"inventory_id": self.inventory_id},
+            ],
+        }
+        ticket.update(overrides)
+        return ticket
+
+    def test_create_service_tickets_bulk_success(self):
+        response = self.client.post(
+            "/service_ticket/bulk",
+            headers=self.mechanic_auth_header(),
+            json=[self.bulk_ticket(), self.bulk_ticket(title="Second")],
+        )
+        self.assertEqual(response.status_code, 201)
+        data = response.get_json()
+        self.assertEqual(data["created"], 2)
+        self.assertEqual(
+            [result["status"] for result in data["results"]], ["created", "created"]
+        )
+
+        with self.app.app_context():
+            ticket = db.session.get(ServiceTicket, data["results"][1]["ticket_id"])
+            self.assertEqual(ticket.title, "Second")
+            self.assertEqual([m.id for m in ticket.mechanics], [self.mechanic_id])
+            self.assertEqual(len(ticket.inventory_assignments), 1)
+            self.assertEqual(ticket.inventory_assignments[0].quantity, 3)
+            self.assertEqual(
+                (ticket.mechanic_count, ticket.parts_count, ticket.parts_total),
+                (1, 3, 7.5),
+            )
+
+    def test_create_service_tickets_bulk_partial(self):
+        response = self.client.post(
+            "/service_ticket/bulk",
+            headers=self.mechanic_auth_header(),
+            json=[
+                self.bulk_ticket(),
+                self.bulk_ticket(mechanic_ids=[9999]),
+                self.bulk_ticket(status="NOT_A_STATUS"),
+            ],
+        )
+        self.assertEqual(response.status_code, 207)
+        results = response.get_json()["results"]
+        self.assertEqual(results[0]["status"], "created")
+        self.assertEqual(results[1]["status"], "error")
+        self.assertIn("9999", results[1]["error"])
+        self.assertEqual(results[2]["status"], "error")
+
+        with self.app.app_context():
+            self.assertEqual(db.session.query(ServiceTicket).count(), 1)
+
+    def test_create_service_tickets_bulk_malformed_assignments(self):
+        response = self.client.post(
+            "/service_ticket/bulk",
+            headers=self.mechanic_auth_header(),
+            json=[
+                self.bulk_ticket(),
+                self.bulk_ticket(mechanic_ids=self.mechanic_id),
+                self.bulk_ticket(inventory_items=[self.inventory_id]),
+                self.bulk_ticket(
+                    inventory_items=[{"inventory_id": self.inventory_id, "quantity": "two"}]
+                ),
+                self.bulk_ticket(
+                    inventory_items=[{"inventory_id": self.inventory_id, "quantity": 0}]
+                ),
+            ],
+        )
+        self.assertEqual(response.status_code, 207)
+        results = response.get_json()["results"]
+        self.assertEqual(results[0]["status"], "created")
+        self.assertEqual(
+            [result["error"] for result in results[1:]],
+            [
+                "mechanic_ids must be a list of integers",
+                "inventory_items must be a list of objects",
+                "quantity must be a positive integer",
+                "quantity must be a positive integer",
+            ],
+        )
+
+        with self.app.app_context():
+            self.assertEqual(db.session.query(ServiceTicket).count(), 1)
+
+    def test_create_service_tickets_bulk_requires_array(self):
+        response = self.client.post(
+            "/service_ticket/bulk",
+            headers=self.mechanic_auth_header(),
+            json=self.bulk_ticket(),
+        )
+        self.assertEqual(response.status_code, 400)
+
     # --- TESTS FOR GET /service_ticket ---
     def test_get_service_tickets_success(self):
         with self.app.app_context():
@@ -142,12 +330,240 @@ class ServiceTicketRoutesTestCase(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertIn("service_tickets", response.get_json())
 
+    def test_get_service_tickets_cache_varies_on_query_string(self):
+        self.seed_tickets_with_assignments(2)
+
+        first = self.client.get(
+            "/service_ticket/?per_page=1&page=1", headers=self.mechanic_auth_header()
+        ).get_json()["service_tickets"]
+        second = self.client.get(
+            "/service_ticket/?page=2&per_page=1", headers=self.mechanic_auth_header()
+        ).get_json()["service_tickets"]
+        self.assertNotEqual(first[0]["id"], second[0]["id"])
+
+    def test_get_service_tickets_invalidated_on_create(self):
+        response = self.client.get(
+            "/service_ticket/", headers=self.mechanic_auth_header()
+        )
+        self.assertEqual(response.get_json()["total"], 0)
+
+        self.client.post(
+            "/service_ticket/bulk",
+            headers=self.mechanic_auth_header(),
+            json=[self.bulk_ticket()],
+        )
+
+        response = self.client.get(
+            "/service_ticket/", headers=self.mechanic_auth_header()
+        )
+        self.assertEqual(response.get_json()["total"], 1)
+
+    def test_get_service_tickets_filters(self):
+        self.seed_tickets_with_assignments(3)
+        with self.app.app_context():
+            ticket = db.session.get(ServiceTicket, 3)
+            ticket.vin = "JH4KA8260MC000000"
+            ticket.status = ServiceStatus.IN_PROGRESS
+            db.session.add(
+                ServiceTicket(
+                    title="Other customer",
+                    description="Filtered out by customer_id",
+                    customer_id=self.customer_id + 1,
+                    service_date=date(2025, 6, 1),
+                    vin="1HGCM82633A123456",
+                    cost=5.0,
+                    date_created=date(2025, 6, 1),
+                    status="PENDING",
+                )
+            )
+            db.session.commit()
+
+        def ids(query):
+            response = self.client.get(
+                f"/service_ticket/?{query}", headers=self.mechanic_auth_header()
+            )
+            self.assertEqual(response.status_code, 200)
+            return [t["id"] for t in response.get_json()["service_tickets"]]
+
+        self.assertEqual(ids("status=in_progress"), [3])
+        self.assertEqual(ids("vin=JH4KA8260MC000000"), [3])
+        self.assertEqual(ids(f"customer_id={self.customer_id}"), [1, 2, 3])
+        self.assertEqual(ids(f"mechanic_id={self.mechanic_id}"), [1, 2, 3])
+        self.assertEqual(ids("service_date_to=2025-06-30"), [4])
+        self.assertEqual(
+            ids("limit=5&status=pending&service_date_from=2025-07-01"), [1, 2]
+        )
+
+    def test_get_service_tickets_summary_view(self):
+        self.seed_tickets_with_assignments(3)
+
+        with self.count_queries() as statements:
+            response = self.client.get(
+                "/service_ticket/?view=summary", headers=self.mechanic_auth_header()
+            )
+        self.assertEqual(response.status_code, 200)
+        tickets = response.get_json()["service_tickets"]
+        self.assertEqual(len(tickets), 3)
+        self.assertEqual(tickets[0]["mechanic_count"], 2)
+        self.assertEqual(tickets[0]["parts_count"], 1)
+        self.assertEqual(tickets[0]["parts_total"], 2.5)
+        self.assertNotIn("inventory_assignments", tickets[0])
+        # Page plus count, no relationship loads
+        self.assertEqual(len(statements), 2)
+
+    def test_get_service_tickets_invalid_filter(self):
+        response = self.client.get(
+            "/service_ticket/?customer_id=abc", headers=self.mechanic_auth_header()
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_get_service_tickets_filters_use_indexes(self):
+        expected = {
+            "status=PENDING&service_date_from=2025-01-01": (
+                "ix_service_tickets_status_service_date"
+            ),
+            "customer_id=1&service_date_to=2025-12-31": (
+                "ix_service_tickets_customer_id_service_date"
+            ),
+            "vin=1HGCM82633A123456": "ix_service_tickets_vin",
+            "service_date_from=2025-01-01": "ix_service_tickets_service_date",
+            "mechanic_id=1": "ix_service_assignment_mechanic_id_ticket",
+        }
+        for query, index in expected.items():
+            with self.app.test_request_context(f"/service_ticket/?{query}"):
+                stmt = service_ticket_routes.filter_service_tickets(
+                    db.select(ServiceTicket.id)
+                )
+                plan = self.query_plan(stmt)
+            self.assertIn(index, plan, f"{query}: {plan}")
+
     def test_get_service_tickets_unauthorized_customer(self):
         response = self.client.get(
             "/service_ticket/", headers=self.customer_auth_header()
         )
         self.assertEqual(response.status_code, 403)
 
+    def test_get_service_tickets_cursor_pagination(self):
+        with self.app.app_context():
+            for day in (3, 1, 2, 1, 2):
+                db.session.add(
+                    ServiceTicket(
+                        title=f"Ticket day {day}",
+                        description="Cursor pagination",
+                        customer_id=self.customer_id,
+                        service_date=date(2025, 7, 21),
+                        vin="1HGCM82633A123456",
+                        cost=10.0,
+                        date_created=date(2025, 7, day),
+                        status="PENDING",
+                    )
+                )
+            db.session.commit()
+
+        seen = []
+        cursor = None
+        while True:
+            url = "/service_ticket/?limit=2"
+            if cursor:
+                url += f"&after={cursor}"
+            response = self.client.get(url, headers=self.mechanic_auth_header())
+            self.assertEqual(response.status_code, 200)
+            data = response.get_json()
+            self.assertNotIn("total", data)
+            seen.extend(
+                (t["date_created"], t["id"]) for t in data["service_tickets"]
+            )
+            cursor = data["next_cursor"]
+            if cursor is None:
+                break
+
+        self.assertEqual(len(seen), 5)
+        self.assertEqual(seen, sorted(seen))
+
+    def test_get_service_tickets_cursor_include_total(self):
+        response = self.client.get(
+            "/service_ticket/?limit=5&include_total=true",
+            headers=self.mechanic_auth_header(),
+        )
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual(data["total"], 0)
+        self.assertIsNone(data["next_cursor"])
+
+    def test_get_service_tickets_invalid_cursor(self):
+        response = self.client.get(
+            "/service_ticket/?after=not-a-cursor",
+            headers=self.mechanic_auth_header(),
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("error", response.get_json())
+
+    def test_get_service_tickets_query_count_independent_of_page_size(self):
+        self.seed_tickets_with_assignments(12)
+
+        with self.count_queries() as small_page:
+            response = self.client.get(
+                "/service_ticket/?per_page=2", headers=self.mechanic_auth_header()
+            )
+        self.assertEqual(len(response.get_json()["service_tickets"]), 2)
+
+        with self.count_queries() as large_page:
+            response = self.client.get(
+                "/service_ticket/?per_page=10", headers=self.mechanic_auth_header()
+            )
+        tickets = response.get_json()["service_tickets"]
+        self.assertEqual(len(tickets), 10)
+        self.assertEqual(len(tickets[0]["mechanics"]), 2)
+        self.assertEqual(len(tickets[0]["inventory_assignments"]), 1)
+
+        self.assertEqual(len(small_page), len(large_page))
+
+    # --- TESTS FOR GET /service_ticket/export ---
+    def test_export_service_tickets_streams_ndjson(self):
+        self.seed_tickets_with_assignments(5)
+
+        with patch.object(service_ticket_routes, "EXPORT_BATCH_SIZE", 2):
+            response = self.client.get(
+                "/service_ticket/export", headers=self.mechanic_auth_header()
+            )
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.mimetype, "application/x-ndjson")
+            lines = response.get_data(as_text=True).splitlines()
+
+        tickets = [json.loads(line) for line in lines]
+        self.assertEqual([t["id"] for t in tickets], [1, 2, 3, 4, 5])
+        # Compact, as response bodies are
+        self.assertNotIn('": ', lines[0])
+        self.assertEqual(len(tickets[4]["mechanics"]), 2)
+        self.assertEqual(tickets[4]["inventory_assignments"][0]["quantity"], 1)
+
+    def test_export_service_tickets_filters(self):
+        self.seed_tickets_with_assignments(3)
+        with self.app.app_context():
+            ticket = db.session.get(ServiceTicket, 2)
+            ticket.status = ServiceStatus.COMPLETED
+            db.session.commit()
+
+        response = self.client.get(
+            "/service_ticket/export?status=completed&service_date_from=2025-07-01",
+            headers=self.mechanic_auth_header(),
+        )
+        lines = response.get_data(as_text=True).splitlines()
+        self.assertEqual([json.loads(line)["id"] for line in lines], [2])
+
+        response = self.client.get(
+            "/service_ticket/export?service_date_to=2025-07-01",
+            headers=self.mechanic_auth_header(),
+        )
+        self.assertEqual(response.get_data(), b"")
+
+    def test_export_service_tickets_invalid_filter(self):
+        response = self.client.get(
+            "/service_ticket/export?service_date_from=yesterday",
+            headers=self.mechanic_auth_header(),
+        )
+        self.assertEqual(response.status_code, 400)
+
     # --- TESTS FOR GET /service_ticket/<id> ---
     def test_get_service_ticket_success(self):
         with self.app.app_context():
@@ -171,6 +587,43 @@ class ServiceTicketRoutesTestCase(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertIn("ticket", response.get_json())
 
+    def test_get_service_ticket_etag_not_modified(self):
+        self.seed_tickets_with_assignments(1)
+        response = self.client.get(
+            "/service_ticket/1", headers=self.mechanic_auth_header()
+        )
+        etag = response.headers["ETag"]
+        self.assertTrue(etag)
+
+        with self.count_queries() as statements:
+            response = self.client.get(
+                "/service_ticket/1",
+                headers={**self.mechanic_auth_header(), "If-None-Match": etag},
+            )
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.get_data(), b"")
+        self.assertEqual(len(statements), 1)
+
+    def test_get_service_ticket_etag_changes_with_assignments(self):
+        self.seed_tickets_with_assignments(1)
+        etag = self.client.get(
+            "/service_ticket/1", headers=self.mechanic_auth_header()
+        ).headers["ETag"]
+
+        self.client.put(
+            "/service_ticket/1",
+            headers=self.mechanic_auth_header(),
+            json={"remove_mechanics": [self.mechanic_id]},
+        )
+
+        response = self.client.get(
+            "/service_ticket/1",
+            headers={**self.mechanic_auth_header(), "If-None-Match": etag},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["ETag"], etag)
+        self.assertEqual(len(response.get_json()["ticket"]["mechanics"]), 1)
+
     def test_get_service_ticket_not_found(self):
         response = self.client.get(
             "/service_ticket/9999", headers=self.mechanic_auth_header()
@@ -226,6 +679,139 @@ class ServiceTicketRoutesTestCase(unittest.TestCase):
         )
         self.assertEqual(response.status_code, 404)
 
+    def test_update_service_ticket_applies_assignment_diff(self):
+        self.seed_tickets_with_assignments(1)
+        with self.app.app_context():
+            extra_part = Inventory(part_name="Oil Filter", price=8.0, quantity=10)
+            db.session.add(extra_part)
+            db.session.commit()
+            extra_part_id = extra_part.id
+
+        response = self.client.put(
+            "/service_ticket/1",
+            headers=self.mechanic_auth_header(),
+            json={
+                "add_mechanics": [self.mechanic_id],
+                "remove_mechanics": [2],
+                "add_inventory": [
+                    {"inventory_id": self.inventory_id, "quantity": 2},
+                    {"inventory_id": extra_part_id, "quantity": 3},
+                    {"inventory_id": extra_part_id},
+                ],
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+        ticket = response.get_json()["ticket"]
+        self.assertEqual([m["id"] for m in ticket["mechanics"]], [self.mechanic_id])
+        quantities = {
+            link["inventory"]["id"]: link["quantity"]
+            for link in ticket["inventory_assignments"]
+        }
+        self.assertEqual(quantities, {self.inventory_id: 3, extra_part_id: 4})
+
+        response = self.client.put(
+            "/service_ticket/1",
+            headers=self.mechanic_auth_header(),
+            json={"remove_inventory": [self.inventory_id]},
+        )
+        ticket = response.get_json()["ticket"]
+        self.assertEqual(
+            [link["inventory"]["id"] for link in ticket["inventory_assignments"]],
+            [extra_part_id],
+        )
+
+    def test_update_service_ticket_query_count_independent_of_edit_size(self):
+        with self.app.app_context():
+            parts = [
+                Inventory(part_name=f"Part {n}", price=1.0, quantity=5)
+                for n in range(40)
+            ]
+            mechanics = [
+                Mechanic(
+                    name=f"Mechanic {n}",
+                    email=f"mechanic{n}@example.com",
+                    phone="555-0000",
+                    address="1 Garage Way",
+                    salary=30000,
+                    password="unused",
+                )
+                for n in range(20)
+            ]
+            db.session.add_all(parts + mechanics)
+            db.session.commit()
+            part_ids = [part.id for part in parts]
+            mechanic_ids = [mechanic.id for mechanic in mechanics]
+        self.seed_tickets_with_assignments(2)
+
+        def edit(ticket_id, size):
+            payload = {
+                "add_mechanics": mechanic_ids[:size],
+                "add_inventory": [
+                    {"inventory_id": inventory_id, "quantity": 1}
+                    for inventory_id in [self.inventory_id] + part_ids[: size - 1]
+                ],
+                "remove_inventory": part_ids[20 : 20 + size],
+            }
+            with self.count_queries() as statements:
+                response = self.client.put(
+                    f"/service_ticket/{ticket_id}",
+                    headers=self.mechanic_auth_header(),
+                    json=payload,
+                )
+            self.assertEqual(response.status_code, 200)
+            return len(statements)
+
+        self.assertEqual(edit(1, 2), edit(2, 20))
+
+    def test_update_service_ticket_maintains_totals(self):
+        self.seed_tickets_with_assignments(1)
+
+        response = self.client.put(
+            "/service_ticket/1",
+            headers=self.mechanic_auth_header(),
+            json={
+                "remove_mechanics": [2],
+                "add_inventory": [{"inventory_id": self.inventory_id, "quantity": 3}],
+            },
+        )
+        ticket = response.get_json()["ticket"]
+        self.assertEqual(ticket["mechanic_count"], 1)
+        self.assertEqual(ticket["parts_count"], 4)
+        self.assertEqual(ticket["parts_total"], 10.0)
+
+        response = self.client.put(
+            "/service_ticket/1",
+            headers=self.mechanic_auth_header(),
+            json={"remove_inventory": [self.inventory_id]},
+        )
+        ticket = response.get_json()["ticket"]
+        self.assertEqual((ticket["parts_count"], ticket["parts_total"]), (0, 0.0))
+
+    def test_recompute_totals_command_repairs_drift(self):
+        self.seed_tickets_with_assignments(3)
+        with self.app.app_context():
+            db.session.execute(
+                db.update(ServiceTicket)
+                .where(ServiceTicket.id != 2)
+                .values(parts_total=0.0, mechanic_count=7)
+            )
+            db.session.commit()
+
+        result = self.app.test_cli_runner().invoke(
+            args=["service_ticket", "recompute-totals"]
+        )
+        self.assertIn("Repaired totals on 2 service ticket(s).", result.output)
+
+        with self.app.app_context():
+            totals = db.session.execute(
+                db.select(
+                    ServiceTicket.mechanic_count,
+                    ServiceTicket.parts_count,
+                    ServiceTicket.parts_total,
+                )
+            ).all()
+        self.assertEqual(set(totals), {(2, 1, 2.5)})
+
     # --- TESTS FOR DELETE /service_ticket/<id> ---
     def test_delete_service_ticket_success(self):
         with self.app.app_context():
@@ -0,0 +1,81 @@
+import unittest
+from flask import jsonify
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from app import create_app, db
+from app.utils.sql_stats import QueryBudgetExceeded, query_budget
+from config import TestingConfig
+
+
+class NoBudgetsConfig(TestingConfig):
+    SQL_QUERY_BUDGETS = False
+
+
+class SilentConfig(TestingConfig):
+    SQL_STATS_HEADERS = False
+    SQL_REPEAT_THRESHOLD = 0
+    SQL_QUERY_BUDGETS = False
+
+
+class SQLStatsTestCase(unittest.TestCase):
+    def make_app(self, config="testing"):
+        app = create_app(config)
+
+        @query_budget(3)
+        def repeat(times):
+            for n in range(times):
+                db.session.execute(text("SELECT :n"), {"n": n})
+            return jsonify({"ran": times})
+
+        def broken():
+            try:
+                db.session.execute(text("SELECT * FROM no_such_table"))
+            except OperationalError:
+                db.session.rollback()
+            db.session.execute(text("SELECT 1"))
+            return jsonify({})
+
+        app.add_url_rule("/_test/repeat/<int:times>", view_func=repeat)
+        app.add_url_rule("/_test/broken", view_func=broken)
+        return app
+
+    def test_headers_report_count_and_time(self):
+        response = self.make_app().test_client().get("/_test/repeat/2")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["X-DB-Queries"], "2")
+        self.assertGreaterEqual(float(response.headers["X-DB-Time"]), 0)
+        self.assertNotIn("X-DB-Repeated", response.headers)
+
+    def test_failed_statements_are_not_counted(self):
+        response = self.make_app().test_client().get("/_test/broken")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["X-DB-Queries"], "1")
+
+    def test_repeated_statements_are_flagged(self):
+        app = self.make_app(NoBudgetsConfig)
+        with self.assertLogs(app.logger, "WARNING") as logs:
+            response = app.test_client().get("/_test/repeat/6")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["X-DB-Repeated"], "6")
+        self.assertIn("GET /_test/repeat/6 ran this statement 6 times: SELECT ?", logs.output[0])
+
+    def test_query_budget_fails_request(self):
+        client = self.make_app().test_client()
+        self.assertEqual(client.get("/_test/repeat/3").status_code, 200)
+        with self.assertRaisesRegex(QueryBudgetExceeded, "ran 4 SQL statements, over its budget of 3"):
+            client.get("/_test/repeat/4")
+
+    def test_budgets_not_enforced_unless_configured(self):
+        response = self.make_app(NoBudgetsConfig).test_client().get("/_test/repeat/4")
+        self.assertEqual(response.status_code, 200)
+
+    def test_disabled(self):
+        app = self.make_app(SilentConfig)
+        response = app.test_client().get("/_test/repeat/6")
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("X-DB-Queries", response.headers)
+        self.assertNotIn("X-DB-Repeated", response.headers)
+
+
+if __name__ == "__main__":
+    unittest.main()
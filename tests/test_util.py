@@ -0,0 +1,132 @@
+import time
+import unittest
+from unittest.mock import patch
+from jose import jwt
+from werkzeug.security import generate_password_hash
+from app import create_app, db
+from app.models import Customer
+from app.utils import passwords, util
+from app.utils.passwords import (
+    hash_password,
+    needs_rehash,
+    shutdown_pool,
+    verify_password,
+)
+from app.utils.util import (
+    VerifiedTokenCache,
+    decode_token,
+    encode_mechanic_token,
+    verified_tokens,
+)
+from config import Config
+
+
+class VerifiedTokenCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        verified_tokens.clear()
+
+    def test_hit_skips_signature_verification(self):
+        token = encode_mechanic_token(1)
+        with patch.object(util.jwt, "decode", wraps=jwt.decode) as decode:
+            first = decode_token(token)
+            second = decode_token(token)
+        self.assertEqual(decode.call_count, 1)
+        self.assertEqual(first, second)
+        self.assertEqual(verified_tokens.stats()["hits"], 1)
+        self.assertEqual(verified_tokens.stats()["misses"], 1)
+
+    def test_entry_expires_at_token_exp(self):
+        cache = VerifiedTokenCache()
+        cache.put("token", {"sub": "1", "exp": time.time() - 1})
+        self.assertIsNone(cache.get("token"))
+        self.assertEqual(cache.stats()["size"], 0)
+
+    def test_token_is_verified_again_after_exp(self):
+        token = encode_mechanic_token(1)
+        exp = decode_token(token)["exp"]
+        with patch.object(util.time, "time", return_value=exp + 1), patch.object(
+            util.jwt, "decode", side_effect=jwt.ExpiredSignatureError
+        ):
+            with self.assertRaises(jwt.ExpiredSignatureError):
+                decode_token(token)
+
+    def test_evicts_least_recently_used(self):
+        cache = VerifiedTokenCache(maxsize=2)
+        exp = time.time() + 60
+        cache.put("a", {"exp": exp})
+        cache.put("b", {"exp": exp})
+        cache.get("a")
+        cache.put("c", {"exp": exp})
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("c"))
+
+    def test_invalid_mechanic_token_is_unauthorized(self):
+        client = create_app("testing").test_client()
+        response = client.get(
+            "/service_ticket/", headers={"Authorization": "Bearer not-a-token"}
+        )
+        self.assertEqual(response.status_code, 401)
+
+
+class PasswordHashingTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("testing")
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+        shutdown_pool()
+
+    def test_hashes_in_worker_pool(self):
+        self.app.config["PASSWORD_HASH_WORKERS"] = 1
+        with self.app.app_context():
+            pwhash = hash_password("secret")
+            self.assertTrue(pwhash.startswith("pbkdf2:sha256:1000$"))
+            self.assertTrue(verify_password(pwhash, "secret"))
+            self.assertFalse(verify_password(pwhash, "wrong"))
+
+    def test_hashes_inline_by_default(self):
+        self.assertEqual(Config.PASSWORD_HASH_WORKERS, 0)
+        with patch.object(passwords, "get_pool") as get_pool:
+            self.assertTrue(verify_password(hash_password("secret"), "secret"))
+        get_pool.assert_not_called()
+
+    def test_needs_rehash_compares_expanded_method(self):
+        self.app.config["PASSWORD_HASH_METHOD"] = "pbkdf2:sha256"
+        with self.app.app_context():
+            self.assertFalse(needs_rehash(generate_password_hash("x", "pbkdf2:sha256")))
+            self.assertTrue(needs_rehash(generate_password_hash("x", "pbkdf2:sha256:1000")))
+
+    def test_login_rehashes_outdated_hash(self):
+        outdated = generate_password_hash("custpass", method="pbkdf2:sha256:500")
+        with self.app.app_context():
+            db.session.add(
+                Customer(
+                    name="Jane Customer",
+                    email="jane@example.com",
+                    phone="555-2222",
+                    address="123 Customer St",
+                    password=outdated,
+                )
+            )
+            db.session.commit()
+
+        response = self.client.post(
+            "/customer/login",
+            json={"email": "jane@example.com", "password": "custpass"},
+        )
+        self.assertEqual(response.status_code, 200)
+
+        with self.app.app_context():
+            stored = db.session.scalar(db.select(Customer.password))
+        self.assertNotEqual(stored, outdated)
+        self.assertTrue(stored.startswith("pbkdf2:sha256:1000$"))
+
+
+if __name__ == "__main__":
+    unittest.main()